@@ -0,0 +1,110 @@
+"""Caching scoped to a single request or process.
+
+Values which are needed several times during a request, e.g. the employment
+of the requesting user, can be stored in a request cache so they are only
+loaded once. Outside of a request (e.g. in management commands) there is no
+request cache unless `request_cache` is used explicitly.
+
+Values which are expensive to compute and small enough to be kept in memory
+can be stored in a `LRUCache` of the process.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from prometheus_client import Counter
+
+if TYPE_CHECKING:
+    from typing import Callable, Iterator
+
+    from django.http import HttpRequest, HttpResponse
+
+lru_cache_requests = Counter(
+    "timed_lru_cache_requests",
+    "Lookups of values in LRU caches by cache and result",
+    ["cache", "result"],
+)
+lru_cache_evictions = Counter(
+    "timed_lru_cache_evictions",
+    "Values evicted from LRU caches",
+    ["cache"],
+)
+
+_request_cache: ContextVar[dict | None] = ContextVar("request_cache", default=None)
+
+
+def get_request_cache() -> dict | None:
+    """Get cache of current request or None when not in a request."""
+    return _request_cache.get()
+
+
+def clear_request_cache(key: str) -> None:
+    """Remove given key from cache of current request."""
+    request_cache = get_request_cache()
+    if request_cache is not None:
+        request_cache.pop(key, None)
+
+
+@contextmanager
+def request_cache() -> Iterator[dict]:
+    """Use a new request cache within the context."""
+    token = _request_cache.set({})
+    try:
+        yield _request_cache.get()
+    finally:
+        _request_cache.reset(token)
+
+
+class RequestCacheMiddleware:
+    """Provide a request cache for each request."""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        with request_cache():
+            return self.get_response(request)
+
+
+class LRUCache:
+    """Keep given number of most recently used values of a process.
+
+    Lookups and evictions are exported as prometheus metrics labeled with
+    the name of the cache.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._values = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> object | None:
+        """Get value of given key or None when it isn't cached."""
+        with self._lock:
+            value = self._values.get(key)
+            if value is not None:
+                self._values.move_to_end(key)
+        result = "miss" if value is None else "hit"
+        lru_cache_requests.labels(cache=self.name, result=result).inc()
+        return value
+
+    def set(self, key: str, value: object, size: int) -> None:
+        """Cache value and evict least recently used values above given size."""
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            evicted = 0
+            while len(self._values) > size:
+                self._values.popitem(last=False)
+                evicted += 1
+        if evicted:
+            lru_cache_evictions.labels(cache=self.name).inc(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
@@ -0,0 +1,91 @@
+"""Versions of tables to detect changes without querying them.
+
+Whenever rows of a tracked table change, the version of the table and the
+version of the table for the user of the rows are replaced by the current
+time. Responses computed from tables can then be validated by comparing
+versions instead of querying the tables again (see
+`timed.mixins.ConditionalGetMixin`).
+
+Changes which do not send signals (e.g. `QuerySet.update`) need to be
+recorded explicitly with `changed`.
+
+Versions are kept in the cache, so they are only shared between processes
+with a cache backend shared by all processes. Settings caching results which
+are validated with versions (or invalidated through the cache otherwise) may
+therefore only be enabled with such a backend. With a cache local to each
+process, changes made by one process go unnoticed by the others, which keep
+serving stale results.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+from django.db import transaction
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    from django.db.models import Model
+
+# user id of versions changed by rows of unknown users
+ALL_USERS = "all"
+
+
+def _key(model: type[Model], user_id: int | str | None = None) -> str:
+    key = f"changes.{model._meta.label_lower}"  # noqa: SLF001
+    return key if user_id is None else f"{key}.{user_id}"
+
+
+def changed(model: type[Model], user_ids: Iterable[int] | None = None) -> None:
+    """Record a change of rows of given users or of unknown users.
+
+    Versions are replaced immediately so changes are visible within the
+    current transaction and once more on commit, so responses computed by
+    other processes before the commit are not validated.
+    """
+    keys = [_key(model)]
+    if user_ids is None:
+        keys.append(_key(model, ALL_USERS))
+    else:
+        keys.extend(_key(model, user_id) for user_id in set(user_ids))
+
+    def _replace() -> None:
+        cache.set_many(dict.fromkeys(keys, time.time()), timeout=None)
+
+    _replace()
+    transaction.on_commit(_replace)
+
+
+def record_change(model: type[Model], instance: Model) -> None:
+    """Record change of a saved or deleted row."""
+    user_id = getattr(instance, "user_id", None)
+    changed(model, None if user_id is None else [user_id])
+
+
+def versions(
+    models: Iterable[type[Model]],
+    user_models: Iterable[type[Model]] = (),
+    user_ids: Iterable[int] | None = None,
+) -> dict[str, float]:
+    """Get versions of given tables.
+
+    When user ids are given only versions of rows of these users are
+    returned for `user_models`, otherwise versions of the whole tables.
+    """
+    keys = [_key(model) for model in models]
+    for model in user_models:
+        if user_ids is None:
+            keys.append(_key(model))
+        else:
+            keys.append(_key(model, ALL_USERS))
+            keys.extend(_key(model, user_id) for user_id in sorted(set(user_ids)))
+
+    found = cache.get_many(keys)
+    # versions which are missing (e.g. evicted) need a new version, as they
+    # might have been changed
+    missing = dict.fromkeys(set(keys) - set(found), time.time())
+    cache.set_many(missing, timeout=None)
+    return {key: found.get(key, missing.get(key)) for key in keys}
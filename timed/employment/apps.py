@@ -8,3 +8,7 @@ class EmploymentConfig(AppConfig):
 
     name = "timed.employment"
     label = "employment"
+
+    def ready(self):
+        # Implicitly connect signal handlers decorated with @receiver.
+        from . import signals  # noqa: F401
@@ -0,0 +1,156 @@
+"""Cached workday calendars of locations.
+
+For each location and year a calendar is built with the workdays of the
+location where public holidays are masked out. Calendars store the prefix
+sums of workdays so counting workdays of any range within a year is a
+constant time lookup.
+
+Calendars are kept in the default cache. When workdays of a location or
+public holidays change all calendars are invalidated.
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import date
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+
+from timed.employment import models
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+VERSION_KEY = "worktime.calendar.version"
+# calendars of outdated versions are not deleted but expire eventually
+CALENDAR_TIMEOUT = 60 * 60 * 24
+
+
+class Calendar:
+    """Workday calendar of a location in a specific year."""
+
+    def __init__(
+        self, year: int, workdays: Iterable[int | str], holidays: Iterable[date]
+    ) -> None:
+        self.year = year
+        first_day = date(year, 1, 1)
+        days = (date(year + 1, 1, 1) - first_day).days
+        workdays = {int(day) for day in workdays}
+        first_weekday = first_day.isoweekday()
+
+        bitmap = bytearray(
+            (first_weekday + offset - 1) % 7 + 1 in workdays for offset in range(days)
+        )
+        for holiday in holidays:
+            bitmap[holiday.timetuple().tm_yday - 1] = 0
+
+        # prefix_sums[n] is the number of workdays in the first n days of year
+        self.prefix_sums = array("H", [0])
+        for is_workday in bitmap:
+            self.prefix_sums.append(self.prefix_sums[-1] + is_workday)
+
+    def count_workdays(self, start: date, end: date) -> int:
+        """Count workdays between start and end (inclusive) in this year."""
+        start = max(start, date(self.year, 1, 1))
+        end = min(end, date(self.year, 12, 31))
+        if start > end:
+            return 0
+
+        return (
+            self.prefix_sums[end.timetuple().tm_yday]
+            - self.prefix_sums[start.timetuple().tm_yday - 1]
+        )
+
+    def is_workday(self, day: date) -> bool:
+        return self.count_workdays(day, day) == 1
+
+
+def _version() -> str:
+    return cache.get_or_set(VERSION_KEY, lambda: uuid4().hex, timeout=None)
+
+
+def invalidate() -> None:
+    """Invalidate all calendars.
+
+    Calendars are invalidated immediately so changes are visible within the
+    current transaction and once more on commit, so calendars built by
+    other processes before the commit are not kept.
+    """
+
+    def _invalidate() -> None:
+        cache.set(VERSION_KEY, uuid4().hex, timeout=None)
+
+    _invalidate()
+    transaction.on_commit(_invalidate)
+
+
+class CalendarService:
+    """Lookup of calendars of multiple locations and years.
+
+    Calendars which are not cached yet are built together in one query.
+    """
+
+    def __init__(self) -> None:
+        self.calendars = {}
+
+    def load(
+        self, locations: Iterable[models.Location], start: date, end: date
+    ) -> None:
+        """Load calendars of given locations for all years from start to end."""
+        locations = {location.pk: location for location in locations}
+        needed = [
+            (location_id, year)
+            for location_id in locations
+            for year in range(start.year, end.year + 1)
+            if (location_id, year) not in self.calendars
+        ]
+        if not needed:
+            return
+
+        version = _version()
+        keys = {
+            f"worktime.calendar.{version}.{location_id}.{year}": (location_id, year)
+            for location_id, year in needed
+        }
+
+        cached = cache.get_many(keys.keys())
+        for key, calendar in cached.items():
+            self.calendars[keys[key]] = calendar
+
+        missing = {keys[key] for key in keys.keys() - cached.keys()}
+        if not missing:
+            return
+
+        holidays = {}
+        for location_id, holiday in models.PublicHoliday.objects.filter(
+            location_id__in={location_id for location_id, _ in missing},
+            date__year__in={year for _, year in missing},
+        ).values_list("location_id", "date"):
+            holidays.setdefault((location_id, holiday.year), []).append(holiday)
+
+        built = {}
+        for key, (location_id, year) in keys.items():
+            if (location_id, year) not in missing:
+                continue
+            calendar = Calendar(
+                year,
+                locations[location_id].workdays,
+                holidays.get((location_id, year), []),
+            )
+            self.calendars[(location_id, year)] = built[key] = calendar
+        cache.set_many(built, timeout=CALENDAR_TIMEOUT)
+
+    def count_workdays(self, location: models.Location, start: date, end: date) -> int:
+        """Count workdays at location between start and end (inclusive)."""
+        self.load([location], start, end)
+        return sum(
+            self.calendars[(location.pk, year)].count_workdays(start, end)
+            for year in range(start.year, end.year + 1)
+        )
+
+    def is_workday(self, location: models.Location, day: date) -> bool:
+        self.load([location], day, day)
+        return self.calendars[(location.pk, day.year)].is_workday(day)
@@ -0,0 +1,182 @@
+"""Maintenance of the materialized worktime ledger.
+
+When `settings.WORKTIME_LEDGER` is enabled the worktime of each user is
+materialized per day in `WorktimeLedger` and kept up to date by signals.
+Balances are then calculated by summing up ledger entries over a range.
+
+After enabling the ledger it needs to be built initially with the management
+command `rebuild_worktime_ledger`. As employments without an end date are
+only materialized until the end of next year the command needs to be run at
+least once a year.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+from django.db.models import F, Q, Sum
+
+from timed.employment import models
+from timed.employment.worktime import absence_duration, load_worktime_data
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    from timed.employment.worktime import Worktime
+
+
+def horizon() -> date:
+    """Get last day employments without end date are materialized for."""
+    return date(date.today().year + 1, 12, 31)
+
+
+def _build_entries(
+    user_id: int,
+    employments: list[models.Employment],
+    start: date,
+    end: date,
+    data: dict,
+) -> list[models.WorktimeLedger]:
+    entries = []
+    reports = data["reports"][user_id]
+    credits = {}  # noqa: A001
+    for credit_date, duration in data["credits"][user_id]:
+        credits[credit_date] = duration
+    # absences are summed up per day and type
+    absences = defaultdict(list)
+    for absence_date, fill_worktime, absence_type_id in data["absences"][user_id]:
+        absences[absence_date].append((absence_type_id, fill_worktime))
+
+    for employment in employments:
+        day = max(start, employment.start_date)
+        last_day = min(end, employment.end_date or horizon())
+        while day <= last_day:
+            entry = models.WorktimeLedger(
+                user_id=user_id,
+                date=day,
+                reported=reports.get(day, timedelta()),
+                credit=credits.get(day, timedelta()),
+                open_ended=employment.end_date is None,
+            )
+            if data["calendars"].is_workday(employment.location, day):
+                entry.expected = employment.worktime_per_day
+
+            entries.append(entry)
+            for absence_type_id, fill_worktime in sorted(absences.get(day, [])):
+                if entry.absence_type_id not in (None, absence_type_id):
+                    # further absence types are kept in entries of their own
+                    entry = models.WorktimeLedger(
+                        user_id=user_id,
+                        date=day,
+                        open_ended=employment.end_date is None,
+                    )
+                    entries.append(entry)
+                entry.absence_type_id = absence_type_id
+                entry.absence += absence_duration(
+                    employment, fill_worktime, reports.get(day, timedelta())
+                )
+
+            day += timedelta(days=1)
+
+    return entries
+
+
+def update_ledger(user_id: int, start: date, end: date) -> None:
+    """Recalculate ledger of user for all days between start and end."""
+    employments = list(
+        models.Employment.objects.filter(user_id=user_id, start_date__lte=end)
+        .filter(Q(end_date__gte=start) | Q(end_date__isnull=True))
+        .select_related("location")
+    )
+
+    with transaction.atomic():
+        models.WorktimeLedger.objects.filter(
+            user_id=user_id, date__range=[start, end]
+        ).delete()
+        if not employments:
+            return
+
+        locations = {employment.location for employment in employments}
+        data = load_worktime_data({user_id}, locations, start, end)
+        models.WorktimeLedger.objects.bulk_create(
+            _build_entries(user_id, employments, start, end, data)
+        )
+
+
+def update_days(days: Iterable[tuple[int, date]]) -> None:
+    """Recalculate ledger of given pairs of user id and day.
+
+    Days of a user are recalculated at once from the first to the last day.
+    """
+    ranges = {}
+    for user_id, day in days:
+        start, end = ranges.get(user_id, (day, day))
+        ranges[user_id] = (min(start, day), max(end, day))
+
+    for user_id, (start, end) in ranges.items():
+        update_ledger(user_id, start, end)
+
+
+def update_employment_ledger(employment: models.Employment) -> None:
+    """Recalculate ledger for all days of given employment."""
+    update_ledger(
+        employment.user_id, employment.start_date, employment.end_date or horizon()
+    )
+
+
+def rebuild_ledger(users: Iterable[models.User | int] | None = None) -> None:
+    """Rebuild ledger of given users or of all users if none are given."""
+    employments = models.Employment.objects.all()
+    if users is not None:
+        user_ids = [getattr(user, "pk", user) for user in users]
+        employments = employments.filter(user_id__in=user_ids)
+        models.WorktimeLedger.objects.filter(user_id__in=user_ids).delete()
+    else:
+        models.WorktimeLedger.objects.all().delete()
+
+    for employment in employments.iterator():
+        update_employment_ledger(employment)
+
+
+def calculate_worktime(
+    user_ids: Iterable[int], start: date, end: date
+) -> dict[int, Worktime]:
+    """Calculate reported, expected and balance for users from the ledger.
+
+    See `timed.employment.worktime.calculate_worktime`.
+    """
+    result = {user_id: (timedelta(), timedelta(), timedelta()) for user_id in user_ids}
+    sums = (
+        models.WorktimeLedger.objects.filter(
+            Q(open_ended=False) | Q(date__lte=date.today()),
+            user_id__in=result.keys(),
+            date__range=[start, end],
+        )
+        .order_by()
+        .values("user_id")
+        .annotate(
+            reported=Sum(F("reported") + F("absence") + F("credit")),
+            expected=Sum("expected"),
+        )
+    )
+    for entry in sums:
+        result[entry["user_id"]] = (
+            entry["reported"],
+            entry["expected"],
+            entry["reported"] - entry["expected"],
+        )
+
+    return result
+
+
+def calculate_absence_duration(
+    user: models.User, absence_type: models.AbsenceType, start: date, end: date
+) -> timedelta:
+    """Sum up duration of absences of given type from the ledger."""
+    data = models.WorktimeLedger.objects.filter(
+        user=user, absence_type=absence_type, date__range=[start, end]
+    ).aggregate(duration=Sum("absence"))
+    return data["duration"] or timedelta()
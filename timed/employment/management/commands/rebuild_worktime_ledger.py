@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from timed.employment.ledger import rebuild_ledger
+
+
+class Command(BaseCommand):
+    """Rebuild the materialized worktime ledger.
+
+    Needs to be run after enabling `DJANGO_WORKTIME_LEDGER` and at least
+    once a year to extend employments without an end date.
+    """
+
+    help = "Rebuild worktime ledger of all or given users."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="users",
+            help="Only rebuild ledger of user with given id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        rebuild_ledger(options["users"])
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.11 on 2026-10-17 01:43
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("employment", "0015_user_is_accountant"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorktimeLedger",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("reported", models.DurationField(default=datetime.timedelta(0))),
+                ("absence", models.DurationField(default=datetime.timedelta(0))),
+                ("expected", models.DurationField(default=datetime.timedelta(0))),
+                ("credit", models.DurationField(default=datetime.timedelta(0))),
+                ("open_ended", models.BooleanField(default=False)),
+                (
+                    "absence_type",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="employment.absencetype",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="worktime_ledger",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "date")},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 06:30
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employment', '0016_worktimeledger'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='worktimeledger',
+            unique_together={('user', 'date', 'absence_type')},
+        ),
+    ]
@@ -5,17 +5,19 @@ from __future__ import annotations
 from datetime import date, timedelta
 from typing import TYPE_CHECKING
 
-from dateutil import rrule
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser, UserManager
+from django.core.cache import cache
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import Sum, functions
 from django.utils.translation import gettext_lazy as _
 
+from timed.cache import get_request_cache
 from timed.models import WeekdaysField
 from timed.projects.models import CustomerAssignee, ProjectAssignee, TaskAssignee
-from timed.tracking.models import Absence, Report
+from timed.roles import get_roles
+from timed.tracking.models import Absence
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -163,18 +165,67 @@ class OvertimeCredit(models.Model):
 class EmploymentManager(models.Manager):
     """Custom manager for employments."""
 
-    def get_at(self, user: User, date: date) -> Employment:
+    def _get_user_employments(self, user_id: int) -> list[Employment] | None:
+        """Get all employments of a user from the request or shared cache.
+
+        Returns None when there is no request and the shared cache is
+        disabled.
+        """
+        request_cache = get_request_cache()
+        timeout = settings.EMPLOYMENT_CACHE_TIMEOUT
+        if request_cache is None and not timeout:
+            return None
+
+        user_employments = (
+            {} if request_cache is None else request_cache.setdefault("employments", {})
+        )
+        if user_id not in user_employments:
+            key = f"employment.employments.{user_id}"
+            employments = cache.get(key) if timeout else None
+            if employments is None:
+                employments = list(
+                    self.filter(user_id=user_id).select_related("location")
+                )
+                if timeout:
+                    cache.set(key, employments, timeout=timeout)
+            user_employments[user_id] = employments
+
+        return user_employments[user_id]
+
+    def get_at(self, user: User | int, date: date) -> Employment:
         """Get employment of user at given date.
 
+        Within a request all employments of the user are loaded once and
+        looked up in memory.
+
         :param User user: The user of the searched employments
         :param datetime.date date: date of employment
         :returns: Employment
         """
-        return self.get(
-            (models.Q(end_date__gte=date) | models.Q(end_date__isnull=True)),
-            start_date__lte=date,
-            user=user,
-        )
+        employments = None
+        if date is not None:
+            employments = self._get_user_employments(getattr(user, "pk", user))
+
+        if employments is None:
+            return self.get(
+                (models.Q(end_date__gte=date) | models.Q(end_date__isnull=True)),
+                start_date__lte=date,
+                user=user,
+            )
+
+        matches = [
+            employment
+            for employment in employments
+            if employment.start_date <= date
+            and (employment.end_date is None or date <= employment.end_date)
+        ]
+        if not matches:
+            msg = "Employment matching query does not exist."
+            raise self.model.DoesNotExist(msg)
+        if len(matches) > 1:
+            msg = "get_at() returned more than one Employment."
+            raise self.model.MultipleObjectsReturned(msg)
+        return matches[0]
 
     def for_user(self, user: User, start: date, end: date) -> QuerySet[Employment]:
         """Get employments in given time frame for current user.
@@ -251,54 +302,54 @@ class Employment(models.Model):
 
         Return a tuple with 3 timedeltas of reported, expected and the delta.
         """
-        # shorten time frame to employment
-        start = max(start, self.start_date)
-        end = min(self.end_date or date.today(), end)
-
-        # workdays is in isoweekday, byweekday expects Monday to be zero
-        week_workdays = [int(day) - 1 for day in self.location.workdays]
-        workdays = rrule.rrule(
-            rrule.DAILY, dtstart=start, until=end, byweekday=week_workdays
-        ).count()
-
-        # converting workdays as db expects 1 (Sunday) to 7 (Saturday)
-        workdays_db = [
-            # special case for Sunday
-            int(day) == 7 and 1 or int(day) + 1  # noqa: PLR2004
-            for day in self.location.workdays
-        ]
-        holidays = PublicHoliday.objects.filter(
-            location=self.location,
-            date__gte=start,
-            date__lte=end,
-            date__week_day__in=workdays_db,
-        ).count()
-
-        expected_worktime = self.worktime_per_day * (workdays - holidays)
-
-        overtime_credit_data = OvertimeCredit.objects.filter(
-            user=self.user_id, date__gte=start, date__lte=end
-        ).aggregate(total_duration=Sum("duration"))
-        overtime_credit = overtime_credit_data["total_duration"] or timedelta()
-
-        reported_worktime_data = Report.objects.filter(
-            user=self.user_id, date__gte=start, date__lte=end
-        ).aggregate(duration_total=Sum("duration"))
-        reported_worktime = reported_worktime_data["duration_total"] or timedelta()
-
-        absences = sum(
-            [
-                absence.calculate_duration(self)
-                for absence in Absence.objects.filter(
-                    user=self.user_id, date__gte=start, date__lte=end
-                ).select_related("absence_type")
-            ],
-            timedelta(),
-        )
+        from timed.employment.worktime import calculate_employment_worktime
+
+        return calculate_employment_worktime([self], start, end)[self.pk]
 
-        reported = reported_worktime + absences + overtime_credit
 
-        return (reported, expected_worktime, reported - expected_worktime)
+class WorktimeLedger(models.Model):
+    """Worktime ledger model.
+
+    A ledger entry materializes the worktime of a user on a single day of an
+    employment, so worktime balances can be summed up over a range of days
+    instead of being calculated from all reports, absences and credits.
+
+    Absences of further types on the same day are materialized in additional
+    entries only holding the absence, so absence durations can be summed up
+    per type.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="worktime_ledger",
+    )
+    date = models.DateField()
+    reported = models.DurationField(default=timedelta(0))
+    absence = models.DurationField(default=timedelta(0))
+    """
+    Duration the absence on this day counts as worktime.
+    """
+    absence_type = models.ForeignKey(
+        AbsenceType, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    expected = models.DurationField(default=timedelta(0))
+    credit = models.DurationField(default=timedelta(0))
+    open_ended = models.BooleanField(default=False)
+    """
+    Mark whether the day belongs to an employment without end date.
+
+    Such employments end today, hence those entries only count up to today.
+    """
+
+    class Meta:
+        """Meta information for the worktime ledger model."""
+
+        unique_together = ("user", "date", "absence_type")
+
+    def __str__(self) -> str:
+        """Represent the model as a string."""
+        return f"{self.user.username} ({self.date:%d.%m.%Y})"
 
 
 class UserManager(UserManager):
@@ -352,11 +403,7 @@ class User(AbstractUser):
 
     @property
     def is_reviewer(self) -> bool:
-        return (
-            TaskAssignee.objects.filter(user=self, is_reviewer=True).exists()
-            or ProjectAssignee.objects.filter(user=self, is_reviewer=True).exists()
-            or CustomerAssignee.objects.filter(user=self, is_reviewer=True).exists()
-        )
+        return get_roles(self).has_role("is_reviewer")
 
     @property
     def user_id(self) -> int:
@@ -373,19 +420,9 @@ class User(AbstractUser):
 
         Return a tuple with 3 timedeltas of reported, expected and balance.
         """
-        employments = Employment.objects.for_user(self, start, end).select_related(
-            "location"
-        )
-
-        balances = [
-            employment.calculate_worktime(start, end) for employment in employments
-        ]
-
-        reported = sum([balance[0] for balance in balances], timedelta())
-        expected = sum([balance[1] for balance in balances], timedelta())
-        balance = sum([balance[2] for balance in balances], timedelta())
+        from timed.employment.worktime import calculate_worktime
 
-        return (reported, expected, balance)
+        return calculate_worktime([self], start, end)[self.pk]
 
     def get_active_employment(self) -> Employment | None:
         """Get current employment of the user.
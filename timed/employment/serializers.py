@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import date, timedelta
 from typing import TYPE_CHECKING
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Max, Value
+from django.db.models import Value
 from django.db.models.functions import Coalesce
 from django.utils.duration import duration_string
 from django.utils.translation import gettext_lazy as _
+from rest_framework.serializers import ListSerializer
 from rest_framework_json_api import relations
 from rest_framework_json_api.serializers import (
     ModelSerializer,
@@ -18,8 +21,8 @@ from rest_framework_json_api.serializers import (
     ValidationError,
 )
 
-from timed.employment import models
-from timed.tracking.models import Absence, Report
+from timed.employment import ledger, models, worktime
+from timed.tracking.models import Absence
 
 if TYPE_CHECKING:
     from typing import ClassVar
@@ -63,6 +66,15 @@ class UserSerializer(ModelSerializer):
         )
 
 
+class WorktimeBalanceListSerializer(ListSerializer):
+    """Calculate the balances of all listed users at once."""
+
+    def to_representation(self, data):
+        instances = list(data)
+        self.child.calculate_balances(instances)
+        return super().to_representation(instances)
+
+
 class WorktimeBalanceSerializer(Serializer):
     date = SerializerMethodField()
     balance = SerializerMethodField()
@@ -70,35 +82,46 @@ class WorktimeBalanceSerializer(Serializer):
         model=get_user_model(), read_only=True, source="id"
     )
 
-    def get_date(self, instance):
-        user = instance.id
-        today = date.today()
+    def calculate_balances(self, instances):
+        """Calculate balances of given instances in a fixed number of queries.
 
-        if instance.date is not None:
-            return instance.date
+        Instances without a specific date get their last reported date
+        assigned. Balances of instances with the same date are calculated
+        together.
+        """
+        without_date = [instance for instance in instances if instance.date is None]
+        if without_date:
+            last_reported_dates = worktime.get_last_reported_dates(
+                [instance.id for instance in without_date], date.today()
+            )
+            for instance in without_date:
+                instance.date = last_reported_dates[instance.id.id]
 
-        # calculate last reported day if no specific date is set
-        max_absence_date = Absence.objects.filter(user=user, date__lt=today).aggregate(
-            date=Max("date")
-        )
-        max_report_date = Report.objects.filter(user=user, date__lt=today).aggregate(
-            date=Max("date")
-        )
+        instances_per_date = defaultdict(list)
+        for instance in instances:
+            instances_per_date[instance.date].append(instance)
 
-        last_reported_date = max(
-            max_absence_date["date"] or date.min, max_report_date["date"] or date.min
-        )
+        for balance_date, date_instances in instances_per_date.items():
+            start = date(balance_date.year, 1, 1)
+            worktimes = worktime.calculate_worktime(
+                [instance.id for instance in date_instances], start, balance_date
+            )
+            for instance in date_instances:
+                _, _, balance = worktimes[instance.id.id]
+                instance["balance"] = duration_string(balance)
+
+    def get_date(self, instance):
+        if instance.date is None:
+            # calculate last reported day if no specific date is set
+            self.calculate_balances([instance])
 
-        instance.date = last_reported_date
         return instance.date
 
     def get_balance(self, instance):
-        balance_date = self.get_date(instance)
-        start = date(balance_date.year, 1, 1)
+        if "balance" not in instance:
+            self.calculate_balances([instance])
 
-        # id is mapped to user instance
-        _, _, balance = instance.id.calculate_worktime(start, balance_date)
-        return duration_string(balance)
+        return instance["balance"]
 
     included_serializers: ClassVar[dict[str, str]] = {
         "user": "timed.employment.serializers.UserSerializer"
@@ -106,6 +129,7 @@ class WorktimeBalanceSerializer(Serializer):
 
     class Meta:
         resource_name = "worktime-balances"
+        list_serializer_class = WorktimeBalanceListSerializer
 
 
 class AbsenceBalanceSerializer(Serializer):
@@ -179,20 +203,20 @@ class AbsenceBalanceSerializer(Serializer):
             return None
 
         start = self._get_start(instance)
-        absences = sum(
-            [
-                absence.calculate_duration(
-                    models.Employment.objects.get_at(instance.user, absence.date)
+        if settings.WORKTIME_LEDGER:
+            return duration_string(
+                ledger.calculate_absence_duration(
+                    instance.user, absence_type, start, instance.date
                 )
-                for absence in Absence.objects.filter(
-                    user=instance.user,
-                    date__range=[start, instance.date],
-                    absence_type_id=instance.id,
-                ).select_related("absence_type")
-            ],
-            timedelta(),
-        )
-        return duration_string(absences)
+            )
+
+        absences = Absence.objects.filter(
+            user=instance.user,
+            date__range=[start, instance.date],
+            absence_type_id=instance.id,
+        ).with_duration()
+        used_duration = sum((absence.duration for absence in absences), timedelta())
+        return duration_string(used_duration)
 
     def get_absence_credits(self, instance):
         """Get the absence credits for the user and type."""
@@ -0,0 +1,204 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from timed import changes, roles
+from timed.cache import clear_request_cache
+from timed.employment import calendar, ledger
+from timed.employment.models import (
+    AbsenceCredit,
+    AbsenceType,
+    Employment,
+    Location,
+    OvertimeCredit,
+    PublicHoliday,
+    User,
+)
+from timed.tracking.models import Absence, Report
+
+LEDGER_FIELDS = {
+    Report: ("user_id", "date"),
+    Absence: ("user_id", "date"),
+    OvertimeCredit: ("user_id", "date"),
+    Employment: ("user_id", "start_date", "end_date"),
+    PublicHoliday: ("location_id", "date"),
+    Location: ("workdays",),
+    AbsenceType: ("fill_worktime",),
+}
+
+
+def _ledger_enabled(**kwargs):
+    # ignore signal when loading a fixture
+    return settings.WORKTIME_LEDGER and not kwargs.get("raw", False)
+
+
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_calendars(sender, **kwargs):  # noqa: ARG001
+    """Invalidate cached calendars when holidays or workdays change.
+
+    Needs to be connected before the ledger is updated as the ledger uses
+    the calendars.
+    """
+    calendar.invalidate()
+
+
+@receiver(post_save, sender=Employment)
+@receiver(post_delete, sender=Employment)
+@receiver(post_save, sender=Location)
+def invalidate_employments(sender, instance, **kwargs):
+    """Invalidate cached employments of users affected by a change."""
+    clear_request_cache("employments")
+    if not settings.EMPLOYMENT_CACHE_TIMEOUT:
+        return
+
+    if sender is Location:
+        user_ids = set(instance.employments.values_list("user_id", flat=True))
+    else:
+        user_ids = {instance.user_id}
+    cache.delete_many([f"employment.employments.{user_id}" for user_id in user_ids])
+
+
+@receiver(m2m_changed, sender=User.supervisors.through)
+def invalidate_supervisees(sender, **kwargs):  # noqa: ARG001
+    """Invalidate cached roles when supervisors change."""
+    roles.invalidate()
+    changes.changed(User)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+@receiver(post_save, sender=Employment)
+@receiver(post_delete, sender=Employment)
+@receiver(post_save, sender=OvertimeCredit)
+@receiver(post_delete, sender=OvertimeCredit)
+@receiver(post_save, sender=AbsenceCredit)
+@receiver(post_delete, sender=AbsenceCredit)
+@receiver(post_save, sender=AbsenceType)
+@receiver(post_delete, sender=AbsenceType)
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def record_change(sender, instance, **kwargs):
+    """Record change of users and their employments, credits and calendars."""
+    changes.record_change(sender, instance)
+
+
+@receiver(pre_save, sender=Report)
+@receiver(pre_save, sender=Absence)
+@receiver(pre_save, sender=OvertimeCredit)
+@receiver(pre_save, sender=Employment)
+@receiver(pre_save, sender=PublicHoliday)
+@receiver(pre_save, sender=Location)
+@receiver(pre_save, sender=AbsenceType)
+def remember_ledger_fields(sender, instance, **kwargs):
+    """Remember fields affecting the ledger before they are changed."""
+    if not _ledger_enabled(**kwargs) or not instance.pk:
+        return
+
+    fields = LEDGER_FIELDS[sender]
+    if sender is Report:
+        # reports remember their original values when loaded
+        instance._ledger_original = instance.original_values(*fields)  # noqa: SLF001
+        return
+
+    instance._ledger_original = (  # noqa: SLF001
+        sender.objects.filter(pk=instance.pk).values(*fields).first()
+    )
+
+
+def _originals(instance):
+    original = getattr(instance, "_ledger_original", None)
+    instance._ledger_original = None  # noqa: SLF001
+    return [original] if original else []
+
+
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Report)
+@receiver(post_save, sender=Absence)
+@receiver(post_delete, sender=Absence)
+@receiver(post_save, sender=OvertimeCredit)
+@receiver(post_delete, sender=OvertimeCredit)
+def update_ledger_day(sender, instance, **kwargs):  # noqa: ARG001
+    """Update ledger on the day of a report, absence or overtime credit."""
+    if not _ledger_enabled(**kwargs):
+        return
+
+    days = {(instance.user_id, instance.date)}
+    days.update(
+        (original["user_id"], original["date"]) for original in _originals(instance)
+    )
+    for user_id, day in days:
+        ledger.update_ledger(user_id, day, day)
+
+
+@receiver(post_save, sender=Employment)
+@receiver(post_delete, sender=Employment)
+def update_ledger_employment(sender, instance, **kwargs):  # noqa: ARG001
+    """Update ledger on all days of a changed employment."""
+    if not _ledger_enabled(**kwargs):
+        return
+
+    for original in _originals(instance):
+        ledger.update_ledger(
+            original["user_id"],
+            original["start_date"],
+            original["end_date"] or ledger.horizon(),
+        )
+    ledger.update_employment_ledger(instance)
+
+
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+def update_ledger_public_holiday(sender, instance, **kwargs):  # noqa: ARG001
+    """Update ledger of all users employed at location of a public holiday."""
+    if not _ledger_enabled(**kwargs):
+        return
+
+    days = {(instance.location_id, instance.date)}
+    days.update(
+        (original["location_id"], original["date"]) for original in _originals(instance)
+    )
+    for location_id, day in days:
+        user_ids = (
+            Employment.objects.filter(location_id=location_id, start_date__lte=day)
+            .filter(Q(end_date__gte=day) | Q(end_date__isnull=True))
+            .values_list("user_id", flat=True)
+            .distinct()
+        )
+        for user_id in user_ids:
+            ledger.update_ledger(user_id, day, day)
+
+
+@receiver(post_save, sender=Location)
+def update_ledger_location(sender, instance, **kwargs):  # noqa: ARG001
+    """Update ledger of all employments at a location when workdays change."""
+    if not _ledger_enabled(**kwargs):
+        return
+
+    originals = _originals(instance)
+    if not originals or {int(day) for day in originals[0]["workdays"]} == {
+        int(day) for day in instance.workdays
+    }:
+        return
+
+    for employment in instance.employments.all():
+        ledger.update_employment_ledger(employment)
+
+
+@receiver(post_save, sender=AbsenceType)
+def update_ledger_absence_type(sender, instance, **kwargs):  # noqa: ARG001
+    """Update ledger on all days of absences of a type filling worktime or not."""
+    if not _ledger_enabled(**kwargs):
+        return
+
+    originals = _originals(instance)
+    if not originals or originals[0]["fill_worktime"] == instance.fill_worktime:
+        return
+
+    ledger.update_days(instance.absences.values_list("user_id", "date"))
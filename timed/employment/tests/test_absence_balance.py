@@ -77,7 +77,7 @@ def test_absence_balance_fill_worktime(auth_client, django_assert_num_queries):
     AbsenceFactory.create(date=day, user=user, absence_type=absence_type)
 
     url = reverse("absence-balance-list")
-    with django_assert_num_queries(11):
+    with django_assert_num_queries(8):
         result = auth_client.get(
             url,
             data={
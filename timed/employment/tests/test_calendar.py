@@ -0,0 +1,57 @@
+from datetime import date
+
+import pytest
+
+from timed.employment.calendar import Calendar, CalendarService
+from timed.employment.factories import LocationFactory, PublicHolidayFactory
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "workdays", "expected"),
+    [
+        (date(2017, 3, 20), date(2017, 3, 26), range(1, 6), 5),
+        (date(2017, 3, 20), date(2017, 3, 19), range(1, 6), 0),
+        (date(2017, 3, 18), date(2017, 3, 21), range(1, 6), 2),
+        (date(2017, 1, 1), date(2017, 12, 31), range(1, 6), 260),
+        (date(2016, 12, 1), date(2017, 1, 31), range(1, 6), 22),
+        (date(2017, 3, 18), date(2017, 3, 21), ["6", "7"], 2),
+    ],
+)
+def test_calendar_count_workdays(start, end, workdays, expected):
+    assert Calendar(2017, workdays, []).count_workdays(start, end) == expected
+
+
+def test_calendar_holidays():
+    calendar = Calendar(2016, range(1, 6), [date(2016, 2, 29), date(2016, 12, 31)])
+
+    assert calendar.count_workdays(date(2016, 1, 1), date(2016, 12, 31)) == 260
+    assert not calendar.is_workday(date(2016, 2, 29))
+    assert calendar.is_workday(date(2016, 3, 1))
+
+
+@pytest.mark.django_db()
+def test_calendar_service(django_assert_num_queries):
+    location = LocationFactory.create(workdays=["1", "2", "3", "4", "5"])
+    PublicHolidayFactory.create(location=location, date=date(2017, 1, 2))
+    PublicHolidayFactory.create(location=location, date=date(2018, 1, 1))
+    start = date(2017, 1, 1)
+    end = date(2018, 1, 31)
+
+    with django_assert_num_queries(1):
+        assert CalendarService().count_workdays(location, start, end) == 259 + 22
+    # calendars are cached
+    with django_assert_num_queries(0):
+        assert CalendarService().count_workdays(location, start, end) == 259 + 22
+    # only calendars which are not cached yet are built
+    with django_assert_num_queries(1):
+        assert (
+            CalendarService().count_workdays(location, date(2016, 12, 1), end)
+            == 22 + 259 + 22
+        )
+
+    PublicHolidayFactory.create(location=location, date=date(2017, 1, 3))
+    assert CalendarService().count_workdays(location, start, end) == 258 + 22
+
+    location.workdays = ["1", "2", "3", "4", "5", "6"]
+    location.save()
+    assert CalendarService().count_workdays(location, start, end) == 310 + 26
@@ -6,6 +6,7 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
+from timed.cache import request_cache
 from timed.employment import factories
 from timed.employment.admin import EmploymentForm
 from timed.employment.factories import EmploymentFactory, LocationFactory, UserFactory
@@ -176,6 +177,35 @@ def test_employment_get_at():
         Employment.objects.get_at(user, employment.start_date + timedelta(days=21))
 
 
+@pytest.mark.django_db()
+@pytest.mark.parametrize("cache_timeout", [0, 60])
+def test_employment_get_at_cached(settings, django_assert_num_queries, cache_timeout):
+    """Should load employments of a user only once per request."""
+    settings.EMPLOYMENT_CACHE_TIMEOUT = cache_timeout
+    user = UserFactory.create()
+    employment = EmploymentFactory.create(
+        user=user, start_date=date(2017, 1, 1), end_date=date(2017, 1, 31)
+    )
+    later = EmploymentFactory.create(user=user, start_date=date(2017, 2, 1))
+
+    with request_cache(), django_assert_num_queries(1):
+        assert Employment.objects.get_at(user, date(2017, 1, 15)) == employment
+        assert Employment.objects.get_at(user.id, date(2017, 3, 1)) == later
+        with pytest.raises(Employment.DoesNotExist):
+            Employment.objects.get_at(user, date(2016, 12, 31))
+
+    with request_cache():
+        later.end_date = date(2017, 2, 28)
+        later.save()
+        with pytest.raises(Employment.DoesNotExist):
+            Employment.objects.get_at(user, date(2017, 3, 1))
+
+    with request_cache():
+        EmploymentFactory.create(user=user, start_date=date(2017, 2, 15))
+        with pytest.raises(Employment.MultipleObjectsReturned):
+            Employment.objects.get_at(user, date(2017, 2, 20))
+
+
 @pytest.mark.django_db()
 def test_worktime_balance_partial():
     """
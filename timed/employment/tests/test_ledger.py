@@ -0,0 +1,214 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from timed.employment import ledger, worktime
+from timed.employment.factories import (
+    AbsenceTypeFactory,
+    EmploymentFactory,
+    OvertimeCreditFactory,
+    PublicHolidayFactory,
+)
+from timed.employment.models import WorktimeLedger
+from timed.tracking.factories import AbsenceFactory, ReportFactory
+
+
+def assert_ledger_matches(settings, user, start, end):
+    """Compare ledger with worktime calculated from raw data."""
+    settings.WORKTIME_LEDGER = False
+    expected = worktime.calculate_worktime([user], start, end)
+    settings.WORKTIME_LEDGER = True
+
+    assert ledger.calculate_worktime([user.id], start, end) == expected
+
+
+@pytest.mark.django_db()
+@pytest.mark.freeze_time("2017-03-31")
+def test_ledger_maintained_by_signals(settings):
+    settings.WORKTIME_LEDGER = True
+    start = date(2017, 1, 1)
+    end = date(2017, 12, 31)
+    employment = EmploymentFactory.create(
+        start_date=date(2017, 1, 2), worktime_per_day=timedelta(hours=8)
+    )
+    user = employment.user
+    fill_worktime = AbsenceTypeFactory.create(fill_worktime=True)
+
+    holiday = PublicHolidayFactory.create(
+        date=date(2017, 1, 3), location=employment.location
+    )
+    report = ReportFactory.create(
+        user=user, date=date(2017, 1, 4), duration=timedelta(hours=3)
+    )
+    # report after today is ignored as employment has no end date
+    ReportFactory.create(user=user, date=date(2017, 4, 4))
+    absence = AbsenceFactory.create(
+        user=user, date=date(2017, 1, 4), absence_type=fill_worktime
+    )
+    AbsenceFactory.create(user=user, date=date(2017, 1, 5))
+    credit = OvertimeCreditFactory.create(
+        user=user, date=date(2017, 1, 6), duration=timedelta(hours=2)
+    )
+    assert_ledger_matches(settings, user, start, end)
+
+    report.date = date(2017, 1, 9)
+    report.save()
+    holiday.date = date(2017, 1, 10)
+    holiday.save()
+    assert_ledger_matches(settings, user, start, end)
+
+    absence.delete()
+    credit.delete()
+    assert_ledger_matches(settings, user, start, end)
+
+    employment.location.workdays = ["1", "2", "3", "4", "5", "6"]
+    employment.location.save()
+    assert_ledger_matches(settings, user, start, end)
+
+    employment.end_date = date(2017, 6, 30)
+    employment.save()
+    assert_ledger_matches(settings, user, start, end)
+    assert not WorktimeLedger.objects.filter(date__gt=date(2017, 6, 30)).exists()
+
+    employment.delete()
+    assert not WorktimeLedger.objects.exists()
+
+
+@pytest.mark.django_db()
+@pytest.mark.freeze_time("2017-03-31")
+def test_rebuild_worktime_ledger(settings):
+    employment = EmploymentFactory.create(
+        start_date=date(2016, 12, 1), worktime_per_day=timedelta(hours=8)
+    )
+    user = employment.user
+    ReportFactory.create(user=user, date=date(2017, 1, 4))
+    AbsenceFactory.create(user=user, date=date(2017, 1, 5))
+    PublicHolidayFactory.create(date=date(2017, 1, 6), location=employment.location)
+    # ledger is not maintained when disabled
+    assert not WorktimeLedger.objects.exists()
+
+    settings.WORKTIME_LEDGER = True
+    call_command("rebuild_worktime_ledger")
+
+    assert WorktimeLedger.objects.latest("date").date == date(2018, 12, 31)
+    assert_ledger_matches(settings, user, date(2017, 1, 1), date(2017, 3, 31))
+
+    call_command("rebuild_worktime_ledger", "--user", user.id)
+    assert_ledger_matches(settings, user, date(2016, 1, 1), date(2016, 12, 31))
+
+
+@pytest.mark.django_db()
+@pytest.mark.freeze_time("2017-03-31")
+def test_ledger_absence_type_fill_worktime(settings):
+    settings.WORKTIME_LEDGER = True
+    employment = EmploymentFactory.create(
+        start_date=date(2017, 1, 2), worktime_per_day=timedelta(hours=8)
+    )
+    user = employment.user
+    absence_type = AbsenceTypeFactory.create(fill_worktime=False)
+    ReportFactory.create(user=user, date=date(2017, 1, 4), duration=timedelta(hours=3))
+    AbsenceFactory.create(user=user, date=date(2017, 1, 4), absence_type=absence_type)
+    AbsenceFactory.create(user=user, date=date(2017, 2, 6), absence_type=absence_type)
+    assert_ledger_matches(settings, user, date(2017, 1, 1), date(2017, 3, 31))
+
+    absence_type.fill_worktime = True
+    absence_type.save()
+    assert_ledger_matches(settings, user, date(2017, 1, 1), date(2017, 3, 31))
+    assert WorktimeLedger.objects.get(date=date(2017, 1, 4)).absence == timedelta(
+        hours=5
+    )
+
+    # unrelated changes don't update the ledger
+    absence_type.name = "changed"
+    absence_type.save()
+    assert_ledger_matches(settings, user, date(2017, 1, 1), date(2017, 3, 31))
+
+
+@pytest.mark.django_db()
+def test_ledger_several_absences_per_day():
+    employment = EmploymentFactory.create(
+        start_date=date(2017, 1, 2), worktime_per_day=timedelta(hours=8)
+    )
+    fill_worktime, other = AbsenceTypeFactory.create_batch(2)
+    day = date(2017, 1, 4)
+    data = worktime.load_worktime_data(
+        {employment.user_id}, {employment.location}, day, day
+    )
+    data["reports"][employment.user_id][day] = timedelta(hours=3)
+    data["absences"][employment.user_id] = [
+        (day, True, fill_worktime.id),
+        (day, False, other.id),
+    ]
+
+    entries = ledger._build_entries(  # noqa: SLF001
+        employment.user_id, [employment], day, day, data
+    )
+    WorktimeLedger.objects.bulk_create(entries)
+
+    # absences of the other type are kept in an entry of their own
+    assert len(entries) == 2
+    assert ledger.calculate_worktime([employment.user_id], day, day) == {
+        employment.user_id: (
+            timedelta(hours=16),
+            timedelta(hours=8),
+            timedelta(hours=8),
+        )
+    }
+    assert ledger.calculate_absence_duration(
+        employment.user, fill_worktime, day, day
+    ) == timedelta(hours=5)
+    assert ledger.calculate_absence_duration(
+        employment.user, other, day, day
+    ) == timedelta(hours=8)
+
+
+def test_worktime_balance_ledger(auth_client, settings, django_assert_num_queries):
+    settings.WORKTIME_LEDGER = True
+    EmploymentFactory.create(
+        user=auth_client.user,
+        start_date=date(2017, 3, 20),
+        end_date=date(2017, 3, 24),
+        worktime_per_day=timedelta(hours=8),
+    )
+    ReportFactory.create(
+        user=auth_client.user, date=date(2017, 3, 20), duration=timedelta(hours=10)
+    )
+
+    url = reverse("worktime-balance-detail", args=[f"{auth_client.user.id}_2017-03-24"])
+    with django_assert_num_queries(3):
+        result = auth_client.get(url)
+
+    assert result.status_code == status.HTTP_200_OK
+    assert result.json()["data"]["attributes"]["balance"] == "-2 18:00:00"
+
+
+def test_absence_balance_fill_worktime_ledger(auth_client, settings):
+    settings.WORKTIME_LEDGER = True
+    absence_type = AbsenceTypeFactory.create(fill_worktime=True)
+    EmploymentFactory.create(
+        user=auth_client.user,
+        start_date=date(2017, 1, 1),
+        worktime_per_day=timedelta(hours=5),
+    )
+    ReportFactory.create(
+        user=auth_client.user, date=date(2017, 2, 28), duration=timedelta(hours=3)
+    )
+    AbsenceFactory.create(
+        user=auth_client.user, date=date(2017, 2, 28), absence_type=absence_type
+    )
+
+    url = reverse("absence-balance-list")
+    result = auth_client.get(
+        url,
+        data={
+            "date": "2017-03-01",
+            "user": auth_client.user.id,
+            "absence_type": absence_type.id,
+        },
+    )
+
+    assert result.status_code == status.HTTP_200_OK
+    assert result.json()["data"][0]["attributes"]["used-duration"] == "02:00:00"
@@ -0,0 +1,105 @@
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from timed.employment.factories import (
+    AbsenceTypeFactory,
+    EmploymentFactory,
+    OvertimeCreditFactory,
+    PublicHolidayFactory,
+    UserFactory,
+)
+from timed.employment.worktime import calculate_worktime, get_last_reported_dates
+from timed.tracking.factories import AbsenceFactory, ReportFactory
+
+
+@pytest.mark.django_db()
+def test_calculate_worktime_multiple_users(django_assert_num_queries):
+    start = date(2017, 3, 20)
+    end = date(2017, 3, 26)
+    fill_worktime = AbsenceTypeFactory.create(fill_worktime=True)
+
+    first = EmploymentFactory.create(
+        start_date=date(2017, 1, 1), worktime_per_day=timedelta(hours=8)
+    )
+    second = EmploymentFactory.create(
+        start_date=date(2017, 3, 22),
+        end_date=date(2017, 3, 23),
+        worktime_per_day=timedelta(hours=4),
+    )
+    unemployed = UserFactory.create()
+
+    PublicHolidayFactory.create(date=date(2017, 3, 20), location=first.location)
+    OvertimeCreditFactory.create(
+        user=first.user, date=date(2017, 3, 21), duration=timedelta(hours=1)
+    )
+    ReportFactory.create(
+        user=first.user, date=date(2017, 3, 21), duration=timedelta(hours=6)
+    )
+    AbsenceFactory.create(
+        user=first.user, date=date(2017, 3, 21), absence_type=fill_worktime
+    )
+    AbsenceFactory.create(user=first.user, date=date(2017, 3, 22))
+    # report outside of employment is ignored
+    ReportFactory.create(
+        user=second.user, date=date(2017, 3, 21), duration=timedelta(hours=3)
+    )
+    ReportFactory.create(
+        user=second.user, date=date(2017, 3, 22), duration=timedelta(hours=3)
+    )
+
+    with django_assert_num_queries(5):
+        worktimes = calculate_worktime(
+            [first.user, second.user, unemployed.id], start, end
+        )
+
+    # 4 workdays of 8 hours, 6 hours reported, 2 hours filled, 8 hours absence
+    # and 1 hour credit
+    assert worktimes[first.user.id] == (
+        timedelta(hours=17),
+        timedelta(hours=32),
+        timedelta(hours=-15),
+    )
+    assert worktimes[second.user.id] == (
+        timedelta(hours=3),
+        timedelta(hours=8),
+        timedelta(hours=-5),
+    )
+    assert worktimes[unemployed.id] == (timedelta(), timedelta(), timedelta())
+    assert first.calculate_worktime(start, end) == worktimes[first.user.id]
+
+
+@pytest.mark.django_db()
+def test_get_last_reported_dates():
+    reporter, absent, inactive = UserFactory.create_batch(3)
+    ReportFactory.create(user=reporter, date=date(2017, 3, 20))
+    ReportFactory.create(user=reporter, date=date(2017, 3, 24))
+    AbsenceFactory.create(user=reporter, date=date(2017, 3, 21))
+    AbsenceFactory.create(user=absent, date=date(2017, 3, 22))
+
+    assert get_last_reported_dates([reporter, absent, inactive], date(2017, 3, 24)) == {
+        reporter.id: date(2017, 3, 21),
+        absent.id: date(2017, 3, 22),
+        inactive.id: date.min,
+    }
+
+
+@pytest.mark.parametrize("supervisees", [1, 5])
+def test_worktime_balance_list_constant_queries(
+    auth_client, django_assert_num_queries, supervisees
+):
+    for employment in EmploymentFactory.create_batch(
+        supervisees, start_date=date(2017, 1, 1)
+    ):
+        auth_client.user.supervisees.add(employment.user)
+        ReportFactory.create(user=employment.user, date=date(2017, 1, 2))
+
+    url = reverse("worktime-balance-list")
+
+    with django_assert_num_queries(7):
+        result = auth_client.get(url, data={"date": "2017-01-31"})
+
+    assert result.status_code == status.HTTP_200_OK
+    assert len(result.json()["data"]) == supervisees + 1
@@ -11,6 +11,8 @@ from timed.employment.factories import (
     PublicHolidayFactory,
     UserFactory,
 )
+from timed.employment.serializers import WorktimeBalanceSerializer
+from timed.serializers import AggregateObject
 from timed.tracking.factories import AbsenceFactory, ReportFactory
 
 
@@ -89,7 +91,7 @@ def test_worktime_balance_with_employments(auth_client, django_assert_num_querie
         args=[f"{auth_client.user.id}_{end_date:%Y-%m-%d}"],
     )
 
-    with django_assert_num_queries(11):
+    with django_assert_num_queries(7):
         result = auth_client.get(url)
     assert result.status_code == status.HTTP_200_OK
 
@@ -223,3 +225,22 @@ def test_worktime_balance_list_last_reported_date(
     entry = json["data"][0]
     assert entry["attributes"]["date"] == "2017-02-01"
     assert entry["attributes"]["balance"] == "02:00:00"
+
+
+@pytest.mark.django_db()
+@pytest.mark.freeze_time("2017-02-02")
+def test_worktime_balance_serializer_last_reported_date():
+    """Serializing a single balance without date uses last reported date."""
+    employment = EmploymentFactory.create(
+        start_date=date(2017, 2, 1), worktime_per_day=timedelta(hours=8)
+    )
+    ReportFactory.create(
+        user=employment.user, date=date(2017, 2, 1), duration=timedelta(hours=10)
+    )
+
+    data = WorktimeBalanceSerializer(
+        AggregateObject(id=employment.user, date=None)
+    ).data
+
+    assert data["date"] == date(2017, 2, 1)
+    assert data["balance"] == "02:00:00"
@@ -17,7 +17,7 @@ from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
 from timed.employment import filters, models, serializers
 from timed.employment.permissions import NoReports
-from timed.mixins import AggregateQuerysetMixin
+from timed.mixins import AggregateQuerysetMixin, ConditionalGetMixin
 from timed.permissions import (
     IsAuthenticated,
     IsCreateOnly,
@@ -28,7 +28,8 @@ from timed.permissions import (
     IsSupervisor,
     IsUpdateOnly,
 )
-from timed.projects.models import CustomerAssignee, Task
+from timed.projects.models import EffectiveRole, Task
+from timed.roles import get_roles
 from timed.tracking.models import Absence, Report
 
 if TYPE_CHECKING:
@@ -74,7 +75,7 @@ class UserViewSet(ModelViewSet):
                 user=user, date=datetime.date.today()
             )
         except models.Employment.DoesNotExist:
-            if CustomerAssignee.objects.filter(user=user, is_customer=True).exists():
+            if get_roles(user).has_customer_role("is_customer"):
                 assigned_tasks = Task.objects.filter(
                     Q(
                         project__customer__customer_assignees__user=user,
@@ -88,17 +89,9 @@ class UserViewSet(ModelViewSet):
             msg = "User has no employment"
             raise exceptions.PermissionDenied(msg) from None
         if current_employment.is_external:
-            assigned_tasks = Task.objects.filter(
-                Q(task_assignees__user=user, task_assignees__is_reviewer=True)
-                | Q(
-                    project__project_assignees__user=user,
-                    project__project_assignees__is_reviewer=True,
-                )
-                | Q(
-                    project__customer__customer_assignees__user=user,
-                    project__customer__customer_assignees__is_reviewer=True,
-                )
-            )
+            assigned_tasks = EffectiveRole.objects.filter(
+                user=user, role=EffectiveRole.REVIEWER
+            ).values("task")
             visible_reports = Report.objects.all().filter(
                 Q(task__in=assigned_tasks) | Q(user=user)
             )
@@ -163,11 +156,39 @@ class UserViewSet(ModelViewSet):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class WorktimeBalanceViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class BalanceConditionalGetMixin(ConditionalGetMixin):
+    """Validate balances of the users of a request with change versions."""
+
+    conditional_models = (
+        models.User,
+        models.AbsenceType,
+        models.PublicHoliday,
+        models.Location,
+    )
+    # balances are calculated up to today
+    conditional_daily = True
+
+    def get_conditional_user_ids(self):
+        pk = self.kwargs.get("pk")
+        if pk is None:
+            return super().get_conditional_user_ids()
+        user_id = pk.split("_")[0]
+        return [int(user_id)] if user_id.isdigit() else None
+
+
+class WorktimeBalanceViewSet(
+    BalanceConditionalGetMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
     """Calculate worktime for different user on different dates."""
 
     serializer_class = serializers.WorktimeBalanceSerializer
     filterset_class = filters.WorktimeBalanceFilterSet
+    conditional_user_models = (
+        Report,
+        Absence,
+        models.OvertimeCredit,
+        models.Employment,
+    )
 
     def _extract_date(self):
         """Extract date from request.
@@ -222,11 +243,19 @@ class WorktimeBalanceViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         return queryset
 
 
-class AbsenceBalanceViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class AbsenceBalanceViewSet(
+    BalanceConditionalGetMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
     """Calculate absence balance for different user on different dates."""
 
     serializer_class = serializers.AbsenceBalanceSerializer
     filterset_class = filters.AbsenceBalanceFilterSet
+    conditional_user_models = (
+        Report,
+        Absence,
+        models.AbsenceCredit,
+        models.Employment,
+    )
 
     def _extract_date(self):
         """Extract date from request.
@@ -311,7 +340,7 @@ class AbsenceBalanceViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         if (
             not current_user.is_superuser
             and current_user.id != user.id
-            and not current_user.supervisees.filter(id=user.id).exists()
+            and user.id not in get_roles(current_user).supervisee_ids
         ):
             return models.AbsenceType.objects.none()
 
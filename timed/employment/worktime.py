@@ -0,0 +1,232 @@
+"""Set-based calculation of worktime balances.
+
+Instead of calculating the worktime employment by employment, which issues
+several queries per employment and another one per fill worktime absence,
+the functions in this module load all data needed for a set of users in a
+fixed number of grouped queries and calculate the balances in memory.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db.models import Max, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from timed.employment import models
+from timed.employment.calendar import CalendarService
+from timed.tracking.models import Absence, Report
+
+if TYPE_CHECKING:
+    from typing import Iterable
+
+    Worktime = tuple[timedelta, timedelta, timedelta]
+
+
+def _user_ids(users: Iterable[models.User | int]) -> list[int]:
+    return [getattr(user, "pk", user) for user in users]
+
+
+def absence_duration(
+    employment: models.Employment,
+    fill_worktime: bool,  # noqa: FBT001
+    reported_time: timedelta,
+) -> timedelta:
+    """Calculate duration of an absence with given employment.
+
+    See `Absence.calculate_duration`.
+    """
+    if not fill_worktime:
+        return employment.worktime_per_day
+
+    # prevent negative duration in case user already
+    # reported more time than worktime per day
+    return max(employment.worktime_per_day - reported_time, timedelta())
+
+
+def load_worktime_data(
+    user_ids: set[int], locations: Iterable[models.Location], start: date, end: date
+) -> dict:
+    """Load all data needed to calculate worktime in grouped queries."""
+    calendars = CalendarService()
+    calendars.load(locations, start, end)
+
+    credits = defaultdict(list)  # noqa: A001
+    for entry in (
+        models.OvertimeCredit.objects.filter(
+            user_id__in=user_ids, date__range=[start, end]
+        )
+        .order_by()
+        .values("user_id", "date")
+        .annotate(duration=Sum("duration"))
+    ):
+        credits[entry["user_id"]].append((entry["date"], entry["duration"]))
+
+    reports = defaultdict(dict)
+    for entry in (
+        Report.objects.filter(user_id__in=user_ids, date__range=[start, end])
+        .order_by()
+        .values("user_id", "date")
+        .annotate(duration=Sum("duration"))
+    ):
+        reports[entry["user_id"]][entry["date"]] = entry["duration"]
+
+    absences = defaultdict(list)
+    for user_id, *absence in Absence.objects.filter(
+        user_id__in=user_ids, date__range=[start, end]
+    ).values_list("user_id", "date", "absence_type__fill_worktime", "absence_type_id"):
+        absences[user_id].append(absence)
+
+    return {
+        "calendars": calendars,
+        "credits": credits,
+        "reports": reports,
+        "absences": absences,
+    }
+
+
+def _calculate_frame(
+    employment: models.Employment, start: date, end: date, data: dict
+) -> Worktime:
+    """Calculate worktime of employment within given frame from loaded data."""
+    expected = employment.worktime_per_day * data["calendars"].count_workdays(
+        employment.location, start, end
+    )
+
+    reports = data["reports"][employment.user_id]
+    reported = sum(
+        (
+            duration
+            for report_date, duration in reports.items()
+            if start <= report_date <= end
+        ),
+        timedelta(),
+    )
+    reported += sum(
+        (
+            duration
+            for credit_date, duration in data["credits"][employment.user_id]
+            if start <= credit_date <= end
+        ),
+        timedelta(),
+    )
+    for absence_date, fill_worktime, _ in data["absences"][employment.user_id]:
+        if start <= absence_date <= end:
+            reported += absence_duration(
+                employment, fill_worktime, reports.get(absence_date, timedelta())
+            )
+
+    return (reported, expected, reported - expected)
+
+
+def calculate_employment_worktime(
+    employments: Iterable[models.Employment], start: date, end: date
+) -> dict[int, Worktime]:
+    """Calculate reported, expected and balance per employment.
+
+    The time frame is shortened to each employment. All employments need to
+    have their location loaded to avoid additional queries.
+
+    Return a dict mapping employment id to a tuple of reported, expected and
+    balance.
+    """
+    today = date.today()
+    frames = {}
+    for employment in employments:
+        frame_start = max(start, employment.start_date)
+        frame_end = min(employment.end_date or today, end)
+        frames[employment] = (frame_start, frame_end)
+
+    result = {
+        employment.pk: (timedelta(), timedelta(), timedelta()) for employment in frames
+    }
+    frames = {
+        employment: frame
+        for employment, frame in frames.items()
+        if frame[0] <= frame[1]
+    }
+    if not frames:
+        return result
+
+    user_ids = {employment.user_id for employment in frames}
+    locations = {employment.location for employment in frames}
+    lower = min(frame_start for frame_start, _ in frames.values())
+    upper = max(frame_end for _, frame_end in frames.values())
+    data = load_worktime_data(user_ids, locations, lower, upper)
+
+    for employment, (frame_start, frame_end) in frames.items():
+        result[employment.pk] = _calculate_frame(
+            employment, frame_start, frame_end, data
+        )
+
+    return result
+
+
+def calculate_worktime(
+    users: Iterable[models.User | int], start: date, end: date
+) -> dict[int, Worktime]:
+    """Calculate reported, expected and balance for given users.
+
+    This summarizes the worktime of all employments of the users which are
+    in given time frame. When the worktime ledger is enabled it is summed up
+    from the ledger instead.
+
+    Return a dict mapping user id to a tuple of reported, expected and balance.
+    """
+    user_ids = _user_ids(users)
+    if settings.WORKTIME_LEDGER:
+        from timed.employment import ledger
+
+        return ledger.calculate_worktime(user_ids, start, end)
+
+    employments = (
+        models.Employment.objects.annotate(
+            end=Coalesce("end_date", Value(date.today()))
+        )
+        .filter(user_id__in=user_ids)
+        .exclude(Q(end__lt=start) | Q(start_date__gt=end))
+        .select_related("location")
+    )
+    employments = list(employments)
+    worktimes = calculate_employment_worktime(employments, start, end)
+
+    result = {user_id: (timedelta(), timedelta(), timedelta()) for user_id in user_ids}
+    for employment in employments:
+        reported, expected, balance = result[employment.user_id]
+        employment_reported, employment_expected, employment_balance = worktimes[
+            employment.pk
+        ]
+        result[employment.user_id] = (
+            reported + employment_reported,
+            expected + employment_expected,
+            balance + employment_balance,
+        )
+
+    return result
+
+
+def get_last_reported_dates(
+    users: Iterable[models.User | int], before: date
+) -> dict[int, date]:
+    """Get the last date before given date on which users reported or were absent.
+
+    Users without any report or absence are mapped to `date.min`.
+    """
+    user_ids = _user_ids(users)
+    result = dict.fromkeys(user_ids, date.min)
+
+    for model in (Absence, Report):
+        last_dates = (
+            model.objects.filter(user_id__in=user_ids, date__lt=before)
+            .order_by()
+            .values("user_id")
+            .annotate(last_date=Max("date"))
+            .values_list("user_id", "last_date")
+        )
+        for user_id, last_date in last_dates:
+            result[user_id] = max(result[user_id], last_date)
+
+    return result
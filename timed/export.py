@@ -0,0 +1,151 @@
+"""Export rows to spreadsheet files without keeping them in memory.
+
+Rows can also be exported to Apache Arrow streams and Parquet files, which
+keep the types of their columns. Those need the optional `pyarrow` package.
+"""
+
+from __future__ import annotations
+
+import csv
+import tempfile
+from datetime import timedelta
+from importlib.util import find_spec
+from itertools import islice
+from typing import TYPE_CHECKING
+
+import pyexcel
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+from pyexcel_webio import FILE_TYPE_MIME_TABLE
+
+if TYPE_CHECKING:
+    from typing import IO, Iterable, Iterator
+
+    from django.http.response import HttpResponseBase
+
+# number of rows fetched from the database at once
+EXPORT_CHUNK_SIZE = 2000
+
+ARROW_FILE_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _Echo:
+    """File like object returning what is written instead of storing it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(rows: Iterable[Iterable]) -> Iterator[str]:
+    """Stream rows formatted as csv line by line."""
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def make_export_response(
+    rows: Iterable[Iterable], file_type: str, file_name: str, sheet_name: str
+) -> HttpResponseBase:
+    """Create a response exporting rows to a file of given type.
+
+    Csv is streamed to the client while it is being written. Other file
+    types are written row by row into a temporary file which is sent once
+    completed.
+    """
+    content_type = FILE_TYPE_MIME_TABLE[file_type]
+    if file_type == "csv":
+        response = StreamingHttpResponse(stream_csv(rows), content_type=content_type)
+        response["Content-Disposition"] = content_disposition_header(
+            as_attachment=True, filename=file_name
+        )
+        return response
+
+    file = tempfile.TemporaryFile()
+    pyexcel.isave_as(
+        array=rows,
+        dest_file_type=file_type,
+        dest_file_stream=file,
+        dest_sheet_name=sheet_name,
+    )
+    file.seek(0)
+    return FileResponse(
+        file, as_attachment=True, filename=file_name, content_type=content_type
+    )
+
+
+def arrow_available() -> bool:
+    """Check whether rows can be exported to Arrow and Parquet."""
+    return find_spec("pyarrow") is not None
+
+
+def _arrow_array(pa, values: list, kind: str):  # noqa: ANN001, ANN202
+    if kind == "date":
+        return pa.array(values, pa.date32())
+    if kind == "seconds":
+        return pa.array(
+            [
+                None if value is None else value // timedelta(seconds=1)
+                for value in values
+            ],
+            pa.int64(),
+        )
+    array = pa.array(values, pa.string())
+    # repeated values of categories are only stored once per batch
+    return array.dictionary_encode() if kind == "category" else array
+
+
+def write_arrow(
+    rows: Iterable[Iterable],
+    columns: list[tuple[str, str]],
+    file: IO[bytes],
+    file_type: str,
+) -> None:
+    """Write rows in record batches to an Arrow stream or a Parquet file.
+
+    Columns are given as name and kind, which is one of `date`, `seconds`
+    (durations), `string` or `category` (dictionary encoded strings).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {
+        "date": pa.date32(),
+        "seconds": pa.int64(),
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+    }
+    schema = pa.schema([(name, types[kind]) for name, kind in columns])
+    if file_type == "parquet":
+        writer = pq.ParquetWriter(file, schema)
+    else:
+        writer = pa.ipc.new_stream(file, schema)
+
+    rows = iter(rows)
+    with writer:
+        while batch := list(islice(rows, EXPORT_CHUNK_SIZE)):
+            arrays = [
+                _arrow_array(pa, list(values), kind)
+                for values, (_name, kind) in zip(zip(*batch), columns)
+            ]
+            writer.write_batch(pa.record_batch(arrays, schema=schema))
+
+
+def make_arrow_response(
+    rows: Iterable[Iterable],
+    columns: list[tuple[str, str]],
+    file_type: str,
+    file_name: str,
+) -> HttpResponseBase:
+    """Create a response exporting rows to an Arrow stream or Parquet file."""
+    file = tempfile.TemporaryFile()
+    write_arrow(rows, columns, file, file_type)
+    file.seek(0)
+    return FileResponse(
+        file,
+        as_attachment=True,
+        filename=file_name,
+        content_type=ARROW_FILE_TYPES[file_type],
+    )
@@ -1,5 +1,13 @@
+import hashlib
+import json
+from datetime import date, datetime, time
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework_json_api import relations
 
+from timed import changes
 from timed.serializers import AggregateObject
 
 
@@ -60,7 +68,7 @@ class AggregateQuerysetMixin:
 
                 qs = value.model.objects.filter(id__in=obj_ids)
                 qs = qs.select_related()
-                if hasattr(self, "prefetch_related_for_field"):  # pragma: no cover
+                if hasattr(self, "prefetch_related_for_field"):
                     qs = qs.prefetch_related(
                         *self.prefetch_related_for_field.get(source, [])
                     )
@@ -74,7 +82,8 @@ class AggregateQuerysetMixin:
                 **{
                     **entry,
                     **{
-                        field: objects[entry.get(field) or entry.get(f"{field}_id")]
+                        # related fields of aggregates may be empty
+                        field: objects.get(entry.get(field) or entry.get(f"{field}_id"))
                         for field, objects in prefetch_per_field.items()
                     },
                 }
@@ -86,3 +95,75 @@ class AggregateQuerysetMixin:
             data = data[0]
 
         return super().get_serializer(data, *args, **kwargs)
+
+
+class ConditionalGetMixin:
+    """Answer unchanged GET requests with 304 Not Modified.
+
+    ETag and Last-Modified are derived from the versions of the tables a
+    response is computed from (see `timed.changes`), so an unchanged
+    response is validated without querying or serializing anything.
+
+    `conditional_models` are the tables responses are computed from.
+    Of `conditional_user_models` only rows of the users returned by
+    `get_conditional_user_ids` are needed, so changes of other users do not
+    change the response. Responses depending on the current day need to set
+    `conditional_daily`.
+
+    Only active when `settings.CONDITIONAL_REQUESTS` is enabled.
+    """
+
+    conditional_models = ()
+    conditional_user_models = ()
+    conditional_daily = False
+
+    def get_conditional_user_ids(self):
+        """Get ids of users the response is limited to, None if not limited."""
+        user_id = self.request.query_params.get("user", "")
+        return [int(user_id)] if user_id.isdigit() else None
+
+    def _validators(self, request):
+        versions = changes.versions(
+            self.conditional_models,
+            self.conditional_user_models,
+            self.get_conditional_user_ids(),
+        )
+        last_modified = max(versions.values(), default=0)
+        # responses differ per user because of permissions
+        validator = [
+            request.user.pk,
+            request.accepted_renderer.format,
+            request.get_full_path(),
+            versions,
+        ]
+        if self.conditional_daily:
+            today = date.today()
+            validator.append(today.isoformat())
+            last_modified = max(
+                last_modified, datetime.combine(today, time()).timestamp()
+            )
+        digest = hashlib.sha256(json.dumps(validator, sort_keys=True).encode())
+        return f'"{digest.hexdigest()}"', int(last_modified)
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        if not settings.CONDITIONAL_REQUESTS:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self._validators(request)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(last_modified)
+        # clients need to validate responses on every request
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)
@@ -7,6 +7,7 @@ from django.template.loader import get_template
 from django.utils import timezone
 
 from timed.employment.models import Employment
+from timed.notifications import outbox
 from timed.notifications.models import Notification
 
 template = get_template("mail/notify_changed_employments.txt", using="text")
@@ -56,7 +57,7 @@ class Command(BaseCommand):
                 to=[email],
                 headers=settings.EMAIL_EXTRA_HEADERS,
             )
-            message.send()
+            outbox.send_messages([message])
             Notification.objects.create(
                 notification_type=Notification.CHANGED_EMPLOYMENT,
                 sent_at=timezone.now(),
@@ -3,14 +3,14 @@ from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMessage, get_connection
+from django.core.mail import EmailMessage
 from django.core.management.base import BaseCommand
-from django.db.models import Q
 from django.template.loader import get_template
 from django.utils.timezone import now
 
+from timed.notifications import outbox
 from timed.notifications.models import Notification
-from timed.projects.models import CustomerAssignee, ProjectAssignee, TaskAssignee
+from timed.projects.models import EffectiveRole
 from timed.tracking.models import Report
 
 template = get_template("mail/notify_reviewers_unverified.txt", using="text")
@@ -100,83 +100,41 @@ class Command(BaseCommand):
         reviewers = user_model.objects.all_reviewers().filter(email__isnull=False)
         subject = "[Timed] Verification of reports"
         from_email = settings.DEFAULT_FROM_EMAIL
-        connection = get_connection()
         messages = []
 
+        # reviewers responsible for any of the unverified reports
+        responsible = EffectiveRole.objects.filter(
+            role=EffectiveRole.REVIEWER,
+            is_responsible=True,
+            task__in=reports.values("task"),
+        ).values("user")
+        reviewers = reviewers.filter(pk__in=responsible)
+
         for reviewer in reviewers:
-            # unverified reports in which user is customer assignee and responsible reviewer
-            reports_customer_assignee_is_reviewer = reports.filter(
-                Q(
-                    task__project__customer_id__in=CustomerAssignee.objects.filter(
-                        is_reviewer=True, user_id=reviewer
-                    ).values("customer_id")
-                )
-            ).exclude(
-                Q(
-                    task__project_id__in=ProjectAssignee.objects.filter(
-                        is_reviewer=True
-                    ).values("project_id")
-                )
-                | Q(
-                    task_id__in=TaskAssignee.objects.filter(is_reviewer=True).values(
-                        "task_id"
-                    )
-                )
+            body = template.render(
+                {
+                    # we need start and end date in system format
+                    "start": str(start),
+                    "end": str(end),
+                    "message": optional_message,
+                    "reviewer": reviewer,
+                    "protocol": settings.HOST_PROTOCOL,
+                    "domain": settings.HOST_DOMAIN,
+                }
             )
 
-            # unverified reports in which user is project assignee and responsible reviewer
-            reports_project_assignee_is_reviewer = reports.filter(
-                Q(
-                    task__project_id__in=ProjectAssignee.objects.filter(
-                        is_reviewer=True, user_id=reviewer
-                    ).values("project_id")
-                )
-            ).exclude(
-                Q(
-                    task_id__in=TaskAssignee.objects.filter(is_reviewer=True).values(
-                        "task_id"
-                    )
-                )
+            message = EmailMessage(
+                subject=subject,
+                body=body,
+                from_email=from_email,
+                to=[reviewer.email],
+                cc=cc,
+                headers=settings.EMAIL_EXTRA_HEADERS,
             )
 
-            # unverified reports in which user task assignee and responsible reviewer
-            reports_task_assignee_is_reviewer = reports.filter(
-                Q(
-                    task_id__in=TaskAssignee.objects.filter(
-                        is_reviewer=True, user_id=reviewer
-                    ).values("task_id")
-                )
-            )
-            if (
-                reports_customer_assignee_is_reviewer
-                | reports_project_assignee_is_reviewer
-                | reports_task_assignee_is_reviewer
-            ).exists():
-                body = template.render(
-                    {
-                        # we need start and end date in system format
-                        "start": str(start),
-                        "end": str(end),
-                        "message": optional_message,
-                        "reviewer": reviewer,
-                        "protocol": settings.HOST_PROTOCOL,
-                        "domain": settings.HOST_DOMAIN,
-                    }
-                )
-
-                message = EmailMessage(
-                    subject=subject,
-                    body=body,
-                    from_email=from_email,
-                    to=[reviewer.email],
-                    cc=cc,
-                    connection=connection,
-                    headers=settings.EMAIL_EXTRA_HEADERS,
-                )
-
-                messages.append(message)
+            messages.append(message)
         if len(messages) > 0:
-            connection.send_messages(messages)
+            outbox.send_messages(messages)
             Notification.objects.create(
                 notification_type=Notification.REVIEWER_UNVERIFIED, sent_at=now()
             )
@@ -2,11 +2,13 @@ from datetime import date, timedelta
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMessage, get_connection
+from django.core.mail import EmailMessage
 from django.core.management.base import BaseCommand
 from django.template.loader import get_template
 from django.utils.timezone import now
 
+from timed.employment.worktime import calculate_worktime
+from timed.notifications import outbox
 from timed.notifications.models import Notification
 
 template = get_template("mail/notify_supervisor_shorttime.txt", using="text")
@@ -84,24 +86,25 @@ class Command(BaseCommand):
 
         start_year = date(end.year, 1, 1)
 
-        for supervisee in supervisees:
-            worktime = supervisee.calculate_worktime(start, end)
+        worktimes = calculate_worktime(supervisees, start, end)
+        for supervisee_id, worktime in worktimes.items():
             reported, expected, delta = worktime
             if expected == timedelta(0):
                 continue
 
             supervisee_ratio = reported / expected
             if supervisee_ratio < ratio:
-                supervisees_shorttime[supervisee.id] = {
+                supervisees_shorttime[supervisee_id] = {
                     "reported": self._decimal_hours(reported),
                     "expected": self._decimal_hours(expected),
                     "delta": self._decimal_hours(delta),
                     "ratio": supervisee_ratio,
-                    "balance": self._decimal_hours(
-                        supervisee.calculate_worktime(start_year, end)[2]
-                    ),
                 }
 
+        balances = calculate_worktime(supervisees_shorttime.keys(), start_year, end)
+        for supervisee_id, worktime in supervisees_shorttime.items():
+            worktime["balance"] = self._decimal_hours(balances[supervisee_id][2])
+
         return supervisees_shorttime
 
     def _notify_supervisors(self, start, end, ratio, supervisees):
@@ -143,8 +146,7 @@ class Command(BaseCommand):
                 )
 
         if len(mails) > 0:
-            connection = get_connection()
-            connection.send_messages(mails)
+            outbox.send_messages(mails)
             Notification.objects.create(
                 notification_type=Notification.SUPERVISORS_SHORTTIME, sent_at=now()
             )
@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from timed.notifications import outbox
+
+
+class Command(BaseCommand):
+    """Send emails queued in the outbox.
+
+    All queued emails are sent in batches and the command exits afterwards,
+    unless an interval is given in which case it keeps checking for newly
+    queued emails. Failed emails are retried after a delay.
+    """
+
+    help = "Send emails queued in the outbox."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            default=100,
+            type=int,
+            dest="batch_size",
+            help="Number of emails sent over one connection.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            default=5,
+            type=int,
+            dest="max_attempts",
+            help="Number of attempts to send an email before giving up.",
+        )
+        parser.add_argument(
+            "--retry-delay",
+            default=60,
+            type=int,
+            dest="retry_delay",
+            help="Seconds to wait before retrying a failed email, doubled "
+            "with every failed attempt.",
+        )
+        parser.add_argument(
+            "--interval",
+            default=0,
+            type=int,
+            dest="interval",
+            help="Seconds to wait before checking for queued emails again.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        max_attempts = options["max_attempts"]
+        retry_delay = options["retry_delay"]
+        interval = options["interval"]
+
+        while True:
+            while outbox.send_queued(batch_size, max_attempts, retry_delay):
+                pass
+
+            if not interval:
+                break
+            time.sleep(interval)
@@ -1,4 +1,6 @@
+from django.core.mail import EmailMultiAlternatives
 from django.db import models
+from django.utils.timezone import now
 
 from timed.projects.models import Project
 
@@ -32,3 +34,63 @@ class Notification(models.Model):
 
     def __str__(self):
         return f"Notification: {self.get_notification_type_display()}, id: {self.pk}"
+
+
+class OutboxEmail(models.Model):
+    """Email queued to be sent by the `send_outbox_emails` command."""
+
+    subject = models.TextField()
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list)
+    cc = models.JSONField(default=list)
+    headers = models.JSONField(default=dict)
+    created = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=now)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=["id"],
+                condition=models.Q(sent_at__isnull=True),
+                name="outbox_email_unsent_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"Email: {self.subject}, id: {self.pk}"
+
+    @staticmethod
+    def from_message(message):
+        html_bodies = [
+            content
+            for content, mimetype in getattr(message, "alternatives", [])
+            if mimetype == "text/html"
+        ]
+        return OutboxEmail(
+            subject=message.subject,
+            body=message.body,
+            html_body=html_bodies[0] if html_bodies else "",
+            from_email=message.from_email,
+            to=message.to,
+            cc=message.cc,
+            headers=message.extra_headers,
+        )
+
+    def to_message(self, connection=None):
+        message = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.body,
+            from_email=self.from_email,
+            to=self.to,
+            cc=self.cc,
+            headers=self.headers,
+            connection=connection,
+        )
+        if self.html_body:
+            message.attach_alternative(self.html_body, "text/html")
+        return message
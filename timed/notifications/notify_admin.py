@@ -1,17 +1,17 @@
 import datetime
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail import EmailMultiAlternatives
 from django.template.loader import get_template, render_to_string
 from django.utils.timezone import now
 
+from timed.notifications import outbox
 from timed.notifications.models import Notification
 
 
 def prepare_and_send_email(project, order_duration):
     template_txt = get_template("notify_accountants_order.txt")
     from_email = settings.DEFAULT_FROM_EMAIL
-    connection = get_connection()
     messages = []
 
     customer = project.customer
@@ -50,13 +50,12 @@ def prepare_and_send_email(project, order_duration):
         body=body_txt,
         from_email=from_email,
         to=[settings.CUSTOMER_CENTER_EMAIL],
-        connection=connection,
         headers=settings.EMAIL_EXTRA_HEADERS,
     )
     message.attach_alternative(body_html, "text/html")
 
     messages.append(message)
-    connection.send_messages(messages)
+    outbox.send_messages(messages)
     Notification.objects.create(
         notification_type=Notification.REVIEWER_UNVERIFIED, sent_at=now()
     )
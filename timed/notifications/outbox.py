@@ -0,0 +1,84 @@
+"""Outbox of emails sent outside of requests.
+
+When `EMAIL_OUTBOX` is enabled emails are stored in the database and sent in
+batches by the `send_outbox_emails` command, so a slow mail server does not
+slow down requests.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils.timezone import now
+
+from timed.notifications.models import OutboxEmail
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from django.core.mail import EmailMessage
+
+
+def send_messages(messages: Sequence[EmailMessage]) -> None:
+    """Send given messages or queue them when the outbox is enabled."""
+    if not messages:
+        return
+
+    if not settings.EMAIL_OUTBOX:
+        get_connection().send_messages(messages)
+        return
+
+    OutboxEmail.objects.bulk_create(
+        [OutboxEmail.from_message(message) for message in messages]
+    )
+
+
+def send_queued(batch_size: int, max_attempts: int, retry_delay: int) -> int:
+    """Send a batch of queued emails over one connection.
+
+    Emails which could not be sent are retried until they failed given number
+    of attempts. The delay in seconds before retrying doubles with every
+    failed attempt, so a mail server being unavailable for a short time
+    doesn't use up all attempts. Queued emails are locked while being sent,
+    so multiple workers may send them concurrently.
+
+    Returns the number of emails which have been attempted to send.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.filter(
+                sent_at__isnull=True,
+                attempts__lt=max_attempts,
+                next_attempt_at__lte=now(),
+            )
+            .select_for_update(skip_locked=True)
+            .order_by("id")[:batch_size]
+        )
+
+        connection = get_connection()
+        for email in emails:
+            email.attempts += 1
+            try:
+                # connection is only opened when not already open
+                connection.open()
+                connection.send_messages([email.to_message(connection)])
+            except OSError as error:
+                # reconnect with next email in case the connection broke
+                connection.close()
+                email.last_error = str(error)
+                email.next_attempt_at = now() + timedelta(
+                    seconds=retry_delay * 2 ** (email.attempts - 1)
+                )
+            else:
+                email.sent_at = now()
+        connection.close()
+
+        OutboxEmail.objects.bulk_update(
+            emails, ["attempts", "sent_at", "next_attempt_at", "last_error"]
+        )
+
+    return len(emails)
@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+import pytest
+from django.core.mail import EmailMessage, EmailMultiAlternatives
+from django.core.management import call_command
+
+from timed.notifications import outbox
+from timed.notifications.models import OutboxEmail
+
+
+@pytest.mark.django_db()
+def test_outbox_send_disabled(mailoutbox):
+    outbox.send_messages([EmailMessage(subject="Test", to=["test@example.net"])])
+
+    assert len(mailoutbox) == 1
+    assert not OutboxEmail.objects.exists()
+
+
+@pytest.mark.django_db()
+def test_outbox_send(settings, mailoutbox, django_assert_num_queries):
+    settings.EMAIL_OUTBOX = True
+    message = EmailMultiAlternatives(
+        subject="Test",
+        body="text",
+        from_email="from@example.net",
+        to=["test@example.net"],
+        cc=["cc@example.net"],
+        headers={"Auto-Submitted": "auto-generated"},
+    )
+    message.attach_alternative("<p>html</p>", "text/html")
+
+    with django_assert_num_queries(1):
+        outbox.send_messages([message, EmailMessage(subject="Other", to=["a@b.c"])])
+    outbox.send_messages([])
+    assert not mailoutbox
+
+    call_command("send_outbox_emails", batch_size=1)
+
+    assert [mail.subject for mail in mailoutbox] == ["Test", "Other"]
+    mail = mailoutbox[0]
+    assert mail.body == "text"
+    assert mail.from_email == "from@example.net"
+    assert mail.to == ["test@example.net"]
+    assert mail.cc == ["cc@example.net"]
+    assert mail.extra_headers == {"Auto-Submitted": "auto-generated"}
+    assert mail.alternatives == [("<p>html</p>", "text/html")]
+    assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+
+    # sent emails are not sent again
+    call_command("send_outbox_emails")
+    assert len(mailoutbox) == 2
+
+
+@pytest.mark.django_db()
+def test_outbox_send_retry(settings, mailoutbox, mocker, freezer):
+    settings.EMAIL_OUTBOX = True
+    send_messages = mocker.patch(
+        "django.core.mail.backends.locmem.EmailBackend.send_messages",
+        side_effect=ConnectionRefusedError("Connection refused"),
+    )
+    outbox.send_messages([EmailMessage(subject="Test", to=["test@example.net"])])
+
+    call_command("send_outbox_emails", max_attempts=3, retry_delay=60)
+
+    email = OutboxEmail.objects.get()
+    assert send_messages.call_count == 1
+    assert email.attempts == 1
+    assert email.last_error == "Connection refused"
+    assert email.sent_at is None
+
+    # email is retried after a delay doubled with every attempt
+    freezer.tick(timedelta(seconds=59))
+    call_command("send_outbox_emails", max_attempts=3, retry_delay=60)
+    assert send_messages.call_count == 1
+    freezer.tick(timedelta(seconds=1))
+    call_command("send_outbox_emails", max_attempts=3, retry_delay=60)
+    assert send_messages.call_count == 2
+    freezer.tick(timedelta(seconds=119))
+    call_command("send_outbox_emails", max_attempts=3, retry_delay=60)
+    assert send_messages.call_count == 2
+    freezer.tick(timedelta(seconds=1))
+    call_command("send_outbox_emails", max_attempts=3, retry_delay=60)
+    assert send_messages.call_count == 3
+
+    # no attempts left
+    freezer.tick(timedelta(days=1))
+    call_command("send_outbox_emails", max_attempts=3, retry_delay=60)
+    assert send_messages.call_count == 3
+
+    # email is sent once mail server is available again
+    mocker.stopall()
+    call_command("send_outbox_emails", max_attempts=4)
+
+    email.refresh_from_db()
+    assert email.attempts == 4
+    assert email.sent_at is not None
+    assert len(mailoutbox) == 1
+
+
+@pytest.mark.django_db()
+def test_outbox_send_interval(settings, mailoutbox, mocker):
+    settings.EMAIL_OUTBOX = True
+
+    class Stop(Exception):  # noqa: N818
+        pass
+
+    def queue_email(_interval):
+        if mailoutbox:
+            raise Stop
+        outbox.send_messages([EmailMessage(subject="Test", to=["test@example.net"])])
+
+    sleep = mocker.patch("time.sleep", side_effect=queue_email)
+
+    with pytest.raises(Stop):
+        call_command("send_outbox_emails", interval=10)
+
+    sleep.assert_called_with(10)
+    assert len(mailoutbox) == 1
@@ -0,0 +1,122 @@
+"""Pagination of long lists.
+
+Page number pagination counts all results and skips all rows of previous
+pages, which gets slow on deep pages of large lists. Keyset pagination
+instead selects the rows following the last row of the previous page, which
+is equally fast on every page.
+"""
+
+from __future__ import annotations
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Q, Sum
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from rest_framework_json_api.pagination import JsonApiPageNumberPagination
+
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet
+    from rest_framework.request import Request
+    from rest_framework.views import APIView
+
+
+class KeysetPagination(JsonApiPageNumberPagination):
+    """Page number pagination which can be switched to keyset pagination.
+
+    Keyset pagination is used when `page[cursor]` is given, which is empty
+    for the first page and taken from the `next` link for following pages.
+    Results need to be ordered by the fields of `keyset`, so ordering other
+    than the default ordering of the view is not supported.
+
+    The count of all results and their total time are aggregated in one
+    query, which can be skipped with `page[count]=0`.
+    """
+
+    cursor_query_param = "page[cursor]"
+    count_query_param = "page[count]"
+    keyset = ("date", "id")
+    duration_field = "duration"
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: APIView | None = None,
+    ) -> list[Model] | None:
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+
+        if tuple(queryset.query.order_by) != self.keyset:
+            msg = "Ordering is not supported with a cursor"
+            raise ParseError(msg)
+
+        self.request = request
+        self.count = None
+        self.total_time: timedelta | None = None
+        if request.query_params.get(self.count_query_param) not in ("0", "false"):
+            data = queryset.aggregate(
+                count=Count("pk"), total_time=Sum(self.duration_field)
+            )
+            self.count = data["count"]
+            self.total_time = data["total_time"] or timedelta(0)
+
+        cursor = request.query_params[self.cursor_query_param]
+        if cursor:
+            queryset = self._after(queryset, cursor)
+
+        # lists are not paginated without page size, but a cursor needs one
+        page_size = self.get_page_size(request) or self.max_page_size
+        page = list(queryset[: page_size + 1])
+        self.next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            values = [str(getattr(page[-1], field)) for field in self.keyset]
+            self.next_cursor = urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+        return page
+
+    def _after(self, queryset: QuerySet, cursor: str) -> QuerySet:
+        """Filter rows following the row of given cursor."""
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+            # rows which are equal in all previous fields of the keyset and
+            # greater in the next one
+            condition = Q()
+            for pos, field in enumerate(self.keyset):
+                equal = dict(zip(self.keyset[:pos], values[:pos], strict=True))
+                condition |= Q(**equal, **{f"{field}__gt": values[pos]})
+            return queryset.filter(condition)
+        except (ValueError, TypeError, IndexError, ValidationError):
+            msg = "Invalid cursor"
+            raise NotFound(msg) from None
+
+    def get_paginated_response(self, data: list) -> Response:
+        if not hasattr(self, "next_cursor"):
+            return super().get_paginated_response(data)
+
+        url = self.request.build_absolute_uri()
+        next_link = None
+        if self.next_cursor:
+            next_link = replace_query_param(
+                url, self.cursor_query_param, self.next_cursor
+            )
+        meta = {}
+        if self.count is not None:
+            meta["pagination"] = {"count": self.count}
+
+        return Response(
+            {
+                "results": data,
+                "meta": meta,
+                "links": {
+                    "first": replace_query_param(url, self.cursor_query_param, ""),
+                    "next": next_link,
+                },
+            }
+        )
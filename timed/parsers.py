@@ -0,0 +1,19 @@
+"""Parsers of request data."""
+
+from rest_framework_json_api.parsers import JSONParser
+
+
+class JSONListParser(JSONParser):
+    """JSON:API parser accepting a list of resource objects as primary data.
+
+    Each resource object is parsed like a single one, so multiple resources
+    can be created with one request.
+    """
+
+    def parse_data(self, result, parser_context):
+        data = result.get("data") if isinstance(result, dict) else None
+        if not isinstance(data, list):
+            return super().parse_data(result, parser_context)
+
+        parse = super().parse_data
+        return [parse({"data": item}, parser_context) for item in data]
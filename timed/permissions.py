@@ -1,10 +1,10 @@
 from datetime import date
 
-from django.db.models import Q
 from rest_framework.permissions import SAFE_METHODS, BasePermission, IsAuthenticated
 
 from timed.employment import models as employment_models
 from timed.projects import models as projects_models
+from timed.roles import get_roles
 from timed.tracking import models as tracking_models
 
 
@@ -93,13 +93,13 @@ class IsSupervisor(IsAuthenticated):
         if not super().has_permission(request, view):  # pragma: no cover
             return False
 
-        return request.user.supervisees.exists()
+        return bool(get_roles(request.user).supervisee_ids)
 
     def has_object_permission(self, request, view, obj):
         if not super().has_object_permission(request, view, obj):  # pragma: no cover
             return False
 
-        return request.user.supervisees.filter(id=obj.user_id).exists()
+        return obj.user_id in get_roles(request.user).supervisee_ids
 
 
 class IsReviewer(IsAuthenticated):
@@ -109,40 +109,18 @@ class IsReviewer(IsAuthenticated):
         if not super().has_permission(request, view):  # pragma: no cover
             return False
 
-        if (
-            request.user.customer_assignees.filter(is_reviewer=True).exists()
-            or request.user.project_assignees.filter(is_reviewer=True).exists()
-            or request.user.task_assignees.filter(is_reviewer=True).exists()
-        ):
-            return True
-        return False
+        return get_roles(request.user).has_role("is_reviewer")
 
     def has_object_permission(self, request, view, obj):
         if not super().has_object_permission(request, view, obj):  # pragma: no cover
             return False
 
-        user = request.user
-
         if isinstance(obj, tracking_models.Report):
             task = obj.task
         else:  # pragma: no cover
             msg = "IsReviewer permission called on unsupported model"
             raise TypeError(msg)
-        return (
-            projects_models.Task.objects.filter(pk=task.pk)
-            .filter(
-                Q(task_assignees__user=user, task_assignees__is_reviewer=True)
-                | Q(
-                    project__project_assignees__user=user,
-                    project__project_assignees__is_reviewer=True,
-                )
-                | Q(
-                    project__customer__customer_assignees__user=user,
-                    project__customer__customer_assignees__is_reviewer=True,
-                )
-            )
-            .exists()
-        )
+        return get_roles(request.user).has_task_role(task, "is_reviewer")
 
 
 class IsSuperUser(IsAuthenticated):
@@ -220,55 +198,17 @@ class IsManager(IsAuthenticated):
         if not super().has_permission(request, view):  # pragma: no cover
             return False
 
-        if (
-            request.user.customer_assignees.filter(is_manager=True).exists()
-            or request.user.project_assignees.filter(is_manager=True).exists()
-            or request.user.task_assignees.filter(is_manager=True).exists()
-        ):
-            return True
-        return False
+        return get_roles(request.user).has_role("is_manager")
 
     def has_object_permission(self, request, view, obj):
         if not super().has_object_permission(request, view, obj):  # pragma: no cover
             return False
 
-        user = request.user
-
+        roles = get_roles(request.user)
         if isinstance(obj, projects_models.Task):
-            return (
-                projects_models.Task.objects.filter(pk=obj.pk)
-                .filter(
-                    Q(task_assignees__user=user, task_assignees__is_manager=True)
-                    | Q(
-                        project__project_assignees__user=user,
-                        project__project_assignees__is_manager=True,
-                    )
-                    | Q(
-                        project__customer__customer_assignees__user=user,
-                        project__customer__customer_assignees__is_manager=True,
-                    )
-                )
-                .exists()
-            )
+            return roles.has_task_role(obj, "is_manager")
         if isinstance(obj, projects_models.Project):
-            return (
-                projects_models.Project.objects.filter(pk=obj.pk)
-                .filter(
-                    Q(
-                        tasks__task_assignees__user=user,
-                        tasks__task_assignees__is_manager=True,
-                    )
-                    | Q(
-                        project_assignees__user=user,
-                        project_assignees__is_manager=True,
-                    )
-                    | Q(
-                        customer__customer_assignees__user=user,
-                        customer__customer_assignees__is_manager=True,
-                    )
-                )
-                .exists()
-            )
+            return roles.has_project_role(obj, "is_manager")
         msg = "IsManager permission called on unsupported model"  # pragma: no cover
         raise RuntimeError(msg)  # pragma: no cover
 
@@ -280,37 +220,15 @@ class IsResource(IsAuthenticated):
         if not super().has_permission(request, view):  # pragma: no cover
             return False
 
-        if (
-            request.user.customer_assignees.filter(is_resource=True).exists()
-            or request.user.project_assignees.filter(is_resource=True).exists()
-            or request.user.task_assignees.filter(is_resource=True).exists()
-        ):
-            return True
-        return False
+        return get_roles(request.user).has_role("is_resource")
 
     def has_object_permission(self, request, view, obj):
         if not super().has_object_permission(request, view, obj):  # pragma: no cover
             return False
 
-        user = request.user
-
         if isinstance(obj, (tracking_models.Activity, tracking_models.Report)):
             if obj.task:
-                return (
-                    projects_models.Task.objects.filter(pk=obj.task.pk)
-                    .filter(
-                        Q(task_assignees__user=user, task_assignees__is_resource=True)
-                        | Q(
-                            project__project_assignees__user=user,
-                            project__project_assignees__is_resource=True,
-                        )
-                        | Q(
-                            project__customer__customer_assignees__user=user,
-                            project__customer__customer_assignees__is_resource=True,
-                        )
-                    )
-                    .exists()
-                )
+                return get_roles(request.user).has_task_role(obj.task, "is_resource")
             return True  # pragma: no cover
         msg = "IsResource permission called on unsupported model"  # pragma: no cover
         raise RuntimeError(msg)  # pragma: no cover
@@ -339,6 +257,4 @@ class IsCustomer(IsAuthenticated):
         if not super().has_permission(request, view):  # pragma: no cover
             return False
 
-        if request.user.customer_assignees.filter(is_customer=True).exists():
-            return True
-        return False
+        return get_roles(request.user).has_customer_role("is_customer")
@@ -0,0 +1,118 @@
+"""Maintenance of effective roles of users on tasks.
+
+See `timed.projects.models.EffectiveRole`. Entries are computed from the
+assignees of the tasks, their projects and customers. Functions take the
+querysets to compute from, so they can be used in migrations as well.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from django.db import transaction
+
+from timed import changes
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+
+    from django.db.models import Model, QuerySet
+
+    from timed.projects.models import Task
+
+# roles mapped to assignee flag
+ROLE_FLAGS = {
+    "resource": "is_resource",
+    "reviewer": "is_reviewer",
+    "manager": "is_manager",
+    "customer": "is_customer",
+}
+REBUILD_BATCH_SIZE = 2000
+
+
+def _assigned(assignees: QuerySet, field: str) -> dict[int, list[tuple]]:
+    assigned = defaultdict(list)
+    for object_id, *row in assignees.values_list(
+        field, "user_id", *ROLE_FLAGS.values()
+    ):
+        assigned[object_id].append(row)
+    return assigned
+
+
+def entries(
+    tasks: QuerySet,
+    customer_assignees: QuerySet,
+    project_assignees: QuerySet,
+    task_assignees: QuerySet,
+    model: type[Model],
+) -> Iterator[Model]:
+    """Compute effective roles of given tasks."""
+    tasks = tasks.order_by().values_list("id", "project_id", "project__customer_id")
+    by_task = _assigned(task_assignees.filter(task__in=tasks.values("id")), "task_id")
+    by_project = _assigned(
+        project_assignees.filter(project__in=tasks.values("project_id")),
+        "project_id",
+    )
+    by_customer = _assigned(
+        customer_assignees.filter(customer__in=tasks.values("project__customer_id")),
+        "customer_id",
+    )
+
+    for task_id, project_id, customer_id in tasks.iterator():
+        # levels ordered from lowest to highest in the hierarchy
+        levels = (by_task[task_id], by_project[project_id], by_customer[customer_id])
+        for index, role in enumerate(ROLE_FLAGS):
+            responsible = {}
+            for level in levels:
+                users = {user_id for user_id, *flags in level if flags[index]}
+                # users assigned on a higher level are not responsible
+                is_responsible = not responsible
+                for user_id in users:
+                    responsible.setdefault(user_id, is_responsible)
+            for user_id, is_responsible in responsible.items():
+                yield model(
+                    user_id=user_id,
+                    task_id=task_id,
+                    role=role,
+                    is_responsible=is_responsible,
+                )
+
+
+def save(model: type[Model], objects: Iterable[Model]) -> None:
+    """Insert given effective roles in batches."""
+    objects = iter(objects)
+    while batch := list(islice(objects, REBUILD_BATCH_SIZE)):
+        model.objects.bulk_create(batch)
+
+
+def refresh(tasks: QuerySet[Task]) -> None:
+    """Recompute effective roles of given tasks."""
+    from timed.projects.models import (
+        CustomerAssignee,
+        EffectiveRole,
+        ProjectAssignee,
+        TaskAssignee,
+    )
+
+    with transaction.atomic():
+        EffectiveRole.objects.filter(task__in=tasks).delete()
+        save(
+            EffectiveRole,
+            entries(
+                tasks,
+                CustomerAssignee.objects.all(),
+                ProjectAssignee.objects.all(),
+                TaskAssignee.objects.all(),
+                EffectiveRole,
+            ),
+        )
+    changes.changed(EffectiveRole)
+
+
+def rebuild() -> None:
+    """Rebuild effective roles of all tasks."""
+    from timed.projects.models import Task
+
+    refresh(Task.objects.all())
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from timed.projects.effective_roles import rebuild
+
+
+class Command(BaseCommand):
+    """Rebuild the effective roles of users on tasks.
+
+    Only needed when assignees were changed without sending signals, e.g.
+    with bulk updates.
+    """
+
+    help = "Rebuild effective roles from all assignees."
+
+    def handle(self, *args, **options):
+        rebuild()
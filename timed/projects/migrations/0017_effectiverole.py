@@ -0,0 +1,30 @@
+# Generated by Django 4.2.11 on 2026-10-17 04:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('projects', '0016_alter_project_amount_invoiced_currency_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EffectiveRole',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('resource', 'resource'), ('reviewer', 'reviewer'), ('manager', 'manager'), ('customer', 'customer')], max_length=10)),
+                ('is_responsible', models.BooleanField(default=False)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_roles', to='projects.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='effective_roles', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['task', 'role', 'is_responsible'], name='projects_ef_task_id_b4da87_idx')],
+                'unique_together': {('user', 'role', 'task')},
+            },
+        ),
+    ]
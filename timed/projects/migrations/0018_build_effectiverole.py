@@ -0,0 +1,26 @@
+from django.db import migrations
+
+from timed.projects import effective_roles
+
+
+def build_effective_roles(apps, schema_editor):
+    effective_roles.save(
+        apps.get_model("projects", "EffectiveRole"),
+        effective_roles.entries(
+            apps.get_model("projects", "Task").objects.all(),
+            apps.get_model("projects", "CustomerAssignee").objects.all(),
+            apps.get_model("projects", "ProjectAssignee").objects.all(),
+            apps.get_model("projects", "TaskAssignee").objects.all(),
+            apps.get_model("projects", "EffectiveRole"),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0017_effectiverole"),
+    ]
+
+    operations = [
+        migrations.RunPython(build_effective_roles, migrations.RunPython.noop),
+    ]
@@ -5,10 +5,14 @@ from datetime import timedelta
 from django.conf import settings
 from django.db import models
 from django.db.models import Q
-from django.db.models.signals import pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 from djmoney.models.fields import MoneyField
 
+from timed import changes, roles
+from timed.projects import effective_roles
+from timed.reports import rollup
 from timed.tracking.models import Report
 
 
@@ -253,6 +257,50 @@ class TaskAssignee(models.Model):
         return f"{self.user.username} {self.task}"
 
 
+class EffectiveRole(models.Model):
+    """Effective role of a user on a task.
+
+    Roles are assigned on customers, projects or tasks and apply to all tasks
+    below. Effective roles are maintained by signals whenever assignees,
+    tasks or projects change and can be rebuilt with
+    `rebuild_effective_roles`.
+
+    Of the users with a role on a task only those assigned lowest in the
+    hierarchy are responsible, e.g. task reviewers are responsible instead
+    of project reviewers of the same task.
+    """
+
+    RESOURCE = "resource"
+    REVIEWER = "reviewer"
+    MANAGER = "manager"
+    CUSTOMER = "customer"
+
+    ROLE_CHOICES = (
+        (RESOURCE, "resource"),
+        (REVIEWER, "reviewer"),
+        (MANAGER, "manager"),
+        (CUSTOMER, "customer"),
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="effective_roles",
+    )
+    task = models.ForeignKey(
+        "projects.Task", on_delete=models.CASCADE, related_name="effective_roles"
+    )
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    is_responsible = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ("user", "role", "task")
+        indexes = (models.Index(fields=["task", "role", "is_responsible"]),)
+
+    def __str__(self) -> str:
+        return f"{self.user.username} {self.role} {self.task}"
+
+
 @receiver(pre_save, sender=Project)
 def update_billed_flag_on_reports(sender, instance, **kwargs):  # noqa: ARG001
     """Update billed flag on all reports from the updated project.
@@ -269,4 +317,127 @@ def update_billed_flag_on_reports(sender, instance, **kwargs):  # noqa: ARG001
 
     # check whether the project was created or is being updated
     if instance.pk and instance.billed != Project.objects.get(id=instance.id).billed:
-        Report.objects.filter(Q(task__project=instance)).update(billed=instance.billed)
+        Report.objects.filter(Q(task__project=instance)).update(
+            billed=instance.billed, updated=timezone.now()
+        )
+        changes.changed(Report)
+        rollup.refresh(Q(task__project=instance))
+
+
+@receiver(post_save, sender=CustomerAssignee)
+@receiver(post_delete, sender=CustomerAssignee)
+@receiver(post_save, sender=ProjectAssignee)
+@receiver(post_delete, sender=ProjectAssignee)
+@receiver(post_save, sender=TaskAssignee)
+@receiver(post_delete, sender=TaskAssignee)
+def invalidate_roles(sender, **kwargs):  # noqa: ARG001
+    """Invalidate cached roles when assignees change."""
+    roles.invalidate()
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_project(sender, instance, **kwargs):  # noqa: ARG001
+    """Remember whether a task is moved to another project.
+
+    Cached roles are invalidated right away as they depend on the project.
+    """
+    # ignore signal when loading a fixture
+    if kwargs.get("raw", False) or not instance.pk:
+        return
+
+    instance._project_changed = (  # noqa: SLF001
+        Task.objects.filter(pk=instance.pk)
+        .exclude(project_id=instance.project_id)
+        .exists()
+    )
+    if instance._project_changed:  # noqa: SLF001
+        roles.invalidate()
+
+
+def _assigned_tasks(assignee):
+    if isinstance(assignee, CustomerAssignee):
+        return Q(project__customer_id=assignee.customer_id)
+    if isinstance(assignee, ProjectAssignee):
+        return Q(project_id=assignee.project_id)
+    return Q(pk=assignee.task_id)
+
+
+@receiver(pre_save, sender=CustomerAssignee)
+@receiver(pre_save, sender=ProjectAssignee)
+@receiver(pre_save, sender=TaskAssignee)
+def remember_assigned_tasks(sender, instance, **kwargs):
+    """Remember tasks of an assignee before it is changed."""
+    # ignore signal when loading a fixture
+    if kwargs.get("raw", False) or not instance.pk:
+        return
+
+    original = sender.objects.filter(pk=instance.pk).first()
+    instance._original_assigned_tasks = original and _assigned_tasks(original)  # noqa: SLF001
+
+
+@receiver(post_save, sender=CustomerAssignee)
+@receiver(post_delete, sender=CustomerAssignee)
+@receiver(post_save, sender=ProjectAssignee)
+@receiver(post_delete, sender=ProjectAssignee)
+@receiver(post_save, sender=TaskAssignee)
+@receiver(post_delete, sender=TaskAssignee)
+def update_effective_roles(sender, instance, **kwargs):  # noqa: ARG001
+    """Update effective roles on the tasks of an assignee."""
+    if kwargs.get("raw", False):  # pragma: no cover
+        return
+
+    lookup = _assigned_tasks(instance)
+    original = getattr(instance, "_original_assigned_tasks", None)
+    instance._original_assigned_tasks = None  # noqa: SLF001
+    if original:
+        lookup |= original
+    effective_roles.refresh(Task.objects.filter(lookup))
+
+
+@receiver(post_save, sender=Task)
+def update_effective_roles_of_task(sender, instance, created, **kwargs):  # noqa: ARG001
+    """Update effective roles of a created or moved task."""
+    if kwargs.get("raw", False):  # pragma: no cover
+        return
+
+    moved = getattr(instance, "_project_changed", False)
+    instance._project_changed = False  # noqa: SLF001
+    if created or moved:
+        effective_roles.refresh(Task.objects.filter(pk=instance.pk))
+
+
+@receiver(pre_save, sender=Project)
+def remember_project_customer(sender, instance, **kwargs):  # noqa: ARG001
+    """Remember whether a project is moved to another customer."""
+    # ignore signal when loading a fixture
+    if kwargs.get("raw", False) or not instance.pk:
+        return
+
+    instance._customer_changed = (  # noqa: SLF001
+        Project.objects.filter(pk=instance.pk)
+        .exclude(customer_id=instance.customer_id)
+        .exists()
+    )
+
+
+@receiver(post_save, sender=Project)
+def update_effective_roles_of_project(sender, instance, **kwargs):  # noqa: ARG001
+    """Update effective roles of the tasks of a project moved to another customer."""
+    if getattr(instance, "_customer_changed", False):
+        instance._customer_changed = False  # noqa: SLF001
+        effective_roles.refresh(Task.objects.filter(project=instance))
+
+
+@receiver(post_save, sender=CostCenter)
+@receiver(post_delete, sender=CostCenter)
+@receiver(post_save, sender=BillingType)
+@receiver(post_delete, sender=BillingType)
+@receiver(post_save, sender=Customer)
+@receiver(post_delete, sender=Customer)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def record_change(sender, instance, **kwargs):
+    """Record change of customers, projects, tasks, cost centers and billing types."""
+    changes.record_change(sender, instance)
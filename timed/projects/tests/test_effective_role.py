@@ -0,0 +1,122 @@
+import pytest
+from django.core.management import call_command
+
+from timed.projects import effective_roles as effective_roles_module
+from timed.projects.factories import (
+    CustomerAssigneeFactory,
+    CustomerFactory,
+    ProjectAssigneeFactory,
+    ProjectFactory,
+    TaskAssigneeFactory,
+    TaskFactory,
+)
+from timed.projects.models import EffectiveRole
+
+
+def effective_roles():
+    return sorted(
+        EffectiveRole.objects.values_list(
+            "user_id", "task_id", "role", "is_responsible"
+        )
+    )
+
+
+def assert_effective_roles_match():
+    """Compare effective roles with effective roles rebuilt from all assignees."""
+    entries = effective_roles()
+    call_command("rebuild_effective_roles")
+    assert entries == effective_roles()
+
+
+@pytest.mark.django_db()
+def test_effective_role_responsible():
+    task = TaskFactory.create()
+    other_task = TaskFactory.create(project=task.project)
+    customer_reviewer = CustomerAssigneeFactory.create(
+        customer=task.project.customer, is_reviewer=True, is_resource=True
+    ).user
+    project_reviewer = ProjectAssigneeFactory.create(
+        project=task.project, is_reviewer=True
+    ).user
+    task_reviewer = TaskAssigneeFactory.create(task=task, is_reviewer=True).user
+
+    assert effective_roles() == sorted(
+        [
+            (customer_reviewer.id, task.id, "resource", True),
+            (customer_reviewer.id, task.id, "reviewer", False),
+            (project_reviewer.id, task.id, "reviewer", False),
+            (task_reviewer.id, task.id, "reviewer", True),
+            (customer_reviewer.id, other_task.id, "resource", True),
+            (customer_reviewer.id, other_task.id, "reviewer", False),
+            (project_reviewer.id, other_task.id, "reviewer", True),
+        ]
+    )
+    assert_effective_roles_match()
+
+
+@pytest.mark.django_db()
+def test_effective_role_maintained_by_signals():
+    task = TaskFactory.create()
+    other_task = TaskFactory.create()
+    assignee = TaskAssigneeFactory.create(task=task, is_reviewer=True)
+    project_assignee = ProjectAssigneeFactory.create(
+        project=task.project, is_manager=True
+    )
+    CustomerAssigneeFactory.create(customer=task.project.customer, is_customer=True)
+    assert_effective_roles_match()
+
+    # move assignee to other task
+    assignee.task = other_task
+    assignee.save()
+    assert list(assignee.user.effective_roles.values_list("task", flat=True)) == [
+        other_task.id
+    ]
+    assert_effective_roles_match()
+
+    # move task to other project
+    task.project = other_task.project
+    task.save()
+    assert_effective_roles_match()
+
+    # move project to other customer
+    project_assignee.project.customer = CustomerFactory.create()
+    project_assignee.project.save()
+    assert_effective_roles_match()
+
+    project_assignee.delete()
+    assignee.delete()
+    assert_effective_roles_match()
+    assert not EffectiveRole.objects.filter(role=EffectiveRole.REVIEWER).exists()
+
+
+@pytest.mark.django_db()
+def test_effective_role_rebuild():
+    task = TaskFactory.create()
+    project = ProjectFactory.create(customer=task.project.customer)
+    assignee = CustomerAssigneeFactory.create(
+        customer=task.project.customer, is_reviewer=True
+    )
+    # bulk updates do not send signals
+    EffectiveRole.objects.all().delete()
+
+    call_command("rebuild_effective_roles")
+
+    assert effective_roles() == [(assignee.user_id, task.id, "reviewer", True)]
+    assert not EffectiveRole.objects.filter(task__project=project).exists()
+
+
+@pytest.mark.django_db()
+def test_effective_role_task_edit(mocker):
+    task = TaskFactory.create()
+    TaskAssigneeFactory.create(task=task, is_reviewer=True)
+    refresh = mocker.spy(effective_roles_module, "refresh")
+
+    # editing a task doesn't change its roles
+    task.name = "changed"
+    task.save()
+    refresh.assert_not_called()
+
+    task.project = ProjectFactory.create()
+    task.save()
+    refresh.assert_called_once()
+    assert_effective_roles_match()
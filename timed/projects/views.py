@@ -18,6 +18,7 @@ from timed.permissions import (
     IsUpdateOnly,
 )
 from timed.projects import filters, models, serializers
+from timed.roles import get_roles
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -40,9 +41,7 @@ class CustomerViewSet(ReadOnlyModelViewSet):
         current_employment = user.get_active_employment()
 
         if current_employment is None:
-            if models.CustomerAssignee.objects.filter(
-                user=user, is_customer=True
-            ).exists():
+            if get_roles(user).has_customer_role("is_customer"):
                 return queryset.filter(assignees=user)
         elif not current_employment.is_external:  # pragma: no cover
             return queryset
@@ -79,11 +78,8 @@ class BillingTypeViewSet(ReadOnlyModelViewSet):
         current_employment = user.get_active_employment()
 
         if current_employment:
-            if (
-                current_employment.is_external
-                and models.CustomerAssignee.objects.filter(
-                    user=user, is_customer=True
-                ).exists()
+            if current_employment.is_external and get_roles(user).has_customer_role(
+                "is_customer"
             ):
                 return queryset.filter(
                     projects__customer_visible=True,
@@ -91,7 +87,7 @@ class BillingTypeViewSet(ReadOnlyModelViewSet):
                     projects__customer__customer_assignees__is_customer=True,
                 )
             return queryset
-        if models.CustomerAssignee.objects.filter(user=user, is_customer=True).exists():
+        if get_roles(user).has_customer_role("is_customer"):
             return queryset.filter(
                 projects__customer_visible=True,
                 projects__customer__customer_assignees__user=user,
@@ -151,9 +147,7 @@ class ProjectViewSet(ModelViewSet):
         current_employment = user.get_active_employment()
 
         if current_employment is None:
-            if models.CustomerAssignee.objects.filter(
-                user=user, is_customer=True
-            ).exists():
+            if get_roles(user).has_customer_role("is_customer"):
                 return queryset.filter(customer__assignees=user, customer_visible=True)
         elif not current_employment.is_external:  # pragma: no cover
             return queryset
@@ -201,9 +195,7 @@ class TaskViewSet(ModelViewSet):
         current_employment = user.get_active_employment()
 
         if current_employment is None:
-            if models.CustomerAssignee.objects.filter(
-                user=user, is_customer=True
-            ).exists():
+            if get_roles(user).has_customer_role("is_customer"):
                 return queryset.filter(
                     project__customer__assignees=user, project__customer_visible=True
                 )
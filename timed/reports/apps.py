@@ -0,0 +1,14 @@
+"""Configuration for reports app."""
+
+from django.apps import AppConfig
+
+
+class ReportsConfig(AppConfig):
+    """App configuration for reports app."""
+
+    name = "timed.reports"
+    label = "reports"
+
+    def ready(self):
+        # Implicitly connect signal handlers decorated with @receiver.
+        from . import signals  # noqa: F401
@@ -2,16 +2,19 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from django.db.models import DurationField, F, Q, Sum, Value
-from django.db.models.functions import Coalesce
+from django.db.models import F, Q
 from django_filters.rest_framework import (
     BaseInFilter,
+    BooleanFilter,
     DateFilter,
     FilterSet,
     NumberFilter,
 )
 
-from timed.projects.models import CustomerAssignee, ProjectAssignee, TaskAssignee
+from timed.projects.models import EffectiveRole
+from timed.reports import statistics
+from timed.reports.models import ReportRollup
+from timed.tracking.filters import ReportFilterSet
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -27,25 +30,10 @@ class StatisticFiltersetBase:
             return queryset
 
         task_prefix = self._refs["task_prefix"]
-        project_prefix = self._refs["project_prefix"]
-        customer_prefix = self._refs["customer_prefix"]
-
-        customer_assignees = CustomerAssignee.objects.filter(
-            is_reviewer=True, user_id=value
-        ).values("customer_id")
-
-        project_assignees = ProjectAssignee.objects.filter(
-            is_reviewer=True, user_id=value
-        ).values("project_id")
-        task_assignees = TaskAssignee.objects.filter(
-            is_reviewer=True, user_id=value
-        ).values("task_id")
-
-        the_filter = (
-            Q(**{f"{customer_prefix}pk__in": customer_assignees})
-            | Q(**{f"{project_prefix}pk__in": project_assignees})
-            | Q(**{f"{task_prefix}id__in": task_assignees})
-        )
+        reviewed_tasks = EffectiveRole.objects.filter(
+            user_id=value, role=EffectiveRole.REVIEWER
+        ).values("task")
+        the_filter = Q(**{f"{task_prefix}id__in": reviewed_tasks})
         return queryset.filter_aggregate(the_filter).filter_base(the_filter)
 
     def filter_cost_center(
@@ -87,28 +75,80 @@ class StatisticFiltersetBase:
         return queryset.filter_base(filter_q).filter_aggregate(filter_q)
 
     def filter_queryset(self, queryset: QuerySet[Report]) -> QuerySet[Report]:
+        """Aggregate durations in two stages (see `timed.reports.statistics`).
+
+        Filters of aggregated reports are applied when summing up reports
+        per task, all other filters are applied to the statistic rows.
+        """
         qs = super().filter_queryset(queryset)
+        refs = self._refs
 
-        duration_ref = self._refs["reports_ref"] + "__duration"
+        # reports are either reports or report rollup entries
+        reports_model = qs.model
+        for name in refs["reports_ref"].split("__"):
+            reports_model = reports_model._meta.get_field(name).related_model  # noqa: SLF001
 
-        full_qs = qs._base.annotate(  # noqa: SLF001
-            duration=Coalesce(
-                Sum(duration_ref, filter=qs._agg_filters),  # noqa: SLF001
-                Value("00:00:00", DurationField(null=False)),
-            ),
-            pk=F("id"),
+        condition = qs._agg_filters or Q()  # noqa: SLF001
+        durations = statistics.task_durations(
+            reports_model.objects.filter(
+                statistics.paths_relative_to_reports(
+                    condition,
+                    {
+                        refs["reports_prefix"]: "",
+                        refs["task_prefix"]: "task__",
+                        refs["project_prefix"]: "task__project__",
+                        refs["customer_prefix"]: "task__project__customer__",
+                    },
+                )
+            )
         )
-        return full_qs.values()
+        level = next(level for level in statistics.LEVELS if not refs[f"{level}_ref"])
+        totals = statistics.rolled_up(durations, level)
+
+        rows = qs.model.objects.filter(pk__in=qs._base.values("pk"))  # noqa: SLF001
+        if level == "task" and any(
+            lookup.startswith(refs["reports_prefix"])
+            for lookup in statistics.lookups(condition)
+        ):
+            # tasks are only listed with reports when reports are filtered
+            rows = rows.filter(pk__in=totals.keys())
 
+        return rows.annotate(
+            duration=statistics.duration_of(totals), pk=F("id")
+        ).values()
 
-def statistic_filterset_builder(
-    name: str, reports_ref: str, project_ref: str, customer_ref: str, task_ref: str
+
+def statistic_filterset_builder(  # noqa: PLR0913
+    name: str,
+    reports_ref: str,
+    project_ref: str,
+    customer_ref: str,
+    task_ref: str,
+    *,
+    rollup: bool = False,
 ) -> type[StatisticFiltersetBase, FilterSet]:
+    """Build statistic filter set.
+
+    With `rollup` the filter set aggregates `ReportRollup` entries referenced
+    by `reports_ref` instead of reports and doesn't filter by verification.
+    """
     reports_prefix = f"{reports_ref}__" if reports_ref else ""
     project_prefix = f"{project_ref}__" if project_ref else ""
     customer_prefix = f"{customer_ref}__" if customer_ref else ""
     task_prefix = f"{task_ref}__" if task_ref else ""
 
+    report_filters = {
+        "verified": NumberFilter(
+            field_name=f"{reports_prefix}verified_by_id",
+            lookup_expr="isnull",
+            exclude=True,
+        ),
+        "verifier": NumberFilter(field_name=f"{reports_prefix}verified_by"),
+    }
+    if rollup:
+        # statistics filtered by verification are aggregated from reports
+        report_filters = {}
+
     return type(
         name,
         (StatisticFiltersetBase, FilterSet),
@@ -134,12 +174,7 @@ def statistic_filterset_builder(
             "review": NumberFilter(field_name=f"{reports_prefix}review"),
             "not_billable": NumberFilter(field_name=f"{reports_prefix}not_billable"),
             "billed": NumberFilter(field_name=f"{reports_prefix}billed"),
-            "verified": NumberFilter(
-                field_name=f"{reports_prefix}verified_by_id",
-                lookup_expr="isnull",
-                exclude=True,
-            ),
-            "verifier": NumberFilter(field_name=f"{reports_prefix}verified_by"),
+            **report_filters,
             "billing_type": NumberFilter(field_name=f"{project_prefix}billing_type"),
             "user": NumberFilter(field_name=f"{reports_prefix}user_id"),
             "rejected": NumberFilter(field_name=f"{reports_prefix}rejected"),
@@ -173,3 +208,62 @@ TaskStatisticFilterSet = statistic_filterset_builder(
     task_ref="",
     customer_ref="project__customer",
 )
+
+CustomerStatisticRollupFilterSet = statistic_filterset_builder(
+    "CustomerStatisticRollupFilterSet",
+    reports_ref="projects__tasks__report_rollups",
+    project_ref="projects",
+    task_ref="projects__tasks",
+    customer_ref="",
+    rollup=True,
+)
+
+ProjectStatisticRollupFilterSet = statistic_filterset_builder(
+    "ProjectStatisticRollupFilterSet",
+    reports_ref="tasks__report_rollups",
+    project_ref="",
+    task_ref="tasks",
+    customer_ref="customer",
+    rollup=True,
+)
+
+TaskStatisticRollupFilterSet = statistic_filterset_builder(
+    "TaskStatisticRollupFilterSet",
+    reports_ref="report_rollups",
+    project_ref="project",
+    task_ref="",
+    customer_ref="project__customer",
+    rollup=True,
+)
+
+
+class ReportRollupFilterSet(ReportFilterSet):
+    """Filter set for statistics answered by the report rollup.
+
+    Supports the filters of `ReportFilterSet` which only depend on fields of
+    the rollup.
+    """
+
+    id = None
+    editable = None
+    verifier = None
+    updated_since = None
+    verified = BooleanFilter(field_name="verified")
+
+    class Meta:
+        """Meta information for the report rollup filter set."""
+
+        model = ReportRollup
+        fields = (
+            "date",
+            "from_date",
+            "to_date",
+            "user",
+            "task",
+            "project",
+            "verified",
+            "not_billable",
+            "review",
+            "reviewer",
+            "billing_type",
+        )
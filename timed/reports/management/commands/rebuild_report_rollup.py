@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from timed.reports.rollup import rebuild
+
+
+class Command(BaseCommand):
+    """Rebuild the report rollup.
+
+    Needs to be run after enabling `DJANGO_REPORT_ROLLUP`.
+    """
+
+    help = "Rebuild report rollup from all reports."
+
+    def handle(self, *args, **options):
+        rebuild()
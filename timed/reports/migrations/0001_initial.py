@@ -0,0 +1,37 @@
+# Generated by Django 4.2.11 on 2026-10-17 02:42
+
+import datetime
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('projects', '0016_alter_project_amount_invoiced_currency_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('review', models.BooleanField(default=False)),
+                ('not_billable', models.BooleanField(default=False)),
+                ('billed', models.BooleanField(default=False)),
+                ('verified', models.BooleanField(default=False)),
+                ('rejected', models.BooleanField(default=False)),
+                ('duration', models.DurationField(default=datetime.timedelta(0))),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_rollups', to='projects.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('date', 'user', 'task', 'review', 'not_billable', 'billed', 'verified', 'rejected')},
+            },
+        ),
+    ]
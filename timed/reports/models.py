@@ -0,0 +1,49 @@
+"""Models for the reports app."""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+
+
+class ReportRollup(models.Model):
+    """Report rollup model.
+
+    A rollup entry sums up the duration of all reports of a user on a task
+    and day sharing the same flags, so statistics can be aggregated from
+    the rollup instead of from all reports.
+    """
+
+    date = models.DateField()
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="report_rollups",
+    )
+    task = models.ForeignKey(
+        "projects.Task", on_delete=models.CASCADE, related_name="report_rollups"
+    )
+    review = models.BooleanField(default=False)
+    not_billable = models.BooleanField(default=False)
+    billed = models.BooleanField(default=False)
+    verified = models.BooleanField(default=False)
+    rejected = models.BooleanField(default=False)
+    duration = models.DurationField(default=timedelta(0))
+
+    class Meta:
+        """Meta information for the report rollup model."""
+
+        unique_together = (
+            "date",
+            "user",
+            "task",
+            "review",
+            "not_billable",
+            "billed",
+            "verified",
+            "rejected",
+        )
+
+    def __str__(self) -> str:
+        """Represent the model as a string."""
+        return f"{self.user} {self.task} {self.date}: {self.duration}"
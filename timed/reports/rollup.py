@@ -0,0 +1,129 @@
+"""Maintenance of the report rollup.
+
+When `settings.REPORT_ROLLUP` is enabled the duration of reports is summed
+up per day, user, task and flags in `ReportRollup` and kept up to date by
+signals. Statistics are then aggregated from the rollup whenever their
+filters can be answered by it.
+
+Updates of reports which do not send signals (e.g. `QuerySet.update`) need
+to refresh the rollup explicitly with `refresh`, `track` or
+`refresh_created`.
+
+After enabling the rollup it needs to be built initially with the management
+command `rebuild_report_rollup`.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BooleanField, ExpressionWrapper, Q, Sum
+
+from timed.reports.models import ReportRollup
+from timed.tracking.models import Report
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+
+    from django.db.models import QuerySet
+
+KEY_FIELDS = (
+    "date",
+    "user_id",
+    "task_id",
+    "review",
+    "not_billable",
+    "billed",
+    "verified",
+    "rejected",
+)
+
+# number of rollup entries loaded and inserted at once
+REBUILD_BATCH_SIZE = 2000
+
+
+def enabled() -> bool:
+    return settings.REPORT_ROLLUP
+
+
+def _entries(reports: QuerySet[Report]) -> Iterator[ReportRollup]:
+    rows = (
+        reports.order_by()
+        .annotate(
+            verified=ExpressionWrapper(
+                Q(verified_by__isnull=False), output_field=BooleanField()
+            )
+        )
+        .values(*KEY_FIELDS)
+        .annotate(duration=Sum("duration"))
+    )
+    for row in rows.iterator(chunk_size=REBUILD_BATCH_SIZE):
+        yield ReportRollup(**row)
+
+
+def _save(entries: Iterable[ReportRollup]) -> None:
+    entries = iter(entries)
+    while batch := list(islice(entries, REBUILD_BATCH_SIZE)):
+        # concurrent refreshes may have inserted the same entries already
+        ReportRollup.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=[field.removesuffix("_id") for field in KEY_FIELDS],
+            update_fields=["duration"],
+        )
+
+
+def refresh(lookup: Q) -> None:
+    """Recalculate rollup entries matching given lookup.
+
+    Lookup may only use fields shared by reports and rollup entries such as
+    `date`, `user` and `task`.
+    """
+    if not enabled():
+        return
+
+    with transaction.atomic():
+        ReportRollup.objects.filter(lookup).delete()
+        _save(_entries(Report.objects.filter(lookup)))
+
+
+def _keys(reports: QuerySet[Report]) -> set[tuple]:
+    return set(reports.order_by().values_list("date", "user_id", "task_id").distinct())
+
+
+@contextmanager
+def track(reports: QuerySet[Report]) -> Iterator[None]:
+    """Refresh rollup of given reports after they have been updated in bulk."""
+    if not enabled():
+        yield
+        return
+
+    ids = list(reports.values_list("pk", flat=True))
+    keys = _keys(Report.objects.filter(pk__in=ids))
+    yield
+    keys |= _keys(Report.objects.filter(pk__in=ids))
+    _refresh_keys(keys)
+
+
+def refresh_created(reports: Iterable[Report]) -> None:
+    """Refresh rollup of given reports after they have been created in bulk."""
+    _refresh_keys({(report.date, report.user_id, report.task_id) for report in reports})
+
+
+def _refresh_keys(keys: set[tuple]) -> None:
+    if not keys:
+        return
+
+    dates, user_ids, task_ids = (set(values) for values in zip(*keys))
+    refresh(Q(date__in=dates, user_id__in=user_ids, task_id__in=task_ids))
+
+
+def rebuild() -> None:
+    """Rebuild rollup from all reports."""
+    with transaction.atomic():
+        ReportRollup.objects.all().delete()
+        _save(_entries(Report.objects.all()))
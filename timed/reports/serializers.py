@@ -8,13 +8,14 @@ from django.contrib.auth import get_user_model
 from rest_framework_json_api import relations
 from rest_framework_json_api.serializers import (
     CharField,
+    DateField,
     DecimalField,
     DurationField,
     IntegerField,
     Serializer,
 )
 
-from timed.projects.models import Customer, Project
+from timed.projects.models import BillingType, CostCenter, Customer, Project, Task
 from timed.serializers import TotalTimeRootMetaMixin
 
 if TYPE_CHECKING:
@@ -90,3 +91,37 @@ class UserStatisticSerializer(TotalTimeRootMetaMixin, Serializer):
 
     class Meta:
         resource_name = "user-statistics"
+
+
+class PivotStatisticSerializer(Serializer):
+    """Serialize pivot statistics.
+
+    Views only keep fields of the requested dimensions and measures.
+    """
+
+    year = IntegerField(read_only=True)
+    month = IntegerField(read_only=True)
+    week = DateField(read_only=True)
+    day = DateField(read_only=True)
+    user = relations.ResourceRelatedField(model=get_user_model(), read_only=True)
+    customer = relations.ResourceRelatedField(model=Customer, read_only=True)
+    project = relations.ResourceRelatedField(model=Project, read_only=True)
+    task = relations.ResourceRelatedField(model=Task, read_only=True)
+    cost_center = relations.ResourceRelatedField(model=CostCenter, read_only=True)
+    billing_type = relations.ResourceRelatedField(model=BillingType, read_only=True)
+    duration = DurationField(read_only=True)
+    billable_duration = DurationField(read_only=True)
+    verified_duration = DurationField(read_only=True)
+    count = IntegerField(read_only=True)
+
+    included_serializers: ClassVar[dict[str, str]] = {
+        "user": "timed.employment.serializers.UserSerializer",
+        "customer": "timed.projects.serializers.CustomerSerializer",
+        "project": "timed.projects.serializers.ProjectSerializer",
+        "task": "timed.projects.serializers.TaskSerializer",
+        "cost_center": "timed.projects.serializers.CostCenterSerializer",
+        "billing_type": "timed.projects.serializers.BillingTypeSerializer",
+    }
+
+    class Meta:
+        resource_name = "pivot-statistics"
@@ -0,0 +1,37 @@
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from timed.reports import rollup
+from timed.tracking.models import Report
+
+
+def _rollup_enabled(**kwargs):
+    # ignore signal when loading a fixture
+    return rollup.enabled() and not kwargs.get("raw", False)
+
+
+@receiver(pre_save, sender=Report)
+def remember_rollup_key(sender, instance, **kwargs):  # noqa: ARG001
+    """Remember day, user and task of a report before it is changed."""
+    if not _rollup_enabled(**kwargs) or not instance.pk:
+        return
+
+    instance._rollup_original = instance.original_values(  # noqa: SLF001
+        "date", "user_id", "task_id"
+    )
+
+
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Report)
+def update_rollup(sender, instance, **kwargs):  # noqa: ARG001
+    """Update rollup of the day, user and task of a report."""
+    if not _rollup_enabled(**kwargs):
+        return
+
+    lookup = Q(date=instance.date, user_id=instance.user_id, task_id=instance.task_id)
+    original = getattr(instance, "_rollup_original", None)
+    instance._rollup_original = None  # noqa: SLF001
+    if original:
+        lookup |= Q(**original)
+    rollup.refresh(lookup)
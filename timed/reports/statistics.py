@@ -0,0 +1,163 @@
+"""Two-stage aggregation of customer, project and task statistics.
+
+Joining customers, projects and tasks with all their reports to sum up
+durations gets slow for large numbers of reports. Statistics are
+therefore aggregated in two stages instead:
+
+1. Reports (or report rollup entries) are summed up per task with the
+   filters of the statistic applied to reports.
+2. Durations of the tasks are rolled up to their project or customer and
+   joined to the statistic rows, which are filtered by the filters of the
+   statistic applied to customers, projects or tasks.
+
+The first stage only depends on the filters, so it is shared by all
+statistics aggregated during a request and cached across requests when
+`settings.STATISTIC_CACHE_TIMEOUT` is set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import defaultdict
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    BigIntegerField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Func,
+    JSONField,
+    Q,
+    Sum,
+    TextField,
+    Value,
+)
+from django.db.models.functions import Cast, Coalesce
+
+from timed import changes
+from timed.cache import get_request_cache
+from timed.projects.models import EffectiveRole, Project, Task
+from timed.tracking.models import Report
+
+if TYPE_CHECKING:
+    from django.db.models import Expression, QuerySet
+
+# fields statistics roll up task durations to
+LEVELS = {"task": "task_id", "project": "project_id", "customer": "customer_id"}
+
+
+def task_durations(reports: QuerySet) -> list[dict]:
+    """Sum up durations of given reports per task (first stage)."""
+    # tasks only belong to one project and customer, so grouping by them
+    # doesn't split up the durations of tasks
+    reports = (
+        reports.order_by()
+        .values(
+            "task_id",
+            project_id=F("task__project_id"),
+            customer_id=F("task__project__customer_id"),
+        )
+        .annotate(duration=Sum("duration"))
+    )
+    sql, params = reports.query.sql_with_params()
+    key = "statistics.task_durations.{}".format(
+        hashlib.sha256(f"{sql} {params}".encode()).hexdigest()
+    )
+    request_cache = get_request_cache()
+    if request_cache is not None and key in request_cache:
+        return request_cache[key]
+
+    durations = None
+    timeout = settings.STATISTIC_CACHE_TIMEOUT
+    if timeout:
+        # durations change with reports, with tasks being moved and with
+        # reviewers used to filter
+        versions = changes.versions([Report, Task, Project, EffectiveRole])
+        digest = hashlib.sha256(json.dumps(versions, sort_keys=True).encode())
+        cache_key = f"{key}.{digest.hexdigest()}"
+        durations = cache.get(cache_key)
+    if durations is None:
+        durations = list(reports)
+        if timeout:
+            cache.set(cache_key, durations, timeout)
+
+    if request_cache is not None:
+        request_cache[key] = durations
+    return durations
+
+
+def rolled_up(durations: list[dict], level: str) -> dict[int, timedelta]:
+    """Roll up durations of tasks to given level (second stage)."""
+    field = LEVELS[level]
+    totals = defaultdict(timedelta)
+    for row in durations:
+        totals[row[field]] += row["duration"]
+    return totals
+
+
+def duration_of(totals: dict[int, timedelta], field: str = "id") -> Expression:
+    """Get duration of the row referenced by given field from given totals.
+
+    Totals are passed to the database as a json object of microseconds, so
+    statistics can still be ordered and paginated by their duration.
+    """
+    microseconds = {
+        str(pk): duration // timedelta(microseconds=1)
+        for pk, duration in totals.items()
+    }
+    return Coalesce(
+        ExpressionWrapper(
+            Cast(
+                Func(
+                    Cast(Value(json.dumps(microseconds)), JSONField()),
+                    Cast(field, TextField()),
+                    function="jsonb_extract_path_text",
+                ),
+                BigIntegerField(),
+            )
+            * Value(timedelta(microseconds=1)),
+            output_field=DurationField(),
+        ),
+        Value(timedelta(0)),
+    )
+
+
+def paths_relative_to_reports(condition: Q, prefixes: dict[str, str]) -> Q:
+    """Rewrite lookups of given condition to be relative to reports.
+
+    `prefixes` maps prefixes of lookups relative to a statistic to the
+    prefixes of the same lookups relative to reports.
+    """
+    ordered = sorted(prefixes.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def rewrite(lookup: str) -> str:
+        # lookups of the statistic itself are matched by the empty prefix
+        prefix, report_prefix = next(
+            item for item in ordered if lookup.startswith(item[0])
+        )
+        return report_prefix + lookup.removeprefix(prefix)
+
+    rewritten = Q(_connector=condition.connector, _negated=condition.negated)
+    for child in condition.children:
+        if isinstance(child, Q):
+            rewritten.children.append(paths_relative_to_reports(child, prefixes))
+        else:
+            lookup, value = child
+            rewritten.children.append((rewrite(lookup), value))
+    return rewritten
+
+
+def lookups(condition: Q) -> list[str]:
+    """Get all lookups of given condition."""
+    result = []
+    for child in condition.children:
+        if isinstance(child, Q):
+            result.extend(lookups(child))
+        else:
+            result.append(child[0])
+    return result
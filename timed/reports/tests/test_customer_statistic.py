@@ -15,9 +15,9 @@ from timed.tracking.factories import ReportFactory
     [
         (False, True, False, 1, status.HTTP_403_FORBIDDEN),
         (False, True, True, 1, status.HTTP_403_FORBIDDEN),
-        (True, False, False, 3, status.HTTP_200_OK),
-        (True, True, False, 3, status.HTTP_200_OK),
-        (True, True, True, 3, status.HTTP_200_OK),
+        (True, False, False, 4, status.HTTP_200_OK),
+        (True, True, False, 4, status.HTTP_200_OK),
+        (True, True, True, 4, status.HTTP_200_OK),
     ],
 )
 def test_customer_statistic_list(
@@ -132,7 +132,7 @@ def test_customer_statistic_filtered(auth_client, filter, expected_result):  # n
 @pytest.mark.parametrize(
     ("is_employed", "expected", "status_code"),
     [
-        (True, 5, status.HTTP_200_OK),
+        (True, 3, status.HTTP_200_OK),
         (False, 1, status.HTTP_403_FORBIDDEN),
     ],
 )
@@ -0,0 +1,174 @@
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from timed.employment.factories import UserFactory
+from timed.projects.factories import CostCenterFactory, TaskFactory
+from timed.tracking.factories import ReportFactory
+
+
+def test_pivot_statistic_list(internal_employee_client, django_assert_num_queries):
+    user = internal_employee_client.user
+    cost_center = CostCenterFactory.create()
+    task = TaskFactory.create(cost_center=cost_center)
+    other_task = TaskFactory.create(cost_center=None, project__cost_center=None)
+    ReportFactory.create(
+        user=user, task=task, date=date(2023, 1, 4), duration=timedelta(hours=1)
+    )
+    ReportFactory.create(
+        user=user,
+        task=task,
+        date=date(2023, 1, 6),
+        duration=timedelta(hours=2),
+        not_billable=True,
+        verified_by=UserFactory.create(),
+    )
+    ReportFactory.create(
+        user=user, task=other_task, date=date(2023, 1, 9), duration=timedelta(hours=3)
+    )
+    ReportFactory.create(task=task, date=date(2023, 1, 4))
+
+    url = reverse("pivot-statistic-list")
+    # permission, reports and prefetching of cost centers
+    with django_assert_num_queries(3):
+        result = internal_employee_client.get(
+            url,
+            data={
+                "group_by": "week,cost_center",
+                "measures": "duration,billable_duration,verified_duration,count",
+                "user": user.id,
+            },
+        )
+    assert result.status_code == status.HTTP_200_OK
+
+    assert result.json()["data"] == [
+        {
+            "type": "pivot-statistics",
+            "id": f"2023-01-02-{cost_center.id}",
+            "attributes": {
+                "week": "2023-01-02",
+                "duration": "03:00:00",
+                "billable-duration": "01:00:00",
+                "verified-duration": "02:00:00",
+                "count": 2,
+            },
+            "relationships": {
+                "cost-center": {
+                    "data": {"type": "cost-centers", "id": str(cost_center.id)}
+                }
+            },
+        },
+        {
+            "type": "pivot-statistics",
+            "id": "2023-01-09-",
+            "attributes": {
+                "week": "2023-01-09",
+                "duration": "03:00:00",
+                "billable-duration": "03:00:00",
+                "verified-duration": "00:00:00",
+                "count": 1,
+            },
+            "relationships": {"cost-center": {"data": None}},
+        },
+    ]
+
+
+def test_pivot_statistic_ordering(internal_employee_client):
+    task = TaskFactory.create()
+    ReportFactory.create(task=task, date=date(2023, 1, 4), duration=timedelta(hours=1))
+    ReportFactory.create(task=task, date=date(2023, 2, 4), duration=timedelta(hours=2))
+    ReportFactory.create(task=task, date=date(2024, 2, 4), duration=timedelta(hours=4))
+
+    url = reverse("pivot-statistic-list")
+    result = internal_employee_client.get(
+        url,
+        data={
+            "group_by": "year,month,project",
+            "ordering": "-duration",
+            "include": "project",
+        },
+    )
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert [row["id"] for row in json["data"]] == [
+        f"2024-2-{task.project_id}",
+        f"2023-2-{task.project_id}",
+        f"2023-1-{task.project_id}",
+    ]
+    assert [row["attributes"]["duration"] for row in json["data"]] == [
+        "04:00:00",
+        "02:00:00",
+        "01:00:00",
+    ]
+    assert json["included"][0]["id"] == str(task.project_id)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"ordering": "month"},
+        {"ordering": "-user"},
+        {"ordering": "task"},
+        {"ordering": "count"},
+        {"ordering": "duration", "measures": "count"},
+    ],
+)
+def test_pivot_statistic_ordering_ignored(internal_employee_client, params):
+    task, other_task = TaskFactory.create_batch(2)
+    ReportFactory.create(task=task, date=date(2024, 1, 4), duration=timedelta(hours=1))
+    ReportFactory.create(
+        task=other_task, date=date(2024, 2, 4), duration=timedelta(hours=2)
+    )
+    ReportFactory.create(task=task, date=date(2023, 3, 4), duration=timedelta(hours=4))
+
+    url = reverse("pivot-statistic-list")
+    result = internal_employee_client.get(url, data={"group_by": "year", **params})
+    assert result.status_code == status.HTTP_200_OK
+
+    # orderings by fields which aren't aggregated would split up the groups
+    json = result.json()
+    assert [row["id"] for row in json["data"]] == ["2023", "2024"]
+
+
+def test_pivot_statistic_empty_dimensions(internal_employee_client):
+    cost_center = CostCenterFactory.create()
+    ReportFactory.create(
+        task__cost_center=cost_center,
+        task__project__cost_center=None,
+        task__project__billing_type=None,
+    )
+    ReportFactory.create(task__cost_center=None, task__project__cost_center=None)
+
+    url = reverse("pivot-statistic-list")
+    result = internal_employee_client.get(
+        url, data={"group_by": "cost_center,billing_type"}
+    )
+    assert result.status_code == status.HTTP_200_OK
+
+    # every dimension keeps its place in the id
+    ids = {row["id"] for row in result.json()["data"]}
+    assert len(ids) == 2
+    assert f"{cost_center.id}-" in ids
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"group_by": "year,unknown"},
+        {"group_by": "year", "measures": "duration,unknown"},
+    ],
+)
+def test_pivot_statistic_invalid(internal_employee_client, params):
+    url = reverse("pivot-statistic-list")
+    result = internal_employee_client.get(url, data=params)
+    assert result.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_pivot_statistic_forbidden(auth_client):
+    url = reverse("pivot-statistic-list")
+    result = auth_client.get(url, data={"group_by": "year"})
+    assert result.status_code == status.HTTP_403_FORBIDDEN
@@ -15,9 +15,9 @@ from timed.tracking.factories import ReportFactory
     [
         (False, True, False, 1, status.HTTP_403_FORBIDDEN),
         (False, True, True, 1, status.HTTP_403_FORBIDDEN),
-        (True, False, False, 4, status.HTTP_200_OK),
-        (True, True, False, 4, status.HTTP_200_OK),
-        (True, True, True, 4, status.HTTP_200_OK),
+        (True, False, False, 5, status.HTTP_200_OK),
+        (True, True, False, 5, status.HTTP_200_OK),
+        (True, True, True, 5, status.HTTP_200_OK),
     ],
 )
 def test_project_statistic_list(
@@ -0,0 +1,156 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from timed.employment.factories import EmploymentFactory
+from timed.projects.factories import TaskFactory
+from timed.reports import rollup
+from timed.reports.models import ReportRollup
+from timed.tracking.factories import ReportFactory
+from timed.tracking.models import Report
+
+
+def rollup_entries():
+    return sorted(
+        ReportRollup.objects.values_list(*rollup.KEY_FIELDS, "duration"),
+        key=str,
+    )
+
+
+def assert_rollup_matches():
+    """Compare rollup with rollup rebuilt from all reports."""
+    entries = rollup_entries()
+    call_command("rebuild_report_rollup")
+    assert entries == rollup_entries()
+
+
+@pytest.mark.django_db()
+def test_rollup_maintained_by_signals(settings, superadmin_client):
+    settings.REPORT_ROLLUP = True
+    EmploymentFactory.create(user=superadmin_client.user)
+    task = TaskFactory.create()
+    report = ReportFactory.create(
+        date=date(2017, 1, 2), duration=timedelta(hours=1), task=task
+    )
+    other = ReportFactory.create(
+        date=date(2017, 1, 2),
+        duration=timedelta(hours=2),
+        task=task,
+        user=report.user,
+    )
+    ReportFactory.create(date=date(2017, 1, 3), task=task, not_billable=True)
+    assert ReportRollup.objects.get(date=date(2017, 1, 2)).duration == timedelta(
+        hours=3
+    )
+    assert_rollup_matches()
+
+    report.date = date(2017, 1, 3)
+    report.task = TaskFactory.create(project=task.project)
+    report.save()
+    assert_rollup_matches()
+
+    other.delete()
+    assert_rollup_matches()
+
+    url = reverse("report-bulk")
+    data = {
+        "data": {
+            "type": "report-bulks",
+            "id": None,
+            "attributes": {"verified": True, "task": {"type": "tasks", "id": task.id}},
+        }
+    }
+    response = superadmin_client.post(url + "?editable=1", data)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert set(ReportRollup.objects.values_list("verified", "task_id")) == {
+        (True, task.id)
+    }
+    assert_rollup_matches()
+
+    task.project.billed = True
+    task.project.save()
+    assert ReportRollup.objects.filter(billed=False).count() == 0
+    assert_rollup_matches()
+
+    # updating no reports refreshes nothing
+    with rollup.track(Report.objects.none()):
+        pass
+    assert_rollup_matches()
+
+
+@pytest.mark.parametrize(
+    ("url", "data"),
+    [
+        ("year-statistic-list", {}),
+        ("month-statistic-list", {"from_date": "2017-01-02"}),
+        ("user-statistic-list", {"verified": 1}),
+        ("customer-statistic-list", {"not_billable": 0}),
+        ("project-statistic-list", {"to_date": "2017-01-02", "review": 1}),
+        ("task-statistic-list", {"billed": 0}),
+    ],
+)
+def test_rollup_statistics(settings, internal_employee_client, url, data):
+    task = TaskFactory.create()
+    ReportFactory.create(date=date(2017, 1, 1), task=task, review=True)
+    ReportFactory.create(
+        date=date(2017, 1, 2), task=task, verified_by=internal_employee_client.user
+    )
+    ReportFactory.create(date=date(2017, 1, 2), task=task, not_billable=True)
+    ReportFactory.create(date=date(2017, 2, 3), task=TaskFactory.create())
+
+    data = {"ordering": "duration", **data}
+    expected = internal_employee_client.get(reverse(url), data=data)
+    assert expected.status_code == status.HTTP_200_OK
+
+    settings.REPORT_ROLLUP = True
+    call_command("rebuild_report_rollup")
+    result = internal_employee_client.get(reverse(url), data=data)
+    assert result.status_code == status.HTTP_200_OK
+    assert result.json() == expected.json()
+
+
+@pytest.mark.parametrize(
+    ("url", "verifier", "expected"),
+    [
+        ("year-statistic-list", False, []),
+        ("year-statistic-list", True, [{"duration": "01:00:00"}]),
+        ("task-statistic-list", False, [{"duration": "00:00:00"}]),
+        ("task-statistic-list", True, [{"duration": "01:00:00"}]),
+    ],
+)
+def test_rollup_statistics_fallback(
+    settings, internal_employee_client, url, verifier, expected
+):
+    """Statistics fall back to reports when a filter isn't supported by the rollup."""
+    user = internal_employee_client.user
+    ReportFactory.create(duration=timedelta(hours=1), verified_by=user)
+    data = {"verifier": user.id} if verifier else {}
+    # rollup which isn't built yet is empty
+    settings.REPORT_ROLLUP = True
+
+    result = internal_employee_client.get(reverse(url), data=data)
+    assert result.status_code == status.HTTP_200_OK
+    assert [
+        {"duration": entry["attributes"]["duration"]} for entry in result.json()["data"]
+    ] == expected
+
+
+@pytest.mark.parametrize(
+    "url", ["year-statistic-list", "month-statistic-list", "user-statistic-list"]
+)
+def test_rollup_statistics_updated_since(settings, internal_employee_client, url):
+    """Rollup has no update time, so statistics of updated reports use reports."""
+    ReportFactory.create(duration=timedelta(hours=1))
+    # rollup which isn't built yet is empty
+    settings.REPORT_ROLLUP = True
+
+    result = internal_employee_client.get(
+        reverse(url), data={"updated_since": "2000-01-01T00:00:00Z"}
+    )
+    assert result.status_code == status.HTTP_200_OK
+    assert [entry["attributes"]["duration"] for entry in result.json()["data"]] == [
+        "01:00:00"
+    ]
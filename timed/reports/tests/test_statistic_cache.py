@@ -0,0 +1,139 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+
+from timed.cache import LRUCache
+from timed.employment.factories import EmploymentFactory, UserFactory
+from timed.projects.factories import TaskAssigneeFactory
+from timed.reports.views import statistic_responses
+from timed.tracking.factories import ReportFactory
+
+
+@pytest.fixture(autouse=True)
+def _statistic_response_cache(settings):
+    settings.STATISTIC_RESPONSE_CACHE_SIZE = 10
+    statistic_responses.clear()
+    yield
+    statistic_responses.clear()
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def _requests(result):
+    return _sample(
+        "timed_lru_cache_requests_total", cache="statistic_responses", result=result
+    )
+
+
+def test_statistic_cache_hit(internal_employee_client, django_assert_max_num_queries):
+    report = ReportFactory.create(duration=timedelta(hours=1))
+    url = reverse("task-statistic-list")
+    hits = _requests("hit")
+
+    response = internal_employee_client.get(
+        url, {"ordering": "name", "from_date": report.date, "user": ""}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+    # only the permission of the user is checked
+    with django_assert_max_num_queries(1):
+        cached = internal_employee_client.get(
+            url, {"from_date": report.date, "ordering": "name"}
+        )
+    assert cached.status_code == status.HTTP_200_OK
+    assert cached.content == response.content
+    assert cached["Content-Type"] == response["Content-Type"]
+    assert _requests("hit") == hits + 1
+
+    # other filters aren't answered from the cache
+    other = internal_employee_client.get(url, {"ordering": "-name"})
+    assert other.json()["meta"]["total-time"] == "01:00:00"
+    assert _requests("hit") == hits + 1
+
+
+def test_statistic_cache_editable(internal_employee_client, client):
+    other_user = UserFactory.create()
+    EmploymentFactory.create(user=other_user, is_external=False)
+    ReportFactory.create(
+        user=internal_employee_client.user, duration=timedelta(hours=1)
+    )
+    url = reverse("year-statistic-list")
+    hits = _requests("hit")
+
+    own = internal_employee_client.get(url, {"editable": 1})
+    assert own.json()["meta"]["total-time"] == "01:00:00"
+
+    # reports editable by another user aren't answered from the cache
+    client.force_authenticate(user=other_user)
+    other = client.get(url, {"editable": 1})
+    assert other.status_code == status.HTTP_200_OK
+    assert other.json()["meta"]["total-time"] == "00:00:00"
+    assert _requests("hit") == hits
+
+    cached = internal_employee_client.get(url, {"editable": 1})
+    assert cached.content == own.content
+    assert _requests("hit") == hits + 1
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda report: ReportFactory.create(task=report.task),
+        lambda report: report.task.project.customer.save(),
+        lambda report: TaskAssigneeFactory.create(task=report.task),
+    ],
+    ids=["report", "customer", "assignee"],
+)
+def test_statistic_cache_invalidated(internal_employee_client, change):
+    report = ReportFactory.create(duration=timedelta(hours=1))
+    url = reverse("customer-statistic-list")
+    hits = _requests("hit")
+
+    internal_employee_client.get(url)
+    change(report)
+    changed = internal_employee_client.get(url)
+
+    assert changed.status_code == status.HTTP_200_OK
+    assert _requests("hit") == hits
+
+
+def test_statistic_cache_disabled(internal_employee_client, settings):
+    settings.STATISTIC_RESPONSE_CACHE_SIZE = 0
+    url = reverse("year-statistic-list")
+    misses = _requests("miss")
+
+    internal_employee_client.get(url)
+    internal_employee_client.get(url)
+
+    assert _requests("miss") == misses
+
+
+def test_statistic_cache_forbidden(auth_client):
+    url = reverse("user-statistic-list")
+    misses = _requests("miss")
+
+    response = auth_client.get(url)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert _requests("miss") == misses
+
+
+def test_lru_cache_eviction():
+    cache = LRUCache("test")
+    evictions = _sample("timed_lru_cache_evictions_total", cache="test")
+
+    cache.set("a", 1, size=2)
+    cache.set("b", 2, size=2)
+    assert cache.get("a") == 1
+    cache.set("c", 3, size=2)
+
+    # least recently used value is evicted
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert _sample("timed_lru_cache_evictions_total", cache="test") == evictions + 1
@@ -15,9 +15,9 @@ from timed.tracking.factories import ReportFactory
     [
         (False, True, False, 1, status.HTTP_403_FORBIDDEN),
         (False, True, True, 1, status.HTTP_403_FORBIDDEN),
-        (True, False, False, 4, status.HTTP_200_OK),
-        (True, True, False, 4, status.HTTP_200_OK),
-        (True, True, True, 4, status.HTTP_200_OK),
+        (True, False, False, 5, status.HTTP_200_OK),
+        (True, True, False, 5, status.HTTP_200_OK),
+        (True, True, True, 5, status.HTTP_200_OK),
     ],
 )
 def test_task_statistic_list(
@@ -137,3 +137,55 @@ def test_task_statistic_filtered(
     json = result.json()
 
     assert json["meta"]["total-time"] == f"{expected_result:02}:00:00"
+
+
+def test_task_statistic_filtered_reports(auth_client):
+    """Durations of reports matching several filters are only summed up once."""
+    setup_customer_and_employment_status(
+        user=auth_client.user,
+        is_assignee=True,
+        is_customer=True,
+        is_employed=True,
+        is_external=False,
+    )
+    task = TaskFactory.create(name="Test")
+    TaskFactory.create(name="Empty")
+    for day in ["2022-08-05", "2022-08-20", "2022-08-30", "2022-09-01"]:
+        ReportFactory.create(duration=timedelta(hours=1), date=day, task=task)
+
+    url = reverse("task-statistic-list")
+    result = auth_client.get(
+        url, data={"from_date": "2022-08-10", "to_date": "2022-08-31"}
+    )
+    assert result.status_code == status.HTTP_200_OK
+
+    json = result.json()
+    assert [row["attributes"]["name"] for row in json["data"]] == ["Test"]
+    assert json["data"][0]["attributes"]["duration"] == "02:00:00"
+    assert json["meta"]["total-time"] == "02:00:00"
+
+
+def test_task_statistic_cached(auth_client, settings, django_assert_num_queries):
+    settings.STATISTIC_CACHE_TIMEOUT = 60
+    setup_customer_and_employment_status(
+        user=auth_client.user,
+        is_assignee=True,
+        is_customer=True,
+        is_employed=True,
+        is_external=False,
+    )
+    report = ReportFactory.create(duration=timedelta(hours=1))
+    url = reverse("task-statistic-list")
+
+    with django_assert_num_queries(5):
+        result = auth_client.get(url)
+    assert result.json()["meta"]["total-time"] == "01:00:00"
+
+    # durations of tasks are taken from the cache
+    with django_assert_num_queries(4):
+        result = auth_client.get(url)
+    assert result.json()["meta"]["total-time"] == "01:00:00"
+
+    ReportFactory.create(duration=timedelta(hours=2), task=report.task)
+    result = auth_client.get(url)
+    assert result.json()["meta"]["total-time"] == "03:00:00"
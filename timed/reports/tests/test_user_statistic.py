@@ -5,6 +5,7 @@ from django.urls import reverse
 from rest_framework import status
 
 from timed.conftest import setup_customer_and_employment_status
+from timed.projects.factories import TaskAssigneeFactory
 from timed.tracking.factories import ReportFactory
 
 
@@ -60,3 +61,27 @@ def test_user_statistic_list(
         assert json["data"] == expected_json
         assert len(json["included"]) == 2
         assert json["meta"]["total-time"] == "05:00:00"
+
+
+@pytest.mark.parametrize("count", [1, 5])
+def test_user_statistic_include_user(
+    internal_employee_client, django_assert_num_queries, count
+):
+    reports = ReportFactory.create_batch(count)
+    for report in reports:
+        report.user.supervisors.add(internal_employee_client.user)
+    TaskAssigneeFactory.create(user=reports[0].user, is_reviewer=True)
+
+    url = reverse("user-statistic-list")
+    # permission, statistics, roles, users, supervisors, supervisees and
+    # total time
+    with django_assert_num_queries(7):
+        result = internal_employee_client.get(url, data={"include": "user"})
+    assert result.status_code == status.HTTP_200_OK
+
+    users = {user["id"]: user for user in result.json()["included"]}
+    assert len(users) == count
+    assert users[str(reports[0].user.id)]["attributes"]["is-reviewer"]
+    assert users[str(reports[0].user.id)]["relationships"]["supervisors"]["data"] == [
+        {"type": "users", "id": str(internal_employee_client.user.id)}
+    ]
@@ -1,5 +1,5 @@
 import io
-from datetime import date
+from datetime import date, timedelta
 from zipfile import ZipFile
 
 import ezodf
@@ -11,6 +11,7 @@ from timed.conftest import setup_customer_and_employment_status
 from timed.employment.factories import EmploymentFactory
 from timed.projects.factories import CustomerFactory, ProjectFactory, TaskFactory
 from timed.reports.views import WorkReportViewSet
+from timed.reports.workreport import WorkReport, WorkReportRow, build_workreports
 from timed.tracking.factories import ReportFactory
 
 
@@ -119,7 +120,7 @@ def test_work_report_multiple_projects(
     if status_code == status.HTTP_200_OK:
         assert "20170901-WorkReports.zip" in (res["Content-Disposition"])
 
-        content = io.BytesIO(res.content)
+        content = io.BytesIO(b"".join(res.streaming_content))
         with ZipFile(content, "r") as zipfile:
             for i in range(num_projects):
                 ods_content = zipfile.read(f"1708-20170901-Customer-Project{i}.ods")
@@ -187,3 +188,45 @@ def test_work_report_count(
     )
 
     assert res.status_code == expected_status
+
+
+@pytest.mark.parametrize("processes", [0, 2])
+def test_build_workreports(settings, processes):
+    rows = [
+        WorkReportRow(
+            date(2017, 8, day), "Test User", timedelta(hours=day), "", task, day == 3
+        )
+        for day, task in [(1, "Task A"), (2, "Task B"), (3, "Task A")]
+    ]
+    workreports = [
+        WorkReport(
+            name=f"{i}.ods",
+            customer="Customer",
+            project=f"Project {i}",
+            from_date=date(2017, 8, 1),
+            to_date=date(2017, 8, 31),
+            user="Test User",
+            verifiers=[],
+            rows=rows,
+        )
+        for i in range(3)
+    ]
+
+    docs = list(
+        build_workreports(settings.WORK_REPORT_PATH, workreports, processes=processes)
+    )
+
+    assert [name for name, _ in docs] == ["0.ods", "1.ods", "2.ods"]
+    table = ezodf.opendoc(io.BytesIO(docs[2][1])).sheets[0]
+    assert table["C4"].value == "Project 2"
+    assert [table[f"A{row}"].value for row in range(13, 16)] == [
+        "2017-08-01",
+        "2017-08-02",
+        "2017-08-03",
+    ]
+    assert [table[f"F{row}"].value for row in range(13, 16)] == ["yes", "yes", "no"]
+    # task totals
+    assert (table["A17"].value, table["C17"].value) == ("Task A", 4)
+    assert (table["A18"].value, table["C18"].value) == ("Task B", 2)
+    assert table["C19"].formula == "of:=SUM(C13:C15)"
+    assert table["C20"].formula == 'of:=SUMIF(F13:F15;"no";C13:C15)'
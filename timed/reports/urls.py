@@ -12,5 +12,6 @@ r.register(r"task-statistics", views.TaskStatisticViewSet, "task-statistic")
 r.register(r"user-statistics", views.UserStatisticViewSet, "user-statistic")
 r.register(r"customer-statistics", views.CustomerStatisticViewSet, "customer-statistic")
 r.register(r"project-statistics", views.ProjectStatisticViewSet, "project-statistic")
+r.register(r"pivot-statistics", views.PivotStatisticViewSet, "pivot-statistic")
 
 urlpatterns = r.urls
@@ -1,26 +1,57 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import re
+import tempfile
 from collections import defaultdict
 from datetime import date
-from io import BytesIO
 from typing import TYPE_CHECKING
 from zipfile import ZipFile
 
 from django.conf import settings
-from django.db.models import F, Q, QuerySet, Sum
-from django.db.models.functions import ExtractMonth, ExtractYear
-from django.http import HttpResponse
+from django.db.models import (
+    CharField,
+    Count,
+    DateField,
+    DurationField,
+    F,
+    Func,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+)
+from django.db.models.functions import (
+    Cast,
+    Coalesce,
+    ExtractMonth,
+    ExtractYear,
+    TruncWeek,
+)
+from django.http import FileResponse, HttpResponse
 from django.utils.http import content_disposition_header
-from ezodf import Cell, opendoc
-from rest_framework import status
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, status
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet, ReadOnlyModelViewSet
 
+from timed import changes, roles
+from timed.cache import LRUCache
+from timed.employment.models import User
 from timed.mixins import AggregateQuerysetMixin
 from timed.permissions import IsAuthenticated, IsInternal, IsSuperUser
-from timed.projects.models import Customer, Project, Task
-from timed.reports import serializers
+from timed.projects.models import (
+    BillingType,
+    CostCenter,
+    Customer,
+    EffectiveRole,
+    Project,
+    Task,
+)
+from timed.reports import rollup, serializers
+from timed.reports.models import ReportRollup
+from timed.reports.workreport import WorkReport, WorkReportRow, build_workreports
 from timed.tracking.filters import ReportFilterSet
 from timed.tracking.models import Report
 from timed.tracking.views import ReportViewSet
@@ -28,18 +59,120 @@ from timed.tracking.views import ReportViewSet
 from . import filters
 
 if TYPE_CHECKING:
-    from typing import Iterable
+    from typing import ClassVar, Iterable
 
-    from ezodf.document import FlatXMLDocument, PackagedDocument
+    from django.db.models import Expression
 
-    from timed.employment.models import User
 
+class RollupMixin:
+    """Answer statistics from the report rollup when filters allow it.
 
-class YearStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+    Statistics fall back to aggregating reports when the rollup is disabled
+    or when a filter is used which `rollup_filterset_class` doesn't support.
+    """
+
+    rollup_filterset_class = None
+    use_rollup = False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        unsupported = set(self.filterset_class.base_filters) - set(
+            self.rollup_filterset_class.base_filters
+        )
+        self.use_rollup = rollup.enabled() and not unsupported.intersection(
+            request.query_params
+        )
+        if self.use_rollup:
+            self.filterset_class = self.rollup_filterset_class
+
+    def get_reports(self) -> QuerySet[Report] | QuerySet[ReportRollup]:
+        if self.use_rollup:
+            return ReportRollup.objects.all()
+        return Report.objects.all()
+
+
+statistic_responses = LRUCache("statistic_responses")
+
+
+class StatisticCacheMixin:
+    """Answer repeated statistic requests from rendered responses.
+
+    Responses are cached per process by path, normalized filters and role
+    of the requesting user. Responses filtered by what the requesting user
+    may do (see `statistic_cache_user_filters`) are cached per user. Cached
+    responses are only used as long as the versions of the tables statistics
+    are computed from (see `timed.changes`) haven't changed.
+
+    Only active when `settings.STATISTIC_RESPONSE_CACHE_SIZE` is set.
+    """
+
+    statistic_cache_models = (Report, Customer, Project, Task, EffectiveRole, User)
+    statistic_cache_user_filters = ("editable",)
+
+    def _statistic_cache_key(self, request):
+        # empty filters are ignored by filtersets
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+            if value
+        )
+        # statistics may only be read by internal employees and super users
+        scope = "superuser" if request.user.is_superuser else "internal"
+        if any(key in self.statistic_cache_user_filters for key, _value in params):
+            scope = request.user.pk
+        key = [
+            request.path,
+            request.accepted_renderer.format,
+            params,
+            scope,
+            changes.versions(self.statistic_cache_models),
+        ]
+        digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _cached(self, handler, request, *args, **kwargs):
+        if not settings.STATISTIC_RESPONSE_CACHE_SIZE:
+            return handler(request, *args, **kwargs)
+
+        key = self._statistic_cache_key(request)
+        cached = statistic_responses.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+
+        response = handler(request, *args, **kwargs)
+        self._statistic_response_key = key
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, "_statistic_response_key", None)
+        if key is not None and response.status_code == status.HTTP_200_OK:
+            response.render()
+            statistic_responses.set(
+                key,
+                (response.content, response["Content-Type"]),
+                settings.STATISTIC_RESPONSE_CACHE_SIZE,
+            )
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+
+class YearStatisticViewSet(
+    StatisticCacheMixin, RollupMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
     """Year statistics calculates total reported time per year."""
 
     serializer_class = serializers.YearStatisticSerializer
     filterset_class = ReportFilterSet
+    rollup_filterset_class = filters.ReportRollupFilterSet
     ordering_fields = (
         "year",
         "duration",
@@ -53,17 +186,20 @@ class YearStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
     )
 
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_reports()
         queryset = queryset.annotate(year=ExtractYear("date")).values("year")
         queryset = queryset.annotate(duration=Sum("duration"))
         return queryset.annotate(pk=F("year"))
 
 
-class MonthStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class MonthStatisticViewSet(
+    StatisticCacheMixin, RollupMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
     """Month statistics calculates total reported time per month."""
 
     serializer_class = serializers.MonthStatisticSerializer
     filterset_class = ReportFilterSet
+    rollup_filterset_class = filters.ReportRollupFilterSet
     ordering_fields = (
         "year",
         "month",
@@ -81,7 +217,7 @@ class MonthStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
     )
 
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_reports()
         queryset = queryset.annotate(
             year=ExtractYear("date"), month=ExtractMonth("date")
         )
@@ -151,11 +287,14 @@ class StatisticQueryset(QuerySet):
         )
 
 
-class CustomerStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class CustomerStatisticViewSet(
+    StatisticCacheMixin, RollupMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
     """Customer statistics calculates total reported time per customer."""
 
     serializer_class = serializers.CustomerStatisticSerializer
     filterset_class = filters.CustomerStatisticFilterSet
+    rollup_filterset_class = filters.CustomerStatisticRollupFilterSet
     ordering_fields = (
         "name",
         "duration",
@@ -175,11 +314,14 @@ class CustomerStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         return StatisticQueryset(model=Customer, catch_prefixes="projects__")
 
 
-class ProjectStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class ProjectStatisticViewSet(
+    StatisticCacheMixin, RollupMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
     """Project statistics calculates total reported time per project."""
 
     serializer_class = serializers.ProjectStatisticSerializer
     filterset_class = filters.ProjectStatisticFilterSet
+    rollup_filterset_class = filters.ProjectStatisticRollupFilterSet
     ordering_fields = (
         "name",
         "duration",
@@ -198,11 +340,14 @@ class ProjectStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         return StatisticQueryset(model=Project, catch_prefixes="tasks__")
 
 
-class TaskStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class TaskStatisticViewSet(
+    StatisticCacheMixin, RollupMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
     """Task statistics calculates total reported time per task."""
 
     serializer_class = serializers.TaskStatisticSerializer
     filterset_class = filters.TaskStatisticFilterSet
+    rollup_filterset_class = filters.TaskStatisticRollupFilterSet
     ordering_fields = (
         "name",
         "duration",
@@ -218,14 +363,19 @@ class TaskStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
     )
 
     def get_queryset(self):
-        return StatisticQueryset(model=Task, catch_prefixes="tasks__")
+        return StatisticQueryset(
+            model=Task, catch_prefixes=("reports__", "report_rollups__")
+        )
 
 
-class UserStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
+class UserStatisticViewSet(
+    StatisticCacheMixin, RollupMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
     """User calculates total reported time per user."""
 
     serializer_class = serializers.UserStatisticSerializer
     filterset_class = ReportFilterSet
+    rollup_filterset_class = filters.ReportRollupFilterSet
     ordering_fields = (
         "user__username",
         "duration",
@@ -238,13 +388,134 @@ class UserStatisticViewSet(AggregateQuerysetMixin, ReadOnlyModelViewSet):
         ),
     )
 
+    # included users are serialized with their supervisors, supervisees
+    # and roles
+    prefetch_related_for_field: ClassVar[dict[str, list[str]]] = {
+        "user": ["supervisors", "supervisees"]
+    }
+
+    def get_serializer(self, data=None, *args, **kwargs):
+        if data and kwargs.get("many"):
+            roles.prefetch(entry["user"] for entry in data)
+        return super().get_serializer(data, *args, **kwargs)
+
     def get_queryset(self):
-        queryset = Report.objects.all()
+        queryset = self.get_reports()
         queryset = queryset.values("user")
         queryset = queryset.annotate(duration=Sum("duration"))
         return queryset.annotate(pk=F("user"))
 
 
+def _duration(condition=None):
+    return Coalesce(
+        Sum("duration", filter=condition),
+        Value("00:00:00", DurationField(null=False)),
+    )
+
+
+class PivotStatisticViewSet(
+    StatisticCacheMixin, AggregateQuerysetMixin, ReadOnlyModelViewSet
+):
+    """Pivot statistics aggregate reports by several dimensions at once.
+
+    Dimensions are given as comma separated list in `group_by`, measures
+    in `measures` (defaults to duration). All filters of reports are
+    supported and all measures are aggregated in one query.
+    """
+
+    serializer_class = serializers.PivotStatisticSerializer
+    filterset_class = ReportFilterSet
+    statistic_cache_models = (
+        *StatisticCacheMixin.statistic_cache_models,
+        CostCenter,
+        BillingType,
+    )
+    permission_classes = (
+        (
+            # internal employees or super users may read all customer statistics
+            (IsInternal | IsSuperUser) & IsAuthenticated
+        ),
+    )
+
+    # week is the monday the week starts with
+    dimensions: ClassVar[dict[str, Expression]] = {
+        "year": ExtractYear("date"),
+        "month": ExtractMonth("date"),
+        "week": Cast(TruncWeek("date"), DateField()),
+        "day": F("date"),
+        "user": F("user_id"),
+        "customer": F("task__project__customer_id"),
+        "project": F("task__project_id"),
+        "task": F("task_id"),
+        # same as cost center filter of reports
+        "cost_center": Coalesce(
+            "task__cost_center_id", "task__project__cost_center_id"
+        ),
+        "billing_type": F("task__project__billing_type_id"),
+    }
+    measures: ClassVar[dict[str, Expression]] = {
+        "duration": _duration(),
+        "billable_duration": _duration(Q(not_billable=False, review=False)),
+        "verified_duration": _duration(Q(verified_by__isnull=False)),
+        "count": Count("id"),
+    }
+
+    def _param_list(self, name, choices, default=()):
+        values = self.request.query_params.get(name, "")
+        values = [value for value in values.split(",") if value] or list(default)
+        unknown = [value for value in values if value not in choices]
+        if unknown:
+            raise exceptions.ParseError(
+                _("Unknown %(name)s: %(unknown)s")
+                % {"name": name, "unknown": ", ".join(unknown)}
+            )
+        return list(dict.fromkeys(values))
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+
+        self.group_by = self._param_list("group_by", self.dimensions)
+        if not self.group_by:
+            raise exceptions.ParseError(_("Group by needs to be set"))
+        self.aggregates = self._param_list("measures", self.measures, ["duration"])
+        self.ordering = self.group_by
+        # only aggregated values may be ordered by, other fields of reports
+        # would be added to the grouping
+        self.ordering_fields = (*self.group_by, *self.aggregates)
+
+    def get_serializer_class(self):
+        # related fields of aggregates need to be part of the results
+        removed = {
+            name: None
+            for name in (*self.dimensions, *self.measures)
+            if name not in (*self.group_by, *self.aggregates)
+        }
+        return type("PivotStatisticSerializer", (self.serializer_class,), removed)
+
+    def get_queryset(self):
+        # dimensions and measures are annotated under temporary names first,
+        # as some of them conflict with fields of reports
+        queryset = Report.objects.values(
+            **{f"pivot_{name}": self.dimensions[name] for name in self.group_by}
+        )
+        queryset = queryset.annotate(
+            **{f"pivot_{name}": self.measures[name] for name in self.aggregates}
+        )
+        return queryset.annotate(
+            **{name: F(f"pivot_{name}") for name in (*self.group_by, *self.aggregates)},
+            # empty dimensions need to keep their place in the id
+            pk=Func(
+                Value("-"),
+                *(
+                    Coalesce(Cast(f"pivot_{name}", CharField()), Value(""))
+                    for name in self.group_by
+                ),
+                function="CONCAT_WS",
+                output_field=CharField(),
+            ),
+        )
+
+
 class WorkReportViewSet(GenericViewSet):
     """Build a ods work report of reports with given filters.
 
@@ -309,13 +580,11 @@ class WorkReportViewSet(GenericViewSet):
         project: Project,
         reports: Iterable[Report],
         user: User,
-    ) -> tuple[str, PackagedDocument | FlatXMLDocument]:
-        """Create ods workreport.
+    ) -> WorkReport:
+        """Collect data of work report.
 
-        :rtype: tuple
-        :return: tuple where as first value is name and second ezodf document
+        :return: work report which can be built with `build_workreport`
         """
-        customer = project.customer
         verifiers = sorted(
             {
                 report.verified_by.get_full_name()
@@ -323,79 +592,31 @@ class WorkReportViewSet(GenericViewSet):
                 if report.verified_by_id is not None
             }
         )
-
-        tmpl = settings.WORK_REPORT_PATH
-        doc: PackagedDocument | FlatXMLDocument = opendoc(tmpl)
-        table = doc.sheets[0]
-        tasks = defaultdict(int)
-        date_style = table["C5"].style_name
-        # in template cell D3 is empty but styled for float and borders
-        float_style = table["D3"].style_name
-        # in template cell D4 is empty but styled for text wrap and borders
-        text_style = table["D4"].style_name
-        # in template cell D8 is empty but styled for date with borders
-        date_style_report = table["D8"].style_name
-
-        # for simplicity insert reports in reverse order
-        for report in reports:
-            table.insert_rows(12, 1)
-            table["A13"] = Cell(
-                report.date, style_name=date_style_report, value_type="date"
-            )
-            table["B13"] = Cell(report.user.get_full_name(), style_name=text_style)
-            hours = report.duration.total_seconds() / 60 / 60
-            table["C13"] = Cell(hours, style_name=float_style)
-            table["D13"] = Cell(report.comment, style_name=text_style)
-            table["E13"] = Cell(report.task.name, style_name=text_style)
-            if report.not_billable:
-                table["F13"] = Cell("no", style_name=float_style)
-            else:
-                table["F13"] = Cell("yes", style_name=float_style)
-
-            # when from and to date are None find lowest and biggest date
-            from_date = min(report.date, from_date or date.max)
-            to_date = max(report.date, to_date or date.min)
-
-            tasks[report.task.name] += hours
-
-        # header values
-        table["C3"] = Cell(customer and customer.name)
-        table["C4"] = Cell(project and project.name)
-        table["C5"] = Cell(from_date, style_name=date_style, value_type="date")
-        table["C6"] = Cell(to_date, style_name=date_style, value_type="date")
-        table["C8"] = Cell(date.today(), style_name=date_style, value_type="date")
-        table["C9"] = Cell(user.get_full_name())
-        table["C10"] = Cell(", ".join(verifiers))
-
-        # reset temporary styles (mainly because of borders)
-        table["D3"].style_name = ""
-        table["D4"].style_name = ""
-        table["D8"].style_name = ""
-
-        pos = 13 + len(reports)
-        for task_name, task_total_hours in tasks.items():
-            table.insert_rows(pos, 1)
-            table.row_info(pos).style_name = table.row_info(pos - 1).style_name
-            table[pos, 0] = Cell(task_name, style_name=table[pos - 1, 0].style_name)
-            table[pos, 2] = Cell(
-                task_total_hours, style_name=table[pos - 1, 2].style_name
-            )
-
-        # calculate location of total hours as insert rows moved it
-        table[
-            13 + len(reports) + len(tasks), 2
-        ].formula = f"of:=SUM(C13:C{13 + len(reports) - 1!s})"
-
-        # calculate location of total not billable hours as insert rows moved it
-        table[
-            13 + len(reports) + len(tasks) + 1, 2
-        ].formula = 'of:=SUMIF(F13:F{0};"no";C13:C{0})'.format(
-            str(13 + len(reports) - 1)
+        # when from and to date are None find lowest and biggest date
+        from_date = from_date or min(report.date for report in reports)
+        to_date = to_date or max(report.date for report in reports)
+
+        return WorkReport(
+            name=self._generate_workreport_name(from_date, project),
+            customer=project.customer.name,
+            project=project.name,
+            from_date=from_date,
+            to_date=to_date,
+            user=user.get_full_name(),
+            verifiers=verifiers,
+            rows=[
+                WorkReportRow(
+                    date=report.date,
+                    user=report.user.get_full_name(),
+                    duration=report.duration,
+                    comment=report.comment,
+                    task=report.task.name,
+                    not_billable=report.not_billable,
+                )
+                for report in reports
+            ],
         )
 
-        name = self._generate_workreport_name(from_date, project)
-        return (name, doc)
-
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
 
@@ -405,9 +626,6 @@ class WorkReportViewSet(GenericViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # needed as we add items in reverse order to work report
-        queryset = queryset.reverse()
-
         if (
             settings.WORK_REPORTS_EXPORT_MAX_COUNT > 0
             and queryset.count() > settings.WORK_REPORTS_EXPORT_MAX_COUNT
@@ -426,15 +644,20 @@ class WorkReportViewSet(GenericViewSet):
         for report in queryset:
             reports_by_project[report.task.project].append(report)
 
-        docs = [
+        workreports = [
             self._create_workreport(from_date, to_date, project, reports, request.user)
             for project, reports in reports_by_project.items()
         ]
+        docs = build_workreports(
+            settings.WORK_REPORT_PATH,
+            workreports,
+            processes=settings.WORK_REPORT_PROCESSES,
+        )
 
-        if len(docs) == 1:
-            name, doc = docs[0]
+        if len(workreports) == 1:
+            name, doc = next(docs)
             response = HttpResponse(
-                doc.tobytes(),
+                doc,
                 content_type="application/vnd.oasis.opendocument.spreadsheet",
             )
             response["Content-Disposition"] = content_disposition_header(
@@ -442,13 +665,15 @@ class WorkReportViewSet(GenericViewSet):
             )
             return response
 
-        # zip multiple work reports
-        buf = BytesIO()
+        # zip multiple work reports as they are built
+        buf = tempfile.TemporaryFile()
         with ZipFile(buf, "w") as zf:
             for name, doc in docs:
-                zf.writestr(name, doc.tobytes())
-        response = HttpResponse(buf.getvalue(), content_type="application/zip")
-        response["Content-Disposition"] = content_disposition_header(
-            as_attachment=True, filename=f"{date.today():%Y%m%d}-WorkReports.zip"
+                zf.writestr(name, doc)
+        buf.seek(0)
+        return FileResponse(
+            buf,
+            as_attachment=True,
+            filename=f"{date.today():%Y%m%d}-WorkReports.zip",
+            content_type="application/zip",
         )
-        return response
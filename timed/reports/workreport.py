@@ -0,0 +1,139 @@
+"""Generation of ods work reports.
+
+Work reports are built from plain data and do not access the database, so
+they can be generated in worker processes. The template is only read once
+per process and each work report is opened from its content.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from ezodf import Cell, opendoc
+
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+
+
+class WorkReportRow(NamedTuple):
+    date: date
+    user: str
+    duration: timedelta
+    comment: str
+    task: str
+    not_billable: bool
+
+
+class WorkReport(NamedTuple):
+    name: str
+    customer: str
+    project: str
+    from_date: date
+    to_date: date
+    user: str
+    verifiers: list[str]
+    rows: list[WorkReportRow]
+
+
+@lru_cache
+def _read_template(path: str) -> bytes:
+    return Path(path).read_bytes()
+
+
+def build_workreport(template: str, workreport: WorkReport) -> bytes:
+    """Build ods document of a work report with given template path."""
+    doc = opendoc(BytesIO(_read_template(template)))
+    table = doc.sheets[0]
+    rows = workreport.rows
+    tasks = defaultdict(int)
+    date_style = table["C5"].style_name
+    # in template cell D3 is empty but styled for float and borders
+    float_style = table["D3"].style_name
+    # in template cell D4 is empty but styled for text wrap and borders
+    text_style = table["D4"].style_name
+    # in template cell D8 is empty but styled for date with borders
+    date_style_report = table["D8"].style_name
+
+    # insert all rows at once as each insertion needs to move following rows
+    table.insert_rows(12, len(rows))
+    for pos, row in enumerate(rows, 12):
+        hours = row.duration.total_seconds() / 60 / 60
+        table[pos, 0] = Cell(row.date, style_name=date_style_report, value_type="date")
+        table[pos, 1] = Cell(row.user, style_name=text_style)
+        table[pos, 2] = Cell(hours, style_name=float_style)
+        table[pos, 3] = Cell(row.comment, style_name=text_style)
+        table[pos, 4] = Cell(row.task, style_name=text_style)
+        table[pos, 5] = Cell(
+            "no" if row.not_billable else "yes", style_name=float_style
+        )
+        tasks[row.task] += hours
+
+    # header values
+    table["C3"] = Cell(workreport.customer)
+    table["C4"] = Cell(workreport.project)
+    table["C5"] = Cell(workreport.from_date, style_name=date_style, value_type="date")
+    table["C6"] = Cell(workreport.to_date, style_name=date_style, value_type="date")
+    table["C8"] = Cell(date.today(), style_name=date_style, value_type="date")
+    table["C9"] = Cell(workreport.user)
+    table["C10"] = Cell(", ".join(workreport.verifiers))
+
+    # reset temporary styles (mainly because of borders)
+    table["D3"].style_name = ""
+    table["D4"].style_name = ""
+    table["D8"].style_name = ""
+
+    pos = 13 + len(rows)
+    table.insert_rows(pos, len(tasks))
+    row_style = table.row_info(pos - 1).style_name
+    for offset, (task_name, task_total_hours) in enumerate(tasks.items()):
+        table.row_info(pos + offset).style_name = row_style
+        table[pos + offset, 0] = Cell(
+            task_name, style_name=table[pos - 1, 0].style_name
+        )
+        table[pos + offset, 2] = Cell(
+            task_total_hours, style_name=table[pos - 1, 2].style_name
+        )
+
+    # calculate location of total hours as insert rows moved it
+    table[
+        13 + len(rows) + len(tasks), 2
+    ].formula = f"of:=SUM(C13:C{13 + len(rows) - 1!s})"
+
+    # calculate location of total not billable hours as insert rows moved it
+    table[
+        13 + len(rows) + len(tasks) + 1, 2
+    ].formula = 'of:=SUMIF(F13:F{0};"no";C13:C{0})'.format(str(13 + len(rows) - 1))
+
+    return doc.tobytes()
+
+
+def build_workreports(
+    template: str, workreports: Iterable[WorkReport], processes: int = 0
+) -> Iterator[tuple[str, bytes]]:
+    """Build ods documents of work reports yielding name and content.
+
+    Documents are built in a pool of given number of processes. When no
+    processes are given they are built in the current process.
+    """
+    workreports = list(workreports)
+    if processes <= 1 or len(workreports) <= 1:
+        for workreport in workreports:
+            yield workreport.name, build_workreport(template, workreport)
+        return
+
+    # spawn processes as forking would share database connections
+    with ProcessPoolExecutor(
+        max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        docs = executor.map(
+            build_workreport, [template] * len(workreports), workreports
+        )
+        for workreport, doc in zip(workreports, docs):
+            yield workreport.name, doc
@@ -0,0 +1,203 @@
+"""Index of the roles of a user.
+
+Permissions and viewsets need to know on which customers, projects and tasks
+a user is assigned with which role and whom the user supervises. Instead of
+querying the assignees for every check, all assignments of a user are loaded
+in one query and checked in memory.
+
+Within a request the index is loaded only once. Optionally it is cached
+across requests for `settings.ROLE_CACHE_TIMEOUT` seconds, in which case a
+shared cache backend needs to be configured. Cached indexes are invalidated
+by bumping a version whenever assignees, tasks or supervisors change.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, F, IntegerField, Value
+from django.db.models.functions import Cast
+
+from timed.cache import clear_request_cache, get_request_cache
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable
+
+    from django.db.models import QuerySet
+
+    from timed.employment.models import User
+    from timed.projects.models import Project, Task
+
+ROLES = ("is_resource", "is_reviewer", "is_manager", "is_customer")
+VERSION_KEY = "roles.version"
+
+
+def invalidate() -> None:
+    """Invalidate role indexes of all users."""
+    clear_request_cache("roles")
+    if settings.ROLE_CACHE_TIMEOUT:
+        cache.set(VERSION_KEY, uuid4().hex, timeout=None)
+
+
+def _cached(name: str, user_id: int, loader: Callable[[int], Any]) -> Any:  # noqa: ANN401
+    request_cache = get_request_cache()
+    request_roles = (
+        {} if request_cache is None else request_cache.setdefault("roles", {})
+    )
+    if (name, user_id) in request_roles:
+        return request_roles[(name, user_id)]
+
+    timeout = settings.ROLE_CACHE_TIMEOUT
+    value = None
+    if timeout:
+        version = cache.get_or_set(VERSION_KEY, lambda: uuid4().hex, timeout=None)
+        key = f"roles.{version}.{name}.{user_id}"
+        value = cache.get(key)
+
+    if value is None:
+        value = loader(user_id)
+        if timeout:
+            cache.set(key, value, timeout=timeout)
+
+    request_roles[(name, user_id)] = value
+    return value
+
+
+def _load_users_assignments(
+    user_ids: Iterable[int],
+) -> dict[int, dict[str, dict[str, set[int]]]]:
+    from timed.projects.models import CustomerAssignee, ProjectAssignee, TaskAssignee
+
+    def assigned(
+        queryset: QuerySet, kind: str, object_id: str, project_id: str
+    ) -> QuerySet:
+        # annotations are selected after fields so all of them need to be
+        # annotated in the same order to be able to combine the queries
+        return queryset.annotate(
+            kind=Value(kind, output_field=CharField()),
+            object_id=F(object_id),
+            task_project_id=F(project_id)
+            if project_id
+            else Cast(Value(None), output_field=IntegerField()),
+        ).values_list("user_id", *ROLES, "kind", "object_id", "task_project_id")
+
+    rows = assigned(
+        CustomerAssignee.objects.filter(user_id__in=user_ids),
+        "customers",
+        "customer_id",
+        None,
+    ).union(
+        assigned(
+            ProjectAssignee.objects.filter(user_id__in=user_ids),
+            "projects",
+            "project_id",
+            None,
+        ),
+        assigned(
+            TaskAssignee.objects.filter(user_id__in=user_ids),
+            "tasks",
+            "task_id",
+            "task__project_id",
+        ),
+        all=True,
+    )
+
+    users_assignments = {}
+    for user_id in user_ids:
+        assignments = {
+            role: {"customers": set(), "projects": set(), "tasks": set()}
+            for role in ROLES
+        }
+        # projects on which user is assigned to a task
+        assignments["task_projects"] = {role: set() for role in ROLES}
+        users_assignments[user_id] = assignments
+
+    for user_id, *flags, kind, object_id, task_project_id in rows:
+        assignments = users_assignments[user_id]
+        for role, flag in zip(ROLES, flags):
+            if flag:
+                assignments[role][kind].add(object_id)
+                if task_project_id is not None:
+                    assignments["task_projects"][role].add(task_project_id)
+    return users_assignments
+
+
+def _load_assignments(user_id: int) -> dict[str, dict[str, set[int]]]:
+    return _load_users_assignments([user_id])[user_id]
+
+
+def prefetch(user_ids: Iterable[int]) -> None:
+    """Load assignments of given users in one query for the current request.
+
+    Checking roles of many users, e.g. when serializing a list of users,
+    then doesn't need a query per user.
+    """
+    request_cache = get_request_cache()
+    if request_cache is None:
+        return
+
+    request_roles = request_cache.setdefault("roles", {})
+    missing = {
+        user_id for user_id in user_ids if ("assignments", user_id) not in request_roles
+    }
+    if missing:
+        for user_id, assignments in _load_users_assignments(missing).items():
+            request_roles[("assignments", user_id)] = assignments
+
+
+def _load_supervisee_ids(user_id: int) -> set[int]:
+    from timed.employment.models import User
+
+    return set(User.objects.filter(supervisors=user_id).values_list("id", flat=True))
+
+
+class RoleIndex:
+    """Roles of a user."""
+
+    def __init__(self, user: User) -> None:
+        self.user_id = user.pk
+
+    @cached_property
+    def assignments(self) -> dict:
+        return _cached("assignments", self.user_id, _load_assignments)
+
+    @cached_property
+    def supervisee_ids(self) -> set[int]:
+        return _cached("supervisees", self.user_id, _load_supervisee_ids)
+
+    def has_role(self, role: str) -> bool:
+        """Check whether user is assigned anywhere with given role."""
+        return any(self.assignments[role].values())
+
+    def has_customer_role(self, role: str) -> bool:
+        """Check whether user is assigned to a customer with given role."""
+        return bool(self.assignments[role]["customers"])
+
+    def has_task_role(self, task: Task, role: str) -> bool:
+        """Check whether user has given role on task, its project or customer."""
+        assignments = self.assignments[role]
+        return (
+            task.pk in assignments["tasks"]
+            or task.project_id in assignments["projects"]
+            # avoid loading project when not needed
+            or bool(assignments["customers"])
+            and task.project.customer_id in assignments["customers"]
+        )
+
+    def has_project_role(self, project: Project, role: str) -> bool:
+        """Check whether user has given role on project, its customer or a task."""
+        assignments = self.assignments[role]
+        return (
+            project.pk in assignments["projects"]
+            or project.customer_id in assignments["customers"]
+            or project.pk in self.assignments["task_projects"][role]
+        )
+
+
+def get_roles(user: User) -> RoleIndex:
+    """Get role index of given user."""
+    return RoleIndex(user)
@@ -9,8 +9,16 @@ class TotalTimeRootMetaMixin:
 
     def get_root_meta(self, _resource, many):
         """Add total hours over whole result (not just page) to meta."""
-        if many:
+        # lists created in a batch are no filtered result
+        if many and self.context["request"].method == "GET":
             view = self.context["view"]
+            # keyset pagination aggregates total time together with the count
+            if hasattr(view.paginator, "total_time"):
+                total_time = view.paginator.total_time
+                if total_time is None:
+                    return {}
+                return {"total_time": duration_string(total_time)}
+
             queryset = view.filter_queryset(view.get_queryset())
             data = queryset.aggregate(total_time=Sum(self.duration_field))
             data["total_time"] = duration_string(data["total_time"] or timedelta(0))
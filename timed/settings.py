@@ -88,6 +88,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "timed.cache.RequestCacheMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_prometheus.middleware.PrometheusAfterMiddleware",
@@ -300,6 +301,10 @@ CUSTOMER_CENTER_EMAIL = env.str(
 SERVER_EMAIL = env.str("DJANGO_SERVER_EMAIL", default("root@localhost"))
 EMAIL_EXTRA_HEADERS = {"Auto-Submitted": "auto-generated"}
 
+# Queue emails in the database instead of sending them right away. Queued
+# emails are sent with the `send_outbox_emails` command.
+EMAIL_OUTBOX = env.bool("DJANGO_EMAIL_OUTBOX", default=False)
+
 
 def parse_admins(admins):
     """Parse env admins to django admins.
@@ -347,9 +352,55 @@ WORK_REPORT_PATH = env.str(
 WORK_REPORTS_EXPORT_MAX_COUNT = env.int(
     "DJANGO_WORK_REPORTS_EXPORT_MAX_COUNT", default=0
 )
+# Number of processes work reports are built with, 0 builds them in the
+# request process
+WORK_REPORT_PROCESSES = env.int("DJANGO_WORK_REPORT_PROCESSES", default=0)
 
 REPORTS_EXPORT_MAX_COUNT = env.int("DJANGO_REPORTS_EXPORT_MAX_COUNT", default=0)
 
+# Reports: Number of reports updated per transaction in a bulk update
+REPORT_BULK_UPDATE_CHUNK_SIZE = env.int(
+    "DJANGO_REPORT_BULK_UPDATE_CHUNK_SIZE", default=1000
+)
+
+# Reports: Maximum number of reports created with one batch request
+REPORT_BATCH_CREATE_MAX_SIZE = env.int(
+    "DJANGO_REPORT_BATCH_CREATE_MAX_SIZE", default=1000
+)
+
+# Reports: Sum up reports per day, user, task and flags to calculate
+# statistics. Rollup needs to be built with `rebuild_report_rollup` after
+# enabling.
+REPORT_ROLLUP = env.bool("DJANGO_REPORT_ROLLUP", default=False)
+
+# Reports: Time in seconds durations of tasks aggregated for customer,
+# project and task statistics are cached across requests. Needs a shared cache
+# backend, see `timed.changes`.
+STATISTIC_CACHE_TIMEOUT = env.int("DJANGO_STATISTIC_CACHE_TIMEOUT", default=0)
+
+# Reports: Number of rendered statistic responses kept in memory of each
+# process, 0 to disable. Needs a shared cache backend, see `timed.changes`.
+STATISTIC_RESPONSE_CACHE_SIZE = env.int(
+    "DJANGO_STATISTIC_RESPONSE_CACHE_SIZE", default=0
+)
+
+# Employment: Materialize worktime per user and day to calculate balances.
+# Ledger needs to be built with `rebuild_worktime_ledger` after enabling.
+WORKTIME_LEDGER = env.bool("DJANGO_WORKTIME_LEDGER", default=False)
+
+# Employment: Time in seconds employments of a user are cached across
+# requests. Within a request employments are always only loaded once.
+EMPLOYMENT_CACHE_TIMEOUT = env.int("DJANGO_EMPLOYMENT_CACHE_TIMEOUT", default=0)
+
+# Time in seconds roles of a user are cached across requests. Needs a shared
+# cache backend, see `timed.changes`.
+ROLE_CACHE_TIMEOUT = env.int("DJANGO_ROLE_CACHE_TIMEOUT", default=0)
+
+# Answer GET requests of reports, activities, attendances, absences and
+# balances with 304 Not Modified when nothing they are computed from has
+# changed. Needs a shared cache backend, see `timed.changes`.
+CONDITIONAL_REQUESTS = env.bool("DJANGO_CONDITIONAL_REQUESTS", default=False)
+
 # Tracking: Report fields which should be included in email (when report was
 # changed during verification)
 TRACKING_REPORT_VERIFIED_CHANGES = env.list(
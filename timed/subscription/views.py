@@ -16,7 +16,8 @@ from timed.permissions import (
     IsSuperUser,
 )
 from timed.projects.filters import ProjectFilterSet
-from timed.projects.models import CustomerAssignee, Project
+from timed.projects.models import Project
+from timed.roles import get_roles
 
 from . import filters, models, serializers
 
@@ -44,7 +45,7 @@ class SubscriptionProjectViewSet(viewsets.ReadOnlyModelViewSet):
         current_employment = user.get_active_employment()
 
         if current_employment is None or current_employment.is_external:
-            if CustomerAssignee.objects.filter(user=user, is_customer=True).exists():
+            if get_roles(user).has_customer_role("is_customer"):
                 return queryset.filter(
                     Q(
                         customer__customer_assignees__user=user,
@@ -0,0 +1,143 @@
+"""Benchmarks of the api endpoints.
+
+Benchmarks are skipped unless `TIMED_BENCHMARK` is set, as generating their
+data takes a while. Use `TIMED_BENCHMARK_USERS` and `TIMED_BENCHMARK_YEARS`
+to change the volume of generated data:
+
+    TIMED_BENCHMARK=1 pytest timed/tests/benchmarks
+
+Each benchmark measures query count, wall time and peak memory of an
+endpoint and fails when it regresses compared to the baseline stored in
+`baselines.json` for the generated volume. Query counts may not increase
+at all, wall time and memory by `TIMED_BENCHMARK_TOLERANCE` (defaults to
+50%) as they depend on the machine. Run with `TIMED_BENCHMARK_UPDATE` set
+to store new baselines.
+
+Query plan tests explain the queries of endpoints limited to a user, a
+project or a date range and fail when reports are scanned sequentially
+instead of using an index.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+from django.db import connection, reset_queries, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from timed.tests.benchmarks.data import generate
+
+if TYPE_CHECKING:
+    from typing import Callable
+
+    from django.http.response import HttpResponseBase
+
+BASELINES = Path(__file__).parent / "baselines.json"
+USERS = int(os.environ.get("TIMED_BENCHMARK_USERS", "500"))
+YEARS = int(os.environ.get("TIMED_BENCHMARK_YEARS", "5"))
+ROUNDS = int(os.environ.get("TIMED_BENCHMARK_ROUNDS", "3"))
+TOLERANCE = float(os.environ.get("TIMED_BENCHMARK_TOLERANCE", "0.5"))
+UPDATE = bool(os.environ.get("TIMED_BENCHMARK_UPDATE"))
+
+
+def pytest_collection_modifyitems(items):
+    if os.environ.get("TIMED_BENCHMARK"):
+        return
+
+    skip = pytest.mark.skip(reason="benchmarks only run with TIMED_BENCHMARK set")
+    for item in items:
+        if Path(item.path).is_relative_to(Path(__file__).parent):
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def benchmark_data(django_db_setup, django_db_blocker):  # noqa: ARG001
+    """Generate data shared by all benchmarks.
+
+    Data is generated in a transaction spanning the whole session, which is
+    rolled back afterwards.
+    """
+    with django_db_blocker.unblock(), transaction.atomic():
+        yield generate(USERS, YEARS)
+        transaction.set_rollback(True)
+
+
+@pytest.fixture
+def benchmark_client(db, benchmark_data):  # noqa: ARG001
+    client = APIClient()
+    client.force_authenticate(user=benchmark_data.superuser)
+    return client
+
+
+def _consume(response: HttpResponseBase) -> None:
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    data = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    yield data
+    if UPDATE:
+        BASELINES.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture
+def benchmark(request, baselines):
+    """Measure query count, wall time and peak memory of a request.
+
+    Returns a function which performs given request and fails when the
+    measurement regresses compared to the baseline.
+    """
+
+    def measure(perform: Callable[[], HttpResponseBase]) -> dict:
+        # warm up caches so only the request itself is measured
+        response = perform()
+        assert response.status_code < 400, response
+        _consume(response)
+
+        timings = []
+        for _ in range(ROUNDS):
+            # query log is limited, make sure it doesn't overflow
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                _consume(perform())
+                timings.append(time.perf_counter() - start)
+            query_count = len(queries)
+
+        tracemalloc.start()
+        try:
+            _consume(perform())
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = {
+            "queries": query_count,
+            "time": round(min(timings), 4),
+            "memory": peak,
+        }
+        scale = f"{USERS}x{YEARS}"
+        if UPDATE:
+            baselines.setdefault(scale, {})[request.node.name] = result
+            return result
+
+        baseline = baselines.get(scale, {}).get(request.node.name)
+        if baseline is None:
+            pytest.skip(f"No baseline for {request.node.name} with {scale} data")
+
+        assert result["queries"] <= baseline["queries"], result
+        assert result["time"] <= baseline["time"] * (1 + TOLERANCE), result
+        assert result["memory"] <= baseline["memory"] * (1 + TOLERANCE), result
+        return result
+
+    return measure
@@ -0,0 +1,188 @@
+"""Generation of benchmark data.
+
+Data is generated with the factories but inserted in bulk, so realistic
+volumes can be generated in reasonable time. A fixed seed is used so query
+counts are reproducible.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.db import connection
+
+from timed.employment.factories import (
+    AbsenceTypeFactory,
+    EmploymentFactory,
+    LocationFactory,
+    PublicHolidayFactory,
+    UserFactory,
+)
+from timed.employment.models import (
+    AbsenceType,
+    Employment,
+    Location,
+    PublicHoliday,
+    User,
+)
+from timed.projects.factories import (
+    BillingTypeFactory,
+    CostCenterFactory,
+    CustomerFactory,
+    ProjectFactory,
+    TaskFactory,
+)
+from timed.projects.models import BillingType, CostCenter, Customer, Project, Task
+from timed.tracking.factories import AbsenceFactory
+from timed.tracking.models import Absence, Report
+
+SEED = 1521188767
+BATCH_SIZE = 5000
+CUSTOMERS = 50
+PROJECTS_PER_CUSTOMER = 4
+TASKS_PER_PROJECT = 5
+ABSENCES_PER_YEAR = 25
+# data is generated for the years before, so it doesn't change over time
+END = date(2024, 1, 1)
+
+
+@dataclass
+class BenchmarkData:
+    """Generated benchmark data."""
+
+    start: date
+    end: date
+    superuser: User
+    users: list[User]
+    projects: list[Project]
+    """
+    Projects ordered by number of reports in the last month of data.
+    """
+
+
+def _insert(model: type, objects: list) -> list:
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+def _workdays(start: date, end: date) -> list[date]:
+    days = (start + timedelta(days=offset) for offset in range((end - start).days))
+    return [day for day in days if day.isoweekday() < 6]
+
+
+def generate(users: int, years: int) -> BenchmarkData:
+    """Generate benchmark data of given number of users and years."""
+    rng = random.Random(SEED)
+    end = END
+    start = date(end.year - years, 1, 1)
+    workdays = _workdays(start, end)
+
+    locations = _insert(Location, LocationFactory.build_batch(3))
+    _insert(
+        PublicHoliday,
+        [
+            PublicHolidayFactory.build(location=location, date=day)
+            for location in locations
+            for day in rng.sample(workdays, 10 * years)
+        ],
+    )
+    absence_types = _insert(
+        AbsenceType,
+        [
+            AbsenceTypeFactory.build(name="Vacation"),
+            AbsenceTypeFactory.build(name="Sick", fill_worktime=True),
+        ],
+    )
+
+    billing_type = _insert(BillingType, [BillingTypeFactory.build()])[0]
+    cost_center = _insert(CostCenter, [CostCenterFactory.build()])[0]
+    customers = _insert(
+        Customer,
+        [CustomerFactory.build(name=f"Customer {i}") for i in range(CUSTOMERS)],
+    )
+    projects = _insert(
+        Project,
+        [
+            ProjectFactory.build(
+                customer=customer, billing_type=billing_type, cost_center=cost_center
+            )
+            for customer in customers
+            for _ in range(PROJECTS_PER_CUSTOMER)
+        ],
+    )
+    tasks = _insert(
+        Task,
+        [
+            TaskFactory.build(project=project, cost_center=None)
+            for project in projects
+            for _ in range(TASKS_PER_PROJECT)
+        ],
+    )
+
+    superuser = UserFactory.build(username="benchmark", is_superuser=True)
+    generated_users = _insert(
+        User,
+        [superuser]
+        + [UserFactory.build(username=f"benchmark{i}") for i in range(users)],
+    )
+    _insert(
+        Employment,
+        [
+            EmploymentFactory.build(
+                user=user, location=rng.choice(locations), start_date=start
+            )
+            for user in generated_users
+        ],
+    )
+
+    last_month = date(end.year - 1, 12, 1)
+    last_month_reports = Counter()
+    reports = []
+    absences = []
+    for user in generated_users[1:]:
+        absence_days = set(rng.sample(workdays, ABSENCES_PER_YEAR * years))
+        for day in workdays:
+            if day in absence_days:
+                absences.append(
+                    AbsenceFactory.build(
+                        user=user, date=day, absence_type=rng.choice(absence_types)
+                    )
+                )
+                continue
+
+            for task in rng.sample(tasks, 2):
+                # building millions of reports with the factory is too slow
+                reports.append(
+                    Report(
+                        user=user,
+                        task=task,
+                        date=day,
+                        comment="",
+                        duration=timedelta(minutes=rng.randrange(15, 300, 15)),
+                        verified_by=superuser if day.year < end.year - 1 else None,
+                    )
+                )
+                if day >= last_month:
+                    last_month_reports[task.project] += 1
+        if len(reports) > BATCH_SIZE:
+            _insert(Report, reports)
+            reports = []
+    _insert(Report, reports)
+    _insert(Absence, absences)
+
+    # check deferred constraints once instead of at the end of every test
+    connection.check_constraints()
+    # update statistics of the query planner so queries are planned as
+    # they would be on a production database
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    return BenchmarkData(
+        start=start,
+        end=end - timedelta(days=1),
+        superuser=generated_users[0],
+        users=generated_users[1:],
+        projects=sorted(projects, key=lambda project: -last_month_reports[project]),
+    )
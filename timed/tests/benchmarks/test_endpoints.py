@@ -0,0 +1,88 @@
+from datetime import date
+from urllib.parse import urlencode
+
+import pytest
+from django.urls import reverse
+
+
+def _last_month(data):
+    return {"from_date": date(data.end.year, 12, 1), "to_date": data.end}
+
+
+@pytest.mark.parametrize(
+    ("url", "params"),
+    [
+        (
+            "report-list",
+            lambda data: {
+                "user": data.users[0].id,
+                "from_date": date(data.end.year, 1, 1),
+                "to_date": data.end,
+                "page[size]": 100,
+                "include": "task,user,verified_by",
+            },
+        ),
+        ("worktime-balance-list", lambda data: {"date": data.end}),
+        (
+            "absence-balance-list",
+            lambda data: {"user": data.users[0].id, "date": data.end},
+        ),
+        ("year-statistic-list", lambda _data: {}),
+        ("month-statistic-list", lambda _data: {}),
+        ("user-statistic-list", lambda _data: {"include": "user"}),
+        ("customer-statistic-list", lambda _data: {}),
+        (
+            "project-statistic-list",
+            lambda data: {**_last_month(data), "include": "customer"},
+        ),
+        (
+            "task-statistic-list",
+            lambda data: {"customer": data.projects[0].customer_id},
+        ),
+        (
+            "work-report-list",
+            lambda data: {**_last_month(data), "project": data.projects[0].id},
+        ),
+        (
+            "work-report-list",
+            lambda data: {
+                **_last_month(data),
+                "customer": data.projects[0].customer_id,
+            },
+        ),
+        ("report-export", lambda data: {**_last_month(data), "file_type": "csv"}),
+        ("report-export", lambda data: {**_last_month(data), "file_type": "xlsx"}),
+    ],
+    ids=[
+        "reports",
+        "worktime-balances",
+        "absence-balances",
+        "year-statistics",
+        "month-statistics",
+        "user-statistics",
+        "customer-statistics",
+        "project-statistics",
+        "task-statistics",
+        "work-reports-project",
+        "work-reports-customer",
+        "reports-export-csv",
+        "reports-export-xlsx",
+    ],
+)
+def test_benchmark_get(benchmark, benchmark_client, benchmark_data, url, params):
+    params = params(benchmark_data)
+    benchmark(lambda: benchmark_client.get(reverse(url), params))
+
+
+def test_benchmark_reports_bulk(benchmark, benchmark_client, benchmark_data):
+    url = reverse("report-bulk")
+    params = {
+        **_last_month(benchmark_data),
+        "user": benchmark_data.users[0].id,
+        "editable": 1,
+    }
+    data = {
+        "data": {"type": "report-bulks", "id": None, "attributes": {"verified": True}}
+    }
+
+    benchmark(lambda: benchmark_client.post(f"{url}?{urlencode(params)}", data))
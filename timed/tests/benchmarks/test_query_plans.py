@@ -0,0 +1,102 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from timed.notifications.management.commands.notify_reviewers_unverified import (
+    Command as NotifyReviewersUnverified,
+)
+from timed.tracking.models import Report
+
+# tables which may never be scanned sequentially by the queries below
+INDEXED_TABLES = ("tracking_report",)
+
+
+def _seq_scans(plan):
+    if plan.get("Node Type") == "Seq Scan" and plan["Relation Name"] in INDEXED_TABLES:
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+def assert_no_seq_scans(queries):
+    """Explain captured queries of reports and check for sequential scans."""
+    for query in queries:
+        sql = query["sql"]
+        if not sql.startswith("SELECT") or "tracking_report" not in sql:
+            continue
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+            (plan,) = cursor.fetchone()[0]
+        assert not list(_seq_scans(plan["Plan"])), (sql, json.dumps(plan, indent=2))
+
+
+def _last_month(data):
+    return {"from_date": data.end - timedelta(days=30), "to_date": data.end}
+
+
+@pytest.mark.parametrize(
+    ("url", "params"),
+    [
+        (
+            "report-list",
+            lambda data: {
+                **_last_month(data),
+                "user": data.users[0].id,
+                "page[size]": 100,
+            },
+        ),
+        (
+            "report-list",
+            lambda data: {**_last_month(data), "project": data.projects[0].id},
+        ),
+        (
+            "worktime-balance-list",
+            lambda data: {"user": data.users[0].id, "date": data.end},
+        ),
+        (
+            "absence-balance-list",
+            lambda data: {"user": data.users[0].id, "date": data.end},
+        ),
+        (
+            "absence-list",
+            lambda data: {**_last_month(data), "user": data.users[0].id},
+        ),
+    ],
+    ids=[
+        "reports-user",
+        "reports-project",
+        "worktime-balances",
+        "absence-balances",
+        "absences",
+    ],
+)
+def test_query_plan_get(benchmark_client, benchmark_data, url, params):
+    with CaptureQueriesContext(connection) as queries:
+        response = benchmark_client.get(reverse(url), params(benchmark_data))
+    assert response.status_code == 200
+    assert_no_seq_scans(queries)
+
+
+@pytest.mark.parametrize(
+    "queryset",
+    [
+        lambda data: NotifyReviewersUnverified()._get_unverified_reports(  # noqa: SLF001
+            date(data.end.year - 1, 12, 1), data.end
+        ),
+        lambda data: Report.objects.filter(
+            task__project=data.projects[0],
+            updated__range=[data.end - timedelta(days=7), data.end],
+        ),
+        lambda data: Report.objects.filter(user=data.users[0], date=data.end),
+    ],
+    ids=["unverified", "redmine", "user-day"],
+)
+def test_query_plan_queryset(benchmark_data, queryset):
+    with CaptureQueriesContext(connection) as queries:
+        list(queryset(benchmark_data))
+    assert_no_seq_scans(queries)
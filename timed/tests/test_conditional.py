@@ -0,0 +1,168 @@
+from datetime import date
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from timed.employment.factories import AbsenceCreditFactory, EmploymentFactory
+from timed.tracking.factories import (
+    ActivityFactory,
+    AttendanceFactory,
+    ReportFactory,
+)
+from timed.tracking.models import Report, update_reports
+
+
+@pytest.fixture(autouse=True)
+def _conditional_requests(settings):
+    settings.CONDITIONAL_REQUESTS = True
+
+
+def revalidate(client, url, response, **params):
+    return client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+def test_conditional_report_list(internal_employee_client):
+    user = internal_employee_client.user
+    report = ReportFactory.create(user=user)
+    url = reverse("report-list")
+
+    response = internal_employee_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert "private" in response["Cache-Control"]
+    assert response["Last-Modified"]
+
+    not_modified = revalidate(internal_employee_client, url, response)
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified["ETag"] == response["ETag"]
+
+    not_modified = internal_employee_client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    report.comment = "changed"
+    report.save()
+    changed = revalidate(internal_employee_client, url, response)
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed["ETag"] != response["ETag"]
+
+
+def test_conditional_report_list_user(internal_employee_client):
+    user = internal_employee_client.user
+    ReportFactory.create(user=user)
+    other_report = ReportFactory.create()
+    url = reverse("report-list")
+    response = internal_employee_client.get(url, {"user": user.id})
+
+    # reports of other users do not change the response
+    other_report.comment = "changed"
+    other_report.save()
+    not_modified = revalidate(internal_employee_client, url, response, user=user.id)
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # neither do other query params
+    response_all = revalidate(internal_employee_client, url, response)
+    assert response_all.status_code == status.HTTP_200_OK
+
+    # bulk updates do not send signals
+    update_reports(Report.objects.filter(user=user), {"comment": "bulk"})
+    changed = revalidate(internal_employee_client, url, response, user=user.id)
+    assert changed.status_code == status.HTTP_200_OK
+
+
+def test_conditional_report_moved(internal_employee_client):
+    user = internal_employee_client.user
+    report = ReportFactory.create(user=user)
+    url = reverse("report-list")
+    response = internal_employee_client.get(url, {"user": user.id})
+
+    report = Report.objects.get(pk=report.pk)
+    report.user = EmploymentFactory.create().user
+    report.save()
+    changed = revalidate(internal_employee_client, url, response, user=user.id)
+    assert changed.status_code == status.HTTP_200_OK
+
+
+def test_conditional_activity_detail(internal_employee_client):
+    activity = ActivityFactory.create(user=internal_employee_client.user)
+    other_activity = ActivityFactory.create(task=activity.task)
+    url = reverse("activity-detail", args=[activity.id])
+    response = internal_employee_client.get(url)
+
+    # activities of other users do not change the response
+    other_activity.delete()
+    not_modified = revalidate(internal_employee_client, url, response)
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    activity.task.name = "changed"
+    activity.task.save()
+    changed = revalidate(internal_employee_client, url, response)
+    assert changed.status_code == status.HTTP_200_OK
+
+
+def test_conditional_attendance_list(internal_employee_client):
+    url = reverse("attendance-list")
+    response = internal_employee_client.get(url)
+
+    AttendanceFactory.create(user=internal_employee_client.user)
+    changed = revalidate(internal_employee_client, url, response)
+    assert changed.status_code == status.HTTP_200_OK
+
+
+def test_conditional_absence_balance_list(internal_employee_client, absence_type):
+    user = internal_employee_client.user
+    url = reverse("absence-balance-list")
+    params = {"user": user.id, "date": "2017-01-01"}
+    response = internal_employee_client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+
+    not_modified = revalidate(internal_employee_client, url, response, **params)
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    AbsenceCreditFactory.create(user=user, absence_type=absence_type)
+    changed = revalidate(internal_employee_client, url, response, **params)
+    assert changed.status_code == status.HTTP_200_OK
+
+
+def test_conditional_not_found(internal_employee_client):
+    response = internal_employee_client.get(reverse("activity-detail", args=[1]))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.parametrize(
+    ("url", "pk"),
+    [
+        ("worktime-balance-detail", "{user}_2017-01-01"),
+        ("absence-balance-detail", "{user}_{absence_type}_2017-01-01"),
+    ],
+)
+def test_conditional_balance_detail(internal_employee_client, absence_type, url, pk):
+    user = internal_employee_client.user
+    other_report = ReportFactory.create(date=date(2017, 1, 1))
+    url = reverse(url, args=[pk.format(user=user.id, absence_type=absence_type.id)])
+    response = internal_employee_client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+
+    # changes of other users do not change the balance
+    other_report.delete()
+    not_modified = revalidate(internal_employee_client, url, response)
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    ReportFactory.create(user=user, task=other_report.task, date=date(2017, 1, 1))
+    changed = revalidate(internal_employee_client, url, response)
+    assert changed.status_code == status.HTTP_200_OK
+
+
+def test_conditional_balance_invalid_pk(internal_employee_client):
+    url = reverse("worktime-balance-detail", args=["user_2017-01-01"])
+    response = internal_employee_client.get(url)
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_conditional_disabled(internal_employee_client, settings):
+    settings.CONDITIONAL_REQUESTS = False
+    response = internal_employee_client.get(reverse("report-list"))
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header("ETag")
@@ -0,0 +1,78 @@
+from datetime import date, timedelta
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from timed.tracking.factories import ReportFactory
+
+
+def test_keyset_pagination(internal_employee_client, django_assert_num_queries):
+    # several reports on the same date to page within a date
+    reports = [
+        ReportFactory.create(
+            date=date(2017, 1, day % 3 + 1), duration=timedelta(hours=1)
+        )
+        for day in range(5)
+    ]
+    reports.sort(key=lambda report: (report.date, report.id))
+    url = reverse("report-list")
+
+    response = internal_employee_client.get(url, {"page[cursor]": "", "page[size]": 2})
+    assert response.status_code == status.HTTP_200_OK
+    json = response.json()
+    assert json["meta"] == {"pagination": {"count": 5}, "total-time": "05:00:00"}
+
+    ids = [entry["id"] for entry in json["data"]]
+    while json["links"]["next"]:
+        # permission checks, one query for count and total time and one for
+        # the page
+        with django_assert_num_queries(5):
+            response = internal_employee_client.get(json["links"]["next"])
+        assert response.status_code == status.HTTP_200_OK
+        json = response.json()
+        ids.extend(entry["id"] for entry in json["data"])
+
+    assert ids == [str(report.id) for report in reports]
+    assert json["links"]["first"].endswith("page%5Bcursor%5D=&page%5Bsize%5D=2")
+
+
+def test_keyset_pagination_skip_count(internal_employee_client):
+    ReportFactory.create_batch(2)
+    url = reverse("report-list")
+
+    response = internal_employee_client.get(
+        url, {"page[cursor]": "", "page[count]": "0"}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    json = response.json()
+    assert "meta" not in json
+    assert len(json["data"]) == 2
+    assert json["links"]["next"] is None
+
+
+def test_keyset_pagination_empty(internal_employee_client):
+    url = reverse("report-list")
+
+    response = internal_employee_client.get(url, {"page[cursor]": ""})
+    assert response.status_code == status.HTTP_200_OK
+    json = response.json()
+    assert json["meta"] == {"pagination": {"count": 0}, "total-time": "00:00:00"}
+    assert json["data"] == []
+
+
+@pytest.mark.parametrize(
+    ("params", "expected_status"),
+    [
+        ({"page[cursor]": "", "ordering": "duration"}, status.HTTP_400_BAD_REQUEST),
+        ({"page[cursor]": "invalid"}, status.HTTP_404_NOT_FOUND),
+        ({"page[cursor]": "WyJpbnZhbGlkIiwgIjEiXQ=="}, status.HTTP_404_NOT_FOUND),
+        ({"page[cursor]": "WzFd"}, status.HTTP_404_NOT_FOUND),
+        ({"page[number]": 1, "page[size]": 1}, status.HTTP_200_OK),
+    ],
+)
+def test_keyset_pagination_invalid(internal_employee_client, params, expected_status):
+    url = reverse("report-list")
+
+    response = internal_employee_client.get(url, params)
+    assert response.status_code == expected_status
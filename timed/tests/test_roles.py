@@ -0,0 +1,82 @@
+import pytest
+
+from timed.cache import request_cache
+from timed.employment.factories import UserFactory
+from timed.projects.factories import (
+    CustomerAssigneeFactory,
+    ProjectAssigneeFactory,
+    ProjectFactory,
+    TaskAssigneeFactory,
+    TaskFactory,
+)
+from timed.roles import get_roles, prefetch
+
+
+@pytest.mark.django_db()
+def test_roles(django_assert_num_queries):
+    user = UserFactory.create()
+    customer_assignee = CustomerAssigneeFactory.create(user=user, is_customer=True)
+    project_assignee = ProjectAssigneeFactory.create(user=user, is_reviewer=True)
+    task_assignee = TaskAssigneeFactory.create(user=user, is_manager=True)
+    supervisee = UserFactory.create()
+    supervisee.supervisors.add(user)
+
+    customer_task = TaskFactory.create(project__customer=customer_assignee.customer)
+    project_task = TaskFactory.create(project=project_assignee.project)
+    other_task = TaskFactory.create()
+
+    with django_assert_num_queries(2):
+        roles = get_roles(user)
+        assert roles.has_customer_role("is_customer")
+        assert roles.has_role("is_reviewer")
+        assert not roles.has_role("is_resource")
+        assert roles.supervisee_ids == {supervisee.id}
+
+        assert roles.has_task_role(project_task, "is_reviewer")
+        assert not roles.has_task_role(other_task, "is_reviewer")
+        assert roles.has_task_role(task_assignee.task, "is_manager")
+        assert roles.has_project_role(task_assignee.task.project, "is_manager")
+        assert not roles.has_project_role(project_task.project, "is_manager")
+    assert roles.has_task_role(customer_task, "is_customer")
+
+
+@pytest.mark.django_db()
+@pytest.mark.parametrize("cache_timeout", [0, 60])
+def test_roles_invalidation(settings, django_assert_num_queries, cache_timeout):
+    settings.ROLE_CACHE_TIMEOUT = cache_timeout
+    user = UserFactory.create()
+    task = TaskFactory.create()
+    project = ProjectFactory.create()
+
+    with request_cache():
+        assert not get_roles(user).has_role("is_manager")
+        assert not get_roles(user).supervisee_ids
+
+        TaskAssigneeFactory.create(user=user, task=task, is_manager=True)
+        UserFactory.create().supervisors.add(user)
+        assert get_roles(user).has_project_role(task.project, "is_manager")
+        assert get_roles(user).supervisee_ids
+
+        task.project = project
+        task.save()
+        assert get_roles(user).has_project_role(project, "is_manager")
+
+    if cache_timeout:
+        with django_assert_num_queries(0):
+            assert get_roles(user).has_project_role(project, "is_manager")
+
+
+@pytest.mark.django_db()
+def test_roles_prefetch(django_assert_num_queries):
+    reviewer, other = UserFactory.create_batch(2)
+    TaskAssigneeFactory.create(user=reviewer, is_reviewer=True)
+
+    # roles are only prefetched within a request
+    with django_assert_num_queries(0):
+        prefetch([reviewer.id, other.id])
+
+    with request_cache(), django_assert_num_queries(1):
+        prefetch([reviewer.id, other.id])
+        prefetch([reviewer.id])
+        assert get_roles(reviewer).has_role("is_reviewer")
+        assert not get_roles(other).has_role("is_reviewer")
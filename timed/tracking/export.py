@@ -0,0 +1,58 @@
+"""Columns of exported reports."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.db.models import Case, CharField, F, Value, When
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+    from timed.tracking.models import Report
+
+# field, heading of spreadsheets and kind of arrow column
+COLUMNS = [
+    ("date", "Date", "date"),
+    ("duration", "Duration", "seconds"),
+    ("task__project__customer__name", "Customer", "category"),
+    ("task__project__name", "Project", "category"),
+    ("task__name", "Task", "category"),
+    ("user__username", "User", "category"),
+    ("comment", "Comment", "string"),
+    ("billing_type", "Billing Type", "category"),
+    ("cost_center", "Cost Center", "category"),
+]
+
+HEADINGS = [heading for _field, heading, _kind in COLUMNS]
+
+ARROW_COLUMNS = [
+    (heading.lower().replace(" ", "_"), kind) for _field, heading, kind in COLUMNS
+]
+
+
+def export_rows(queryset: QuerySet[Report]) -> QuerySet:
+    """Get values of exported columns of given reports."""
+    queryset = queryset.annotate(
+        cost_center=Case(
+            # Task cost center has precedence over project cost center
+            When(task__cost_center__isnull=False, then=F("task__cost_center__name")),
+            When(
+                task__project__cost_center__isnull=False,
+                then=F("task__project__cost_center__name"),
+            ),
+            default=Value(""),
+            output_field=CharField(),
+        )
+    )
+    queryset = queryset.annotate(
+        billing_type=Case(
+            When(
+                task__project__billing_type__isnull=False,
+                then=F("task__project__billing_type__name"),
+            ),
+            default=Value(""),
+            output_field=CharField(),
+        )
+    )
+    return queryset.values_list(*(field for field, _heading, _kind in COLUMNS))
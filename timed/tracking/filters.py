@@ -10,13 +10,15 @@ from django_filters.constants import EMPTY_VALUES
 from django_filters.rest_framework import (
     BaseInFilter,
     BooleanFilter,
+    CharFilter,
     DateFilter,
     Filter,
     FilterSet,
+    IsoDateTimeFilter,
     NumberFilter,
 )
 
-from timed.projects.models import CustomerAssignee, ProjectAssignee, TaskAssignee
+from timed.projects.models import EffectiveRole
 from timed.tracking import models
 
 if TYPE_CHECKING:
@@ -70,6 +72,7 @@ class ActivityFilterSet(FilterSet):
 
     active = ActivityActiveFilter()
     day = DateFilter(field_name="date")
+    updated_since = IsoDateTimeFilter(field_name="updated", lookup_expr="gte")
 
     class Meta:
         """Meta information for the activity filter set."""
@@ -78,6 +81,7 @@ class ActivityFilterSet(FilterSet):
         fields = (
             "active",
             "day",
+            "updated_since",
         )
 
 
@@ -112,6 +116,7 @@ class ReportFilterSet(FilterSet):
     user = NumberFilter(field_name="user_id")
     cost_center = NumberFilter(method="filter_cost_center")
     rejected = NumberFilter(field_name="rejected")
+    updated_since = IsoDateTimeFilter(field_name="updated", lookup_expr="gte")
 
     def filter_has_reviewer(
         self, queryset: QuerySet[models.Report], _name: str, value: int
@@ -119,54 +124,11 @@ class ReportFilterSet(FilterSet):
         if not value:  # pragma: no cover
             return queryset
 
-        # reports in which user is customer assignee and responsible reviewer
-        reports_customer_assignee_is_reviewer = queryset.filter(
-            Q(
-                task__project__customer_id__in=CustomerAssignee.objects.filter(
-                    is_reviewer=True, user_id=value
-                ).values("customer_id")
-            )
-        ).exclude(
-            Q(
-                task__project_id__in=ProjectAssignee.objects.filter(
-                    is_reviewer=True
-                ).values("project_id")
-            )
-            | Q(
-                task_id__in=TaskAssignee.objects.filter(is_reviewer=True).values(
-                    "task_id"
-                )
-            )
-        )
-
-        # reports in which user is project assignee and responsible reviewer
-        reports_project_assignee_is_reviewer = queryset.filter(
-            Q(
-                task__project_id__in=ProjectAssignee.objects.filter(
-                    is_reviewer=True, user_id=value
-                ).values("project_id")
-            )
-        ).exclude(
-            Q(
-                task_id__in=TaskAssignee.objects.filter(is_reviewer=True).values(
-                    "task_id"
-                )
-            )
-        )
-
-        # reports in which user task assignee and responsible reviewer
-        reports_task_assignee_is_reviewer = queryset.filter(
-            Q(
-                task_id__in=TaskAssignee.objects.filter(
-                    is_reviewer=True, user_id=value
-                ).values("task_id")
-            )
-        )
-
-        return (
-            reports_customer_assignee_is_reviewer
-            | reports_project_assignee_is_reviewer
-            | reports_task_assignee_is_reviewer
+        # reports in which user is the responsible reviewer
+        return queryset.filter(
+            task__in=EffectiveRole.objects.filter(
+                user_id=value, role=EffectiveRole.REVIEWER, is_responsible=True
+            ).values("task")
         )
 
     def filter_editable(
@@ -182,16 +144,9 @@ class ReportFilterSet(FilterSet):
             # avoid duplicates by using subqueries instead of joins
             Q(user__in=user.supervisees.values("id"))
             | Q(
-                task__task_assignees__user=user,
-                task__task_assignees__is_reviewer=True,
-            )
-            | Q(
-                task__project__project_assignees__user=user,
-                task__project__project_assignees__is_reviewer=True,
-            )
-            | Q(
-                task__project__customer__customer_assignees__user=user,
-                task__project__customer__customer_assignees__is_reviewer=True,
+                task__in=EffectiveRole.objects.filter(
+                    user=user, role=EffectiveRole.REVIEWER
+                ).values("task")
             )
             | Q(user=user)
         )
@@ -205,7 +160,7 @@ class ReportFilterSet(FilterSet):
             if user.is_accountant:
                 return queryset.filter(unfinished_filter)
             # only owner, reviewer or supervisor may change unverified reports
-            return queryset.filter(editable_filter).distinct()
+            return queryset.filter(editable_filter)
 
         # not editable
         if user.is_superuser:
@@ -245,6 +200,7 @@ class ReportFilterSet(FilterSet):
             "review",
             "reviewer",
             "billing_type",
+            "updated_since",
         )
 
 
@@ -253,6 +209,7 @@ class AbsenceFilterSet(FilterSet):
 
     from_date = DateFilter(field_name="date", lookup_expr="gte")
     to_date = DateFilter(field_name="date", lookup_expr="lte")
+    updated_since = IsoDateTimeFilter(field_name="updated", lookup_expr="gte")
 
     class Meta:
         """Meta information for the absence filter set."""
@@ -263,4 +220,21 @@ class AbsenceFilterSet(FilterSet):
             "from_date",
             "to_date",
             "user",
+            "updated_since",
+        )
+
+
+class TombstoneFilterSet(FilterSet):
+    """Filter set for the tombstones endpoint."""
+
+    type = CharFilter(field_name="resource_type")
+    updated_since = IsoDateTimeFilter(field_name="deleted", lookup_expr="gte")
+
+    class Meta:
+        """Meta information for the tombstone filter set."""
+
+        model = models.Tombstone
+        fields = (
+            "type",
+            "updated_since",
         )
@@ -0,0 +1,57 @@
+from datetime import date
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from timed.export import (
+    ARROW_FILE_TYPES,
+    EXPORT_CHUNK_SIZE,
+    arrow_available,
+    write_arrow,
+)
+from timed.tracking.export import ARROW_COLUMNS, export_rows
+from timed.tracking.models import Report
+
+
+class Command(BaseCommand):
+    """Export reports to an Apache Arrow stream or a Parquet file.
+
+    Reports are fetched and written in batches, so exports of many years
+    of reports don't need to be kept in memory. Needs `pyarrow`.
+    """
+
+    help = "Export reports to an Arrow stream or a Parquet file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to write reports to.")
+        parser.add_argument(
+            "--file-type",
+            choices=list(ARROW_FILE_TYPES),
+            default="parquet",
+            help="Format of the file.",
+        )
+        parser.add_argument(
+            "--from-date",
+            type=date.fromisoformat,
+            help="Only export reports of this date or later.",
+        )
+        parser.add_argument(
+            "--to-date",
+            type=date.fromisoformat,
+            help="Only export reports of this date or earlier.",
+        )
+
+    def handle(self, *args, **options):
+        if not arrow_available():
+            msg = "Exporting reports needs pyarrow to be installed."
+            raise CommandError(msg)
+
+        queryset = Report.objects.order_by("date", "id")
+        if options["from_date"]:
+            queryset = queryset.filter(date__gte=options["from_date"])
+        if options["to_date"]:
+            queryset = queryset.filter(date__lte=options["to_date"])
+
+        rows = export_rows(queryset).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        with Path(options["path"]).open("wb") as file:
+            write_arrow(rows, ARROW_COLUMNS, file, options["file_type"])
@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from timed.tracking.partitions import partition
+
+
+class Command(BaseCommand):
+    """Partition reports by year on their date.
+
+    The first run converts the reports table into a partitioned table,
+    which locks reports while they are copied. Needs to be run at least
+    once a year to create partitions of the following years.
+    """
+
+    help = "Partition reports by year and create partitions of following years."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--years-ahead",
+            type=int,
+            default=1,
+            help="Number of years after the current year to create partitions of.",
+        )
+
+    def handle(self, *args, **options):
+        partition(date.today().year + options["years_ahead"])
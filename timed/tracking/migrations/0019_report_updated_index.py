@@ -0,0 +1,20 @@
+# Generated by Django 4.2.11 on 2026-10-17 04:35
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # index is created without locking writes to reports
+    atomic = False
+
+    dependencies = [
+        ('tracking', '0018_tombstone'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='report',
+            index=models.Index(fields=['updated'], name='tracking_re_updated_d96622_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.11 on 2026-10-17 04:48
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # indexes are created without locking writes to the tables
+    atomic = False
+
+    dependencies = [
+        ('tracking', '0019_report_updated_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='activity',
+            index=models.Index(fields=['user', 'date'], name='tracking_activity_user_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='activity',
+            index=models.Index(condition=models.Q(('to_time__isnull', True)), fields=['user'], name='tracking_activity_running_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='report',
+            index=models.Index(fields=['user', 'date'], include=('duration',), name='tracking_report_user_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='report',
+            index=models.Index(fields=['task', 'date'], name='tracking_report_task_date_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='report',
+            index=models.Index(condition=models.Q(('verified_by__isnull', True)), fields=['date'], name='tracking_report_unverified_idx'),
+        ),
+    ]
@@ -7,8 +7,14 @@ from typing import TYPE_CHECKING
 
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from timed import changes
 
 if TYPE_CHECKING:
+    from typing import Iterable
+
     from timed.employment.models import Employment
 
 
@@ -36,12 +42,23 @@ class Activity(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="activities"
     )
+    updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         """Meta informations for the activity model."""
 
         verbose_name_plural = "activities"
-        indexes = (models.Index(fields=["date"]),)
+        indexes = (
+            models.Index(fields=["date"]),
+            models.Index(fields=["updated"]),
+            models.Index(fields=["user", "date"], name="tracking_activity_user_idx"),
+            # a user can only have one running activity
+            models.Index(
+                fields=["user"],
+                condition=models.Q(to_time__isnull=True),
+                name="tracking_activity_running_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         """Represent the model as a string."""
@@ -68,6 +85,13 @@ class Attendance(models.Model):
         return f"{self.user}: {self.date:%Y-%m-%d} {self.from_time:%H:%M} - {self.to_time:%H:%M}"
 
 
+def round_duration(duration: timedelta) -> timedelta:
+    """Round duration of a report to the nearest 15 minutes, but at least 15 minutes."""
+    return timedelta(
+        seconds=max(15 * 60, round(duration.seconds / (15 * 60)) * (15 * 60))
+    )
+
+
 class Report(models.Model):
     """Report model.
 
@@ -96,10 +120,29 @@ class Report(models.Model):
     rejected = models.BooleanField(default=False)
     remaining_effort = models.DurationField(default=timedelta(0), null=True)
 
+    # values of fields as loaded from or last saved to the database
+    _original_values: dict | None = None
+
     class Meta:
         """Meta information for the report model."""
 
-        indexes = (models.Index(fields=["date"]),)
+        indexes = (
+            models.Index(fields=["date"]),
+            models.Index(fields=["updated"]),
+            # worktime is summed up per user and date range
+            models.Index(
+                fields=["user", "date"],
+                include=["duration"],
+                name="tracking_report_user_date_idx",
+            ),
+            models.Index(fields=["task", "date"], name="tracking_report_task_date_idx"),
+            # reviewers are notified about unverified reports of a date range
+            models.Index(
+                fields=["date"],
+                condition=models.Q(verified_by__isnull=True),
+                name="tracking_report_unverified_idx",
+            ),
+        )
 
     def __str__(self) -> str:
         """Represent the model as a string."""
@@ -111,11 +154,109 @@ class Report(models.Model):
         This rounds the duration of the report to the nearest 15 minutes.
         However, the duration must at least be 15 minutes long.
         """
-        self.duration = timedelta(
-            seconds=max(15 * 60, round(self.duration.seconds / (15 * 60)) * (15 * 60))
-        )
+        self.duration = round_duration(self.duration)
 
         super().save(*args, **kwargs)
+        self._remember_values(kwargs.get("update_fields"))
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_values()  # noqa: SLF001
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None) -> None:  # noqa: ANN001
+        super().refresh_from_db(using, fields)
+        self._remember_values(fields)
+
+    def _remember_values(self, fields: Iterable[str] | None = None) -> None:
+        if self._original_values is None:
+            self._original_values = {}
+        if fields is None:
+            attnames = [field.attname for field in self._meta.concrete_fields]
+        else:
+            attnames = [self._meta.get_field(field).attname for field in fields]
+        # deferred fields are not loaded and therefore not remembered
+        self._original_values.update(
+            (attname, self.__dict__[attname])
+            for attname in attnames
+            if attname in self.__dict__
+        )
+
+    def original_values(self, *fields: str) -> dict | None:
+        """Get values of given fields before the report was changed.
+
+        Values are remembered when the report is loaded or saved, so changes
+        can be detected in signals without fetching the report again. Only
+        fields which were deferred when loading are fetched.
+
+        Returns `None` for reports which have not been saved yet.
+        """
+        if self._original_values is None:
+            return None
+
+        missing = [field for field in fields if field not in self._original_values]
+        if missing:
+            self._original_values.update(
+                Report.objects.filter(pk=self.pk).values(*missing).get()
+            )
+        return {field: self._original_values[field] for field in fields}
+
+
+def update_reports(reports: models.QuerySet[Report], fields: dict) -> None:
+    """Update given fields of reports in chunks.
+
+    Reports are selected before the first chunk is updated, so reports which
+    no longer match the given queryset after a chunk has been updated are
+    still updated. Each chunk is updated with its own statement, so rows are
+    not locked until all reports have been updated.
+    """
+    chunk_size = settings.REPORT_BULK_UPDATE_CHUNK_SIZE
+    ids, user_ids = [], set()
+    for pk, user_id in reports.order_by("pk").values_list("pk", "user_id"):
+        ids.append(pk)
+        user_ids.add(user_id)
+    # updates do not set auto_now fields
+    fields = {**fields, "updated": timezone.now()}
+    for start in range(0, len(ids), chunk_size):
+        Report.objects.filter(pk__in=ids[start : start + chunk_size]).update(**fields)
+    changes.changed(Report, user_ids)
+
+
+class AbsenceQuerySet(models.QuerySet):
+    """Custom queryset for absences."""
+
+    def with_reported_time(self) -> AbsenceQuerySet:
+        """Annotate time reported by the user on the day of the absence.
+
+        Reported time is summed up in a grouped subquery so fill worktime
+        absences do not need a query each to calculate their duration.
+        """
+        reports = (
+            Report.objects.filter(
+                user=models.OuterRef("user"), date=models.OuterRef("date")
+            )
+            .order_by()
+            .values("user", "date")
+            .annotate(total=models.Sum("duration"))
+            .values("total")
+        )
+        return self.annotate(
+            reported_time=Coalesce(
+                models.Subquery(reports),
+                models.Value(timedelta()),
+                output_field=models.DurationField(),
+            )
+        )
+
+    def with_duration(self) -> list[Absence]:
+        """Evaluate absences with their duration set.
+
+        See `calculate_durations`.
+        """
+        absences = list(self.with_reported_time().select_related("absence_type"))
+        calculate_durations(absences)
+        return absences
 
 
 class Absence(models.Model):
@@ -133,6 +274,9 @@ class Absence(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="absences"
     )
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = AbsenceQuerySet.as_manager()
 
     class Meta:
         """Meta informations for the absence model."""
@@ -141,6 +285,7 @@ class Absence(models.Model):
             "date",
             "user",
         )
+        indexes = (models.Index(fields=["updated"]),)
 
     def __str__(self) -> str:
         """Represent the model as a string."""
@@ -156,12 +301,102 @@ class Absence(models.Model):
         if not self.absence_type.fill_worktime:
             return employment.worktime_per_day
 
-        reports = Report.objects.filter(date=self.date, user=self.user_id)
-        data = reports.aggregate(reported_time=models.Sum("duration"))
-        reported_time = data["reported_time"] or timedelta()
+        # reported time might already be annotated by `with_reported_time`
+        reported_time = getattr(self, "reported_time", None)
+        if reported_time is None:
+            reports = Report.objects.filter(date=self.date, user=self.user_id)
+            data = reports.aggregate(reported_time=models.Sum("duration"))
+            reported_time = data["reported_time"] or timedelta()
         if reported_time >= employment.worktime_per_day:
             # prevent negative duration in case user already
             # reported more time than worktime per day
             return timedelta()
 
         return employment.worktime_per_day - reported_time
+
+
+def calculate_durations(absences: list[Absence]) -> None:
+    """Set `duration` on each of given absences.
+
+    Employments of all users are loaded in one query and looked up in
+    memory. Reported time of fill worktime absences which have not been
+    annotated with `AbsenceQuerySet.with_reported_time` is loaded in one
+    grouped query. Absences on unemployed days have no duration.
+    """
+    from timed.employment.models import Employment
+
+    if not absences:
+        return
+
+    dates = [absence.date for absence in absences]
+    employments = {}
+    for employment in Employment.objects.filter(
+        models.Q(end_date__gte=min(dates)) | models.Q(end_date__isnull=True),
+        user_id__in={absence.user_id for absence in absences},
+        start_date__lte=max(dates),
+    ):
+        employments.setdefault(employment.user_id, []).append(employment)
+
+    missing = [
+        absence
+        for absence in absences
+        if absence.absence_type.fill_worktime
+        and getattr(absence, "reported_time", None) is None
+    ]
+    if missing:
+        reported_times = {
+            (entry["user_id"], entry["date"]): entry["total"]
+            for entry in Report.objects.filter(
+                user_id__in={absence.user_id for absence in missing},
+                date__in={absence.date for absence in missing},
+            )
+            .order_by()
+            .values("user_id", "date")
+            .annotate(total=models.Sum("duration"))
+        }
+        for absence in missing:
+            absence.reported_time = reported_times.get(
+                (absence.user_id, absence.date), timedelta()
+            )
+
+    for absence in absences:
+        employment = next(
+            (
+                employment
+                for employment in employments.get(absence.user_id, [])
+                if employment.start_date <= absence.date
+                and (employment.end_date is None or absence.date <= employment.end_date)
+            ),
+            None,
+        )
+        absence.duration = (
+            absence.calculate_duration(employment) if employment else timedelta()
+        )
+
+
+class Tombstone(models.Model):
+    """Tombstone of a deleted report, absence or activity.
+
+    Clients syncing changes with the `updated_since` filter get deleted
+    objects from tombstones deleted since their last sync.
+    """
+
+    resource_type = models.CharField(max_length=20)
+    object_id = models.PositiveIntegerField()
+    # tombstones are kept when their user is deleted
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    deleted = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        """Meta informations for the tombstone model."""
+
+        indexes = (models.Index(fields=["deleted"]),)
+
+    def __str__(self) -> str:
+        """Represent the model as a string."""
+        return f"{self.resource_type} {self.object_id}"
@@ -0,0 +1,159 @@
+"""Yearly range partitioning of reports on their date.
+
+Partitioning is optional and set up with the `partition_reports` command,
+which converts the reports table into a table partitioned by year. Queries
+of a date range then only scan the partitions of the years in the range.
+
+Postgres requires the partition key to be part of the primary key, so the
+primary key of the partitioned table consists of id and date. Ids are still
+unique, as they are generated by one sequence.
+
+Partitions need to exist before reports of a year are created, otherwise
+reports are stored in the default partition. Creating a partition moves
+reports of its year out of the default partition.
+
+Indexes can't be created concurrently on partitioned tables, so migrations
+adding indexes to reports need to use `AddIndex` instead of
+`AddIndexConcurrently`.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import TYPE_CHECKING
+
+from django.db import connection, transaction
+
+if TYPE_CHECKING:
+    from django.db.backends.utils import CursorWrapper
+
+TABLE = "tracking_report"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def is_partitioned(cursor: CursorWrapper) -> bool:
+    cursor.execute(
+        "SELECT EXISTS (SELECT FROM pg_partitioned_table WHERE partrelid = %s::regclass)",
+        [TABLE],
+    )
+    return cursor.fetchone()[0]
+
+
+def partition_years(cursor: CursorWrapper) -> list[int]:
+    """Get years reports are partitioned in."""
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = %s::regclass",
+        [TABLE],
+    )
+    prefix = f"{TABLE}_"
+    return sorted(
+        int(name.removeprefix(prefix))
+        for (name,) in cursor.fetchall()
+        if name.removeprefix(prefix).isdigit()
+    )
+
+
+def _create_partition(cursor: CursorWrapper, table: str, year: int) -> None:
+    name = f"{TABLE}_{year}"
+    start, end = date(year, 1, 1).isoformat(), date(year + 1, 1, 1).isoformat()
+    cursor.execute(
+        f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    cursor.execute(
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "  # noqa: S608
+        f"WHERE date >= %s AND date < %s RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved",
+        [start, end],
+    )
+    cursor.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    )
+
+
+def _convert(cursor: CursorWrapper) -> None:
+    """Convert reports table into a table partitioned by year.
+
+    Reports are copied into a new partitioned table, which replaces the
+    reports table with the same indexes and foreign keys.
+    """
+    cursor.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+    # reports table can't be dropped with pending checks of deferred foreign
+    # keys of reports changed in the same transaction
+    cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s "
+        "AND indexname <> %s",
+        [TABLE, f"{TABLE}_pkey"],
+    )
+    indexes = [indexdef for (indexdef,) in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f'",
+        [TABLE],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(f"SELECT min(date), max(date) FROM {TABLE}")  # noqa: S608
+    first, last = cursor.fetchone()
+    # ids of databases created before Django 4.1 are serial instead of identity
+    cursor.execute(
+        "SELECT attidentity <> '', pg_get_serial_sequence(%s, 'id') "
+        "FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'id'",
+        [TABLE, TABLE],
+    )
+    identity, sequence = cursor.fetchone()
+
+    table = f"{TABLE}_partitioned"
+    cursor.execute(
+        f"CREATE TABLE {table} (LIKE {TABLE} INCLUDING DEFAULTS "
+        "INCLUDING IDENTITY INCLUDING CONSTRAINTS) PARTITION BY RANGE (date)"
+    )
+    cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {table} DEFAULT")
+    if first is not None:
+        for year in range(first.year, last.year + 1):
+            _create_partition(cursor, table, year)
+    cursor.execute(f"INSERT INTO {table} SELECT * FROM {TABLE}")  # noqa: S608
+    if not identity:
+        # the copied default of a serial id uses the sequence of the reports
+        # table, which would be dropped together with the table
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+    cursor.execute(f"DROP TABLE {TABLE}")
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {TABLE}")
+
+    if identity:
+        # new identity sequence continues after the copied ids
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+        (sequence,) = cursor.fetchone()
+        cursor.execute(f"ALTER SEQUENCE {sequence} RENAME TO {TABLE}_id_seq")
+    cursor.execute(
+        f"SELECT setval('{TABLE}_id_seq', coalesce(max(id), 0) + 1, false) "  # noqa: S608
+        f"FROM {TABLE}"
+    )
+
+    cursor.execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id, date)"
+    )
+    for indexdef in indexes:
+        cursor.execute(indexdef)
+    for name, definition in foreign_keys:
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+
+def partition(until: int) -> None:
+    """Partition reports by year and create partitions up to given year.
+
+    The reports table is converted when it isn't partitioned yet, which
+    locks it until all reports are copied.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        if not is_partitioned(cursor):
+            _convert(cursor)
+
+        years = partition_years(cursor)
+        first = years[0] if years else date.today().year
+        for year in range(first, until + 1):
+            if year not in years:
+                _create_partition(cursor, TABLE, year)
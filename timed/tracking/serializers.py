@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
-from datetime import date, timedelta
+from datetime import date
+from functools import cached_property
 from typing import TYPE_CHECKING
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import BooleanField, Case, Q, When
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Max, Min, Q, When
+from django.db.models.functions import Cast
 from django.utils.duration import duration_string
 from django.utils.translation import gettext_lazy as _
+from rest_framework.serializers import ListSerializer
 from rest_framework_json_api import relations, serializers
 from rest_framework_json_api.relations import ResourceRelatedField
 from rest_framework_json_api.serializers import (
@@ -18,11 +23,15 @@ from rest_framework_json_api.serializers import (
     ValidationError,
 )
 
+from timed import changes
+from timed.employment import ledger
 from timed.employment.models import AbsenceType, Employment, PublicHoliday, User
 from timed.employment.relations import CurrentUserResourceRelatedField
 from timed.projects.models import Customer, Project, Task
+from timed.reports import rollup
 from timed.serializers import TotalTimeRootMetaMixin
 from timed.tracking import models
+from timed.tracking.signals import update_remaining_effort
 
 if TYPE_CHECKING:
     from typing import ClassVar
@@ -96,10 +105,71 @@ class AttendanceSerializer(ModelSerializer):
         )
 
 
+class TaskResourceRelatedField(ResourceRelatedField):
+    """Task field looking up tasks fetched in advance by a list serializer."""
+
+    def to_internal_value(self, data):
+        tasks = self.context.get("tasks", {})
+        if isinstance(data, dict) and data.get("type") == "tasks":
+            task = tasks.get(str(data.get("id")))
+            if task is not None:
+                return task
+
+        return super().to_internal_value(data)
+
+
+class ReportListSerializer(ListSerializer):
+    """Serializer creating a list of reports in bulk.
+
+    Tasks of all reports are fetched at once and validation of the reports
+    only queries once per distinct task. Reports are inserted with
+    `bulk_create`, so everything signals do on saving a report is done for
+    all reports at once.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            ids = {
+                str(item["task"].get("id"))
+                for item in data
+                if isinstance(item, dict) and isinstance(item.get("task"), dict)
+            }
+            tasks = Task.objects.select_related("project__customer").filter(
+                pk__in=[pk for pk in ids if pk.isdigit()]
+            )
+            self.context["tasks"] = {str(task.pk): task for task in tasks}
+
+        return super().to_internal_value(data)
+
+    def create(self, validated_data):
+        reports = [models.Report(**item) for item in validated_data]
+        for report in reports:
+            report.duration = models.round_duration(report.duration)
+
+        with transaction.atomic():
+            reports = models.Report.objects.bulk_create(reports)
+
+            # most recent remaining effort of a task is the one of the last report
+            tracked = {
+                report.task_id: report
+                for report in reports
+                if report.task.project.remaining_effort_tracking
+            }
+            for report in tracked.values():
+                update_remaining_effort(report)
+
+            rollup.refresh_created(reports)
+            changes.changed(models.Report, {report.user_id for report in reports})
+            if settings.WORKTIME_LEDGER:
+                ledger.update_days((report.user_id, report.date) for report in reports)
+
+        return reports
+
+
 class ReportSerializer(TotalTimeRootMetaMixin, ModelSerializer):
     """Report serializer."""
 
-    task = ResourceRelatedField(queryset=Task.objects.all())
+    task = TaskResourceRelatedField(queryset=Task.objects.all())
     activity = ResourceRelatedField(
         queryset=models.Activity.objects.all(), allow_null=True, required=False
     )
@@ -153,6 +223,17 @@ class ReportSerializer(TotalTimeRootMetaMixin, ModelSerializer):
 
         return value
 
+    def _cached(self, key, compute):
+        """Compute a value needed for validation once per serializer.
+
+        Lists of reports are validated with the same child serializer, so
+        values are only computed once per distinct task.
+        """
+        cache = self.__dict__.setdefault("_validation_cache", {})
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+
     def validate(self, data):
         """Validate that verified by is only set by reviewer or superuser.
 
@@ -169,26 +250,6 @@ class ReportSerializer(TotalTimeRootMetaMixin, ModelSerializer):
         task = data.get("task") or self.instance.task
         review = data.get("review")
         billed = data.get("billed")
-        is_reviewer = (
-            user.is_superuser
-            or Task.objects.filter(
-                Q(
-                    task_assignees__user=user,
-                    task_assignees__is_reviewer=True,
-                    task_assignees__task=task,
-                )
-                | Q(
-                    project__project_assignees__user=user,
-                    project__project_assignees__is_reviewer=True,
-                    project__project_assignees__project=task.project,
-                )
-                | Q(
-                    project__customer__customer_assignees__user=user,
-                    project__customer__customer_assignees__is_reviewer=True,
-                    project__customer__customer_assignees__customer=task.project.customer,
-                )
-            ).exists()
-        )
 
         # check if remaining effort tracking is active on the corresponding project
         if not task.project.remaining_effort_tracking and data.get("remaining_effort"):
@@ -196,6 +257,26 @@ class ReportSerializer(TotalTimeRootMetaMixin, ModelSerializer):
             raise ValidationError(msg)
 
         if new_verified_by != current_verified_by:
+            is_reviewer = user.is_superuser or self._cached(
+                ("is_reviewer", task.pk),
+                lambda: Task.objects.filter(
+                    Q(
+                        task_assignees__user=user,
+                        task_assignees__is_reviewer=True,
+                        task_assignees__task=task,
+                    )
+                    | Q(
+                        project__project_assignees__user=user,
+                        project__project_assignees__is_reviewer=True,
+                        project__project_assignees__project=task.project,
+                    )
+                    | Q(
+                        project__customer__customer_assignees__user=user,
+                        project__customer__customer_assignees__is_reviewer=True,
+                        project__customer__customer_assignees__customer=task.project.customer,
+                    )
+                ).exists(),
+            )
             if not is_reviewer:
                 raise ValidationError(_("Only reviewer may verify reports."))
 
@@ -220,37 +301,43 @@ class ReportSerializer(TotalTimeRootMetaMixin, ModelSerializer):
         ):
             data["billed"] = data.get("task").project.billed
 
-        current_employment = Employment.objects.get_at(user=user, date=date.today())
+        current_employment = self._cached(
+            "employment",
+            lambda: Employment.objects.get_at(user=user, date=date.today()),
+        )
 
         if (
             self.context["request"].method == "POST"
             and current_employment.is_external
-            and Task.objects.filter(
-                Q(
-                    task_assignees__user=user,
-                    task_assignees__is_reviewer=True,
-                )
-                | Q(
-                    project__project_assignees__user=user,
-                    project__project_assignees__is_reviewer=True,
-                )
-                | Q(
-                    project__customer__customer_assignees__user=user,
-                    project__customer__customer_assignees__is_reviewer=True,
-                )
-                | Q(
-                    task_assignees__user=user,
-                    task_assignees__is_manager=True,
-                )
-                | Q(
-                    project__project_assignees__user=user,
-                    project__project_assignees__is_manager=True,
-                )
-                | Q(
-                    project__customer__customer_assignees__user=user,
-                    project__customer__customer_assignees__is_manager=True,
-                )
-            ).exists()
+            and self._cached(
+                "is_reviewer_or_manager",
+                lambda: Task.objects.filter(
+                    Q(
+                        task_assignees__user=user,
+                        task_assignees__is_reviewer=True,
+                    )
+                    | Q(
+                        project__project_assignees__user=user,
+                        project__project_assignees__is_reviewer=True,
+                    )
+                    | Q(
+                        project__customer__customer_assignees__user=user,
+                        project__customer__customer_assignees__is_reviewer=True,
+                    )
+                    | Q(
+                        task_assignees__user=user,
+                        task_assignees__is_manager=True,
+                    )
+                    | Q(
+                        project__project_assignees__user=user,
+                        project__project_assignees__is_manager=True,
+                    )
+                    | Q(
+                        project__customer__customer_assignees__user=user,
+                        project__customer__customer_assignees__is_manager=True,
+                    )
+                ).exists(),
+            )
         ):
             msg = (
                 "User is not a resource on the corresponding task, project or customer"
@@ -273,7 +360,9 @@ class ReportSerializer(TotalTimeRootMetaMixin, ModelSerializer):
             "verified_by",
             "rejected",
             "remaining_effort",
+            "updated",
         )
+        list_serializer_class = ReportListSerializer
 
 
 class ReportBulkSerializer(Serializer):
@@ -293,6 +382,35 @@ class ReportBulkSerializer(Serializer):
         resource_name = "report-bulks"
 
 
+# expressions of report intersection fields, as postgres has no min and max
+# of booleans those are compared as integers
+INTERSECTION_FIELDS = {
+    "customer": F("task__project__customer"),
+    "project": F("task__project"),
+    "task": F("task"),
+    "user": F("user"),
+    "comment": F("comment"),
+    "review": Cast("review", output_field=IntegerField()),
+    "not_billable": Cast("not_billable", output_field=IntegerField()),
+    "billed": Cast("billed", output_field=IntegerField()),
+    "verified": Case(When(verified_by__isnull=True, then=0), default=1),
+    "rejected": Cast("rejected", output_field=IntegerField()),
+}
+INTERSECTION_BOOLEAN_FIELDS = {
+    "review",
+    "not_billable",
+    "billed",
+    "verified",
+    "rejected",
+}
+INTERSECTION_MODELS = {
+    "customer": Customer,
+    "project": Project,
+    "task": Task,
+    "user": User,
+}
+
+
 class ReportIntersectionSerializer(Serializer):
     """Serializer of report intersections.
 
@@ -322,65 +440,65 @@ class ReportIntersectionSerializer(Serializer):
     verified = SerializerMethodField()
     rejected = SerializerMethodField()
 
-    def _intersection(self, instance, field, model=None):
-        """Get intersection of given field.
+    @cached_property
+    def _intersections(self):
+        """Get intersections of all fields in one aggregate query.
 
-        :return: Returns value of field if objects have same value;
-                 otherwise None
+        A field intersects when its smallest and largest value are the same.
+        Related objects are resolved with one query per model afterwards.
         """
-        value = None
-        queryset = instance["queryset"]
-        values = queryset.values(field).distinct()
-        if values.count() == 1:
-            value = values.first()[field]
-            if model:
-                value = model.objects.get(pk=value)
+        queryset = self.instance["queryset"]
+        aggregates = {"count": Count("id")}
+        for name, expression in INTERSECTION_FIELDS.items():
+            aggregates[f"{name}_min"] = Min(expression)
+            aggregates[f"{name}_max"] = Max(expression)
+        result = queryset.aggregate(**aggregates)
 
-        return value
+        intersections = {"count": result["count"]}
+        for name in INTERSECTION_FIELDS:
+            value = result[f"{name}_min"]
+            if value != result[f"{name}_max"]:
+                value = None
+            elif value is not None and name in INTERSECTION_BOOLEAN_FIELDS:
+                value = bool(value)
+            elif value is not None and name in INTERSECTION_MODELS:
+                value = INTERSECTION_MODELS[name].objects.get(pk=value)
+            intersections[name] = value
+        return intersections
 
-    def get_customer(self, instance):
-        return self._intersection(instance, "task__project__customer", Customer)
+    def get_customer(self, _instance):
+        return self._intersections["customer"]
 
-    def get_project(self, instance):
-        return self._intersection(instance, "task__project", Project)
+    def get_project(self, _instance):
+        return self._intersections["project"]
 
-    def get_task(self, instance):
-        return self._intersection(instance, "task", Task)
+    def get_task(self, _instance):
+        return self._intersections["task"]
 
-    def get_user(self, instance):
-        return self._intersection(instance, "user", User)
+    def get_user(self, _instance):
+        return self._intersections["user"]
 
-    def get_comment(self, instance):
-        return self._intersection(instance, "comment")
+    def get_comment(self, _instance):
+        return self._intersections["comment"]
 
-    def get_review(self, instance):
-        return self._intersection(instance, "review")
+    def get_review(self, _instance):
+        return self._intersections["review"]
 
-    def get_not_billable(self, instance):
-        return self._intersection(instance, "not_billable")
+    def get_not_billable(self, _instance):
+        return self._intersections["not_billable"]
 
-    def get_billed(self, instance):
-        return self._intersection(instance, "billed")
+    def get_billed(self, _instance):
+        return self._intersections["billed"]
 
-    def get_verified(self, instance):
-        queryset = instance["queryset"]
-        queryset = queryset.annotate(
-            verified=Case(
-                When(verified_by_id__isnull=True, then=False),
-                default=True,
-                output_field=BooleanField(),
-            )
-        )
-        instance["queryset"] = queryset
-        return self._intersection(instance, "verified")
+    def get_verified(self, _instance):
+        return self._intersections["verified"]
 
-    def get_rejected(self, instance):
-        return self._intersection(instance, "rejected")
+    def get_rejected(self, _instance):
+        return self._intersections["rejected"]
 
     def get_root_meta(self, *args):
         """Add number of results to meta."""
-        queryset = self.instance["queryset"]
-        return {"count": queryset.count()}
+        return {"count": self._intersections["count"]}
 
     included_serializers: ClassVar[dict[str, str]] = {
         "customer": "timed.projects.serializers.CustomerSerializer",
@@ -393,6 +511,15 @@ class ReportIntersectionSerializer(Serializer):
         resource_name = "report-intersections"
 
 
+class AbsenceListSerializer(ListSerializer):
+    """Calculate the durations of all listed absences at once."""
+
+    def to_representation(self, data):
+        instances = list(data)
+        models.calculate_durations(instances)
+        return super().to_representation(instances)
+
+
 class AbsenceSerializer(ModelSerializer):
     """Absence serializer."""
 
@@ -406,13 +533,12 @@ class AbsenceSerializer(ModelSerializer):
     }
 
     def get_duration(self, instance):
-        try:
-            employment = Employment.objects.get_at(instance.user, instance.date)
-        except Employment.DoesNotExist:
+        if not hasattr(instance, "duration"):
             # absence is invalid if no employment exists on absence date
-            return duration_string(timedelta())
+            # in which case duration will be zero
+            models.calculate_durations([instance])
 
-        return duration_string(instance.calculate_duration(employment))
+        return duration_string(instance.duration)
 
     def validate_date(self, value):
         """Only owner is allowed to change date."""
@@ -463,10 +589,29 @@ class AbsenceSerializer(ModelSerializer):
         """Meta information for the absence serializer."""
 
         model = models.Absence
+        list_serializer_class = AbsenceListSerializer
         fields = (
             "comment",
             "date",
             "duration",
             "absence_type",
             "user",
+            "updated",
+        )
+
+
+class TombstoneSerializer(ModelSerializer):
+    """Tombstone serializer."""
+
+    user = ResourceRelatedField(read_only=True)
+
+    class Meta:
+        """Meta information for the tombstone serializer."""
+
+        model = models.Tombstone
+        fields = (
+            "resource_type",
+            "object_id",
+            "user",
+            "deleted",
         )
@@ -1,18 +1,37 @@
-from django.db.models import Sum
-from django.db.models.signals import pre_save
+from datetime import timedelta
+
+from django.db.models import F, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from timed.tracking.models import Report
+from timed import changes
+from timed.projects.models import Project, Task
+from timed.tracking.models import (
+    Absence,
+    Activity,
+    Attendance,
+    Report,
+    Tombstone,
+)
+
+TOMBSTONE_RESOURCE_TYPES = {
+    Activity: "activities",
+    Absence: "absences",
+    Report: "reports",
+}
 
 
 @receiver(pre_save, sender=Report)
 def update_rejected_on_reports(sender, instance, **kwargs):  # noqa: ARG001
     """Unreject report when the task changes."""
+    if not instance.rejected:
+        return
+
     # Check if the report is being created or updated
-    if instance.pk and instance.rejected:
-        report = Report.objects.get(id=instance.id)
-        if report.task_id != instance.task_id:
-            instance.rejected = False
+    original = instance.original_values("task_id")
+    if original and original["task_id"] != instance.task_id:
+        instance.rejected = False
 
 
 @receiver(pre_save, sender=Report)
@@ -26,30 +45,65 @@ def update_most_recent_remaining_effort(sender, instance, **kwargs):  # noqa: AR
     if kwargs.get("raw", False):  # pragma: no cover
         return
 
-    if instance.task.project.remaining_effort_tracking is not True:
-        return
-
-    # update most_recent_remaining_effort and total_remaining_effort on report creation
-    if not instance.pk:
-        update_remaining_effort(instance)
+    # update most_recent_remaining_effort and total_remaining_effort on report
+    # creation and when remaining effort has changed on report update
+    original = instance.original_values("remaining_effort")
+    if original and original["remaining_effort"] == instance.remaining_effort:
         return
 
-    # check if remaining effort has changed on report update
-    if instance.remaining_effort != Report.objects.get(id=instance.id).remaining_effort:
+    if Project.objects.filter(
+        tasks=instance.task_id, remaining_effort_tracking=True
+    ).exists():
         update_remaining_effort(instance)
 
 
 def update_remaining_effort(report):
-    task = report.task
-    project = task.project
+    """Set remaining effort of a report as most recent remaining effort of its task.
 
-    task.most_recent_remaining_effort = report.remaining_effort
-    task.save()
+    Total remaining effort of the project is adjusted by the difference to
+    the previous remaining effort of the task instead of summing up all tasks.
+    """
+    tasks = Task.objects.filter(pk=report.task_id)
+    previous = Subquery(tasks.values("most_recent_remaining_effort"))
+    Project.objects.filter(tasks=report.task_id).update(
+        total_remaining_effort=F("total_remaining_effort")
+        + (report.remaining_effort or timedelta(0))
+        - Coalesce(previous, timedelta(0))
+    )
+    tasks.update(most_recent_remaining_effort=report.remaining_effort)
+    changes.changed(Project)
+    changes.changed(Task)
 
-    total_remaining_effort = (
-        task.project.tasks.all()
-        .aggregate(sum_remaining=Sum("most_recent_remaining_effort"))
-        .get("sum_remaining")
+
+@receiver(post_delete, sender=Activity)
+@receiver(post_delete, sender=Absence)
+@receiver(post_delete, sender=Report)
+def create_tombstone(sender, instance, **kwargs):
+    """Leave a tombstone of a deleted report, absence or activity."""
+    Tombstone.objects.create(
+        resource_type=TOMBSTONE_RESOURCE_TYPES[sender],
+        object_id=instance.pk,
+        user_id=instance.user_id,
     )
-    project.total_remaining_effort = total_remaining_effort
-    project.save()
+
+
+@receiver(post_save, sender=Activity)
+@receiver(post_delete, sender=Activity)
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+@receiver(post_save, sender=Absence)
+@receiver(post_delete, sender=Absence)
+def record_change(sender, instance, **kwargs):
+    """Record change of an activity, attendance or absence."""
+    changes.record_change(sender, instance)
+
+
+@receiver(post_save, sender=Report)
+@receiver(post_delete, sender=Report)
+def record_report_change(sender, instance, **kwargs):  # noqa: ARG001
+    """Record change of a report for its user and its previous user."""
+    user_ids = {instance.user_id}
+    original = instance.original_values("user_id")
+    if original:
+        user_ids.add(original["user_id"])
+    changes.changed(Report, user_ids)
@@ -1,7 +1,15 @@
+from itertools import groupby
+from operator import attrgetter
+
 from django.conf import settings
-from django.core.mail import EmailMessage, get_connection
+from django.core.mail import EmailMessage
 from django.template.loader import get_template
 
+from timed.notifications import outbox
+
+# number of reports fetched from the database at once to notify users
+NOTIFICATION_CHUNK_SIZE = 2000
+
 
 def _send_notification_emails(changes, reviewer, rejected=False):  # noqa: FBT002
     """Send email for each user."""
@@ -12,7 +20,6 @@ def _send_notification_emails(changes, reviewer, rejected=False):  # noqa: FBT00
         template = get_template("mail/notify_user_changed_reports.tmpl", using="text")
         subject = "[Timed] Your reports have been changed"
     from_email = settings.DEFAULT_FROM_EMAIL
-    connection = get_connection()
 
     messages = []
 
@@ -32,13 +39,11 @@ def _send_notification_emails(changes, reviewer, rejected=False):  # noqa: FBT00
             body=body,
             from_email=from_email,
             to=[user.email],
-            connection=connection,
             headers=settings.EMAIL_EXTRA_HEADERS,
         )
 
         messages.append(message)
-    if len(messages) > 0:
-        connection.send_messages(messages)
+    outbox.send_messages(messages)
 
 
 def _get_report_changeset(report, fields):
@@ -67,26 +72,42 @@ def notify_user_changed_report(report, fields, reviewer):
     _send_notification_emails([user_changes], reviewer)
 
 
-def notify_user_changed_reports(queryset, fields, reviewer):
-    users = [report.user for report in queryset.order_by("user").distinct("user")]
-    user_changes = []
+def _get_user_reports(queryset):
+    """Get reports grouped by user ordered by date.
+
+    Reports of all users are streamed in one query.
+    """
+    reports = queryset.select_related("user", "task__project__customer").order_by(
+        "user", "date", "id"
+    )
+    reports = reports.iterator(chunk_size=NOTIFICATION_CHUNK_SIZE)
+    for _, group in groupby(reports, key=attrgetter("user_id")):
+        user_reports = list(group)
+        yield user_reports[0].user, user_reports
+
 
-    for user in users:
+def _get_user_changes(queryset, fields):
+    for user, reports in _get_user_reports(queryset):
         changes = []
-        for report in queryset.filter(user=user).order_by("date"):
+        for report in reports:
             changeset = _get_report_changeset(report, fields)
 
-            # skip edits of own reports and empty changes
-            if report.user == reviewer or not changeset:
-                continue
-            changes.append(changeset)
+            # skip empty changes
+            if changeset:
+                changes.append(changeset)
 
         # skip user if changes are empty
-        if not changes:
-            continue
+        if changes:
+            yield {"user": user, "changes": changes}
 
-        user_changes.append({"user": user, "changes": changes})
 
+def notify_user_changed_reports(queryset, fields, reviewer):
+    # skip query when none of the changed fields is notified
+    if not set(fields).intersection(settings.TRACKING_REPORT_VERIFIED_CHANGES):
+        return
+
+    # skip edits of own reports
+    user_changes = _get_user_changes(queryset.exclude(user=reviewer), fields)
     _send_notification_emails(user_changes, reviewer)
 
 
@@ -96,14 +117,8 @@ def notify_user_rejected_report(report, reviewer):
 
 
 def notify_user_rejected_reports(queryset, _fields, reviewer):
-    users = [report.user for report in queryset.order_by("user").distinct("user")]
-    user_changes = []
-
-    for user in users:
-        changes = []
-        for report in queryset.filter(user=user).order_by("date"):
-            changeset = {"report": report}
-            changes.append(changeset)
-        user_changes.append({"user": user, "changes": changes})
-
+    user_changes = (
+        {"user": user, "changes": [{"report": report} for report in reports]}
+        for user, reports in _get_user_reports(queryset)
+    )
     _send_notification_emails(user_changes, reviewer, rejected=True)
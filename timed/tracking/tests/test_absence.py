@@ -10,7 +10,9 @@ from timed.employment.factories import (
     PublicHolidayFactory,
     UserFactory,
 )
+from timed.projects.factories import TaskFactory
 from timed.tracking.factories import AbsenceFactory, ReportFactory
+from timed.tracking.models import calculate_durations
 
 
 @pytest.mark.parametrize(
@@ -410,3 +412,57 @@ def test_absence_detail_unemployed(internal_employee_client):
 
     json = res.json()
     assert json["data"]["attributes"]["duration"] == "00:00:00"
+
+
+@pytest.mark.parametrize("absences", [1, 5])
+def test_absence_list_constant_queries(
+    superadmin_client, django_assert_num_queries, absences
+):
+    fill_worktime = AbsenceTypeFactory.create(fill_worktime=True)
+    task = TaskFactory.create()
+    for day in range(1, absences + 1):
+        date = datetime.date(2017, 5, day)
+        employment = EmploymentFactory.create(
+            start_date=date, end_date=date, worktime_per_day=datetime.timedelta(hours=8)
+        )
+        ReportFactory.create(
+            user=employment.user,
+            date=date,
+            task=task,
+            duration=datetime.timedelta(hours=day),
+        )
+        AbsenceFactory.create(
+            user=employment.user, date=date, absence_type=fill_worktime
+        )
+
+    url = reverse("absence-list")
+
+    with django_assert_num_queries(3):
+        response = superadmin_client.get(url, data={"ordering": "date"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [entry["attributes"]["duration"] for entry in response.json()["data"]] == [
+        f"{8 - day:02}:00:00" for day in range(1, absences + 1)
+    ]
+
+
+@pytest.mark.django_db()
+def test_absence_calculate_duration_fill_worktime():
+    date = datetime.date(2017, 5, 1)
+    employment = EmploymentFactory.create(
+        start_date=date, worktime_per_day=datetime.timedelta(hours=8)
+    )
+    absence = AbsenceFactory.create(
+        user=employment.user, date=date, absence_type__fill_worktime=True
+    )
+    ReportFactory.create(
+        user=employment.user, date=date, duration=datetime.timedelta(hours=3)
+    )
+
+    assert absence.calculate_duration(employment) == datetime.timedelta(hours=5)
+
+
+@pytest.mark.django_db()
+def test_absence_calculate_durations_empty(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        calculate_durations([])
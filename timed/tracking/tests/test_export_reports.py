@@ -0,0 +1,61 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.parametrize("file_type", ["arrow", "parquet"])
+def test_export_reports(db, tmp_path, report_factory, file_type):  # noqa: ARG001
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    report_factory.create(date=date(2020, 5, 1), duration=timedelta(hours=2))
+    report = report_factory.create(date=date(2021, 5, 1))
+    report_factory.create(date=date(2022, 5, 1))
+    path = tmp_path / f"reports.{file_type}"
+
+    call_command(
+        "export_reports",
+        str(path),
+        file_type=file_type,
+        from_date=date(2021, 1, 1),
+        to_date=date(2021, 12, 31),
+    )
+
+    if file_type == "parquet":
+        table = pq.read_table(path)
+    else:
+        with pa.OSFile(str(path)) as file:
+            table = pa.ipc.open_stream(file).read_all()
+    assert table.to_pylist() == [
+        {
+            "date": report.date,
+            "duration": report.duration // timedelta(seconds=1),
+            "customer": report.task.project.customer.name,
+            "project": report.task.project.name,
+            "task": report.task.name,
+            "user": report.user.username,
+            "comment": report.comment,
+            "billing_type": report.task.project.billing_type.name,
+            "cost_center": report.task.cost_center.name,
+        }
+    ]
+
+
+def test_export_reports_batches(db, tmp_path, report_factory, mocker):  # noqa: ARG001
+    pq = pytest.importorskip("pyarrow.parquet")
+    mocker.patch("timed.export.EXPORT_CHUNK_SIZE", 2)
+    report_factory.create_batch(5)
+    path = tmp_path / "reports.parquet"
+
+    call_command("export_reports", str(path))
+
+    assert pq.read_table(path).num_rows == 5
+
+
+def test_export_reports_unavailable(tmp_path, mocker):
+    mocker.patch(
+        "timed.tracking.management.commands.export_reports.arrow_available",
+        return_value=False,
+    )
+    with pytest.raises(CommandError):
+        call_command("export_reports", str(tmp_path / "reports.parquet"))
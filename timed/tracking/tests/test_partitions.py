@@ -0,0 +1,93 @@
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import ProtectedError
+
+from timed.tracking.models import Report
+from timed.tracking.partitions import DEFAULT_PARTITION, partition_years
+
+
+def _years():
+    with connection.cursor() as cursor:
+        return partition_years(cursor)
+
+
+def _count(table):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {table}")  # noqa: S608
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db()
+def test_partition_reports(report_factory):
+    this_year = date.today().year
+    old = report_factory.create(date=date(2019, 5, 1))
+    report_factory.create(date=date(2021, 5, 1))
+
+    call_command("partition_reports")
+
+    assert _years() == list(range(2019, this_year + 2))
+    assert _count("tracking_report_2019") == 1
+    assert Report.objects.count() == 2
+
+    # ids continue after copied reports
+    new = report_factory.create(task=old.task, date=date(2020, 1, 1))
+    assert new.id > old.id
+
+    # reports move between partitions when their date changes
+    old.date = date(2020, 2, 1)
+    old.save()
+    assert _count("tracking_report_2019") == 0
+    assert _count("tracking_report_2020") == 2
+
+    # only partitions of the queried years are scanned
+    plan = Report.objects.filter(date__range=[date(2021, 1, 1), date(2021, 12, 31)])
+    plan = plan.explain()
+    assert "tracking_report_2021" in plan
+    assert "tracking_report_2020" not in plan
+
+    with pytest.raises(ProtectedError):
+        old.task.delete()
+
+
+@pytest.mark.django_db()
+def test_partition_reports_future(report_factory):
+    this_year = date.today().year
+    call_command("partition_reports", years_ahead=0)
+    assert _years() == [this_year]
+
+    report = report_factory.create(date=date(this_year + 2, 1, 1))
+    assert _count(DEFAULT_PARTITION) == 1
+
+    call_command("partition_reports", years_ahead=2)
+
+    assert _years() == list(range(this_year, this_year + 3))
+    assert _count(DEFAULT_PARTITION) == 0
+    assert _count(f"tracking_report_{this_year + 2}") == 1
+    assert Report.objects.get() == report
+
+
+@pytest.mark.django_db()
+def test_partition_reports_serial_id(report_factory):
+    # ids of databases created before Django 4.1 are serial
+    with connection.cursor() as cursor:
+        cursor.execute("ALTER TABLE tracking_report ALTER COLUMN id DROP IDENTITY")
+        cursor.execute(
+            "CREATE SEQUENCE tracking_report_id_seq OWNED BY tracking_report.id"
+        )
+        cursor.execute(
+            "ALTER TABLE tracking_report ALTER COLUMN id "
+            "SET DEFAULT nextval('tracking_report_id_seq')"
+        )
+    old = report_factory.create(date=date(2019, 5, 1))
+
+    call_command("partition_reports")
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_get_serial_sequence('tracking_report', 'id')")
+        assert cursor.fetchone()[0] == "public.tracking_report_id_seq"
+    new = report_factory.create(task=old.task, date=date(2020, 1, 1))
+    assert new.id > old.id
+    assert Report.objects.count() == 2
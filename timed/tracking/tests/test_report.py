@@ -1,6 +1,6 @@
 """Tests for the reports endpoint."""
 
-from datetime import timedelta
+from datetime import date, timedelta
 
 import pyexcel
 import pytest
@@ -9,12 +9,15 @@ from django.utils.duration import duration_string
 from rest_framework import status
 
 from timed.employment.factories import EmploymentFactory, UserFactory
+from timed.employment.models import WorktimeLedger
 from timed.projects.factories import (
     CustomerAssigneeFactory,
     ProjectAssigneeFactory,
     TaskAssigneeFactory,
     TaskFactory,
 )
+from timed.reports.models import ReportRollup
+from timed.tracking.models import Report
 
 
 def test_report_list(
@@ -104,6 +107,26 @@ def test_report_intersection_full(
     assert json == expected
 
 
+def test_report_intersection_num_queries(
+    internal_employee_client, report_factory, django_assert_num_queries
+):
+    report = report_factory.create(user=internal_employee_client.user)
+    report_factory.create_batch(3, user=internal_employee_client.user, task=report.task)
+
+    url = reverse("report-intersection")
+    # permission checks, one aggregate query, one query per intersecting
+    # related object and the relationships of the included user
+    with django_assert_num_queries(10):
+        response = internal_employee_client.get(
+            url, {"include": "customer,project,task,user"}
+        )
+    assert response.status_code == status.HTTP_200_OK
+
+    json = response.json()
+    assert json["meta"]["count"] == 4
+    assert len(json["included"]) == 4
+
+
 def test_report_intersection_partial(
     internal_employee_client,
     report_factory,
@@ -1224,12 +1247,13 @@ def test_report_export(
 
     url = reverse("report-export")
 
-    with django_assert_num_queries(7):
+    with django_assert_num_queries(4):
         response = internal_employee_client.get(url, data={"file_type": file_type})
+        content = b"".join(response.streaming_content)
 
     assert response.status_code == status.HTTP_200_OK
 
-    book = pyexcel.get_book(file_content=response.content, file_type=file_type)
+    book = pyexcel.get_book(file_content=content, file_type=file_type)
     # bookdict is a dict of tuples(name, content)
     sheet = book.bookdict.popitem()[1]
 
@@ -1237,6 +1261,78 @@ def test_report_export(
     assert sheet[1][-2:] == [expected_bt_name, expected_cs_name]
 
 
+def test_report_export_csv_streaming(internal_employee_client, report_factory, task):
+    report_factory.create_batch(
+        3, task=task, date=date(2017, 1, 2), duration=timedelta(hours=1)
+    )
+
+    url = reverse("report-export")
+    response = internal_employee_client.get(url, data={"file_type": "csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Disposition"] == 'attachment; filename="report.csv"'
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0] == (
+        "Date,Duration,Customer,Project,Task,User,Comment,Billing Type,Cost Center"
+    )
+    assert len(lines) == 4
+    assert lines[1].startswith("2017-01-02,1:00:00,")
+
+
+@pytest.mark.parametrize("file_type", ["arrow", "parquet"])
+def test_report_export_arrow(
+    internal_employee_client, report_factory, task, cost_center, file_type
+):
+    pa = pytest.importorskip("pyarrow")
+    task.cost_center = cost_center
+    task.save()
+    report_factory.create_batch(
+        3, task=task, date=date(2017, 1, 2), duration=timedelta(hours=1, minutes=30)
+    )
+
+    url = reverse("report-export")
+    response = internal_employee_client.get(url, data={"file_type": file_type})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        response["Content-Disposition"] == f'attachment; filename="report.{file_type}"'
+    )
+    content = pa.BufferReader(b"".join(response.streaming_content))
+    if file_type == "parquet":
+        table = pytest.importorskip("pyarrow.parquet").read_table(content)
+    else:
+        table = pa.ipc.open_stream(content).read_all()
+
+    assert table.num_rows == 3
+    assert table.column_names == [
+        "date",
+        "duration",
+        "customer",
+        "project",
+        "task",
+        "user",
+        "comment",
+        "billing_type",
+        "cost_center",
+    ]
+    assert table.schema.field("task").type == pa.dictionary(pa.int32(), pa.string())
+    row = table.to_pylist()[0]
+    assert row["date"] == date(2017, 1, 2)
+    assert row["duration"] == 5400
+    assert row["task"] == task.name
+    assert row["cost_center"] == cost_center.name
+
+
+def test_report_export_arrow_unavailable(internal_employee_client, mocker):
+    mocker.patch("timed.tracking.views.arrow_available", return_value=False)
+
+    url = reverse("report-export")
+    response = internal_employee_client.get(url, data={"file_type": "parquet"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.parametrize(
     ("settings_count", "given_count", "expected_status"),
     [
@@ -1316,6 +1412,65 @@ def test_report_update_bulk_verify_reviewer_multiple_notify(
     }
 
 
+def test_report_update_bulk_chunks(
+    superadmin_client,
+    report_factory,
+    user_factory,
+    settings,
+    mailoutbox,
+    django_assert_num_queries,
+):
+    settings.REPORT_BULK_UPDATE_CHUNK_SIZE = 2
+    EmploymentFactory.create(user=superadmin_client.user)
+    users = user_factory.create_batch(3)
+    reports = [
+        report_factory.create(user=user, not_billable=False)
+        for user in users
+        for _ in range(2)
+    ]
+
+    url = reverse("report-bulk")
+    data = {
+        "data": {
+            "type": "report-bulks",
+            "id": None,
+            "attributes": {"not-billable": True},
+        }
+    }
+
+    # reports of all users are notified with one query and updated with one
+    # query per chunk, even though updated reports no longer match the filter
+    with django_assert_num_queries(6):
+        response = superadmin_client.post(f"{url}?not_billable=0", data)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    for report in reports:
+        report.refresh_from_db()
+        assert report.not_billable
+    assert {mail.to[0] for mail in mailoutbox} == {user.email for user in users}
+
+
+def test_report_update_bulk_verify_skips_notification(
+    superadmin_client, report_factory, django_assert_num_queries
+):
+    EmploymentFactory.create(user=superadmin_client.user)
+    report = report_factory.create()
+
+    url = reverse("report-bulk")
+    data = {
+        "data": {"type": "report-bulks", "id": None, "attributes": {"verified": True}}
+    }
+
+    # verifying reports is not notified so reports are only checked for
+    # review and updated
+    with django_assert_num_queries(4):
+        response = superadmin_client.post(url, data)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    report.refresh_from_db()
+    assert report.verified_by == superadmin_client.user
+
+
 @pytest.mark.parametrize("own_report", [True, False])
 @pytest.mark.parametrize(
     ("has_attributes", "different_attributes", "verified", "expected"),
@@ -2094,3 +2249,148 @@ def test_report_remaining_effort_update(
     report.task.refresh_from_db()
     assert report.task.most_recent_remaining_effort == timedelta(hours=3)
     assert report.task.project.total_remaining_effort == timedelta(hours=3)
+
+
+def test_report_original_values(db, report_factory, task_factory):  # noqa: ARG001
+    report = report_factory.create(comment="foo")
+    original_task_id = report.task_id
+    assert Report().original_values("comment") is None
+
+    report.comment = "bar"
+    report.task = task_factory.create()
+    assert report.original_values("comment", "task_id") == {
+        "comment": "foo",
+        "task_id": original_task_id,
+    }
+
+    report.save(update_fields=["comment"])
+    assert report.original_values("comment", "task_id") == {
+        "comment": "bar",
+        "task_id": original_task_id,
+    }
+
+    # deferred fields are fetched when needed
+    report = Report.objects.only("id").get(pk=report.pk)
+    assert report.original_values("comment") == {"comment": "bar"}
+
+    report.refresh_from_db(fields=["task"])
+    assert report.original_values("task_id") == {"task_id": original_task_id}
+
+
+@pytest.mark.django_db()
+def test_report_update_num_queries(django_assert_num_queries, report_factory):
+    report = report_factory.create(rejected=True)
+    report.task.project.remaining_effort_tracking = True
+    report.task.project.save()
+    report = Report.objects.get(pk=report.pk)
+
+    # changes are detected without fetching the report again
+    report.comment = "foo"
+    with django_assert_num_queries(1):
+        report.save()
+
+
+def _batch_report(task, date="2017-02-01", duration="00:50:00", **attributes):
+    return {
+        "type": "reports",
+        "id": None,
+        "attributes": {
+            "comment": "foo",
+            "duration": duration,
+            "date": date,
+            **attributes,
+        },
+        "relationships": {"task": {"data": {"type": "tasks", "id": task.id}}},
+    }
+
+
+def test_report_batch(
+    internal_employee_client,
+    task_factory,
+    project_factory,
+    django_assert_num_queries,
+):
+    user = internal_employee_client.user
+    task = task_factory.create(project=project_factory.create(billed=True))
+    other_task = task_factory.create()
+    data = {
+        "data": [
+            _batch_report(task, "2017-02-01", "00:50:00"),
+            _batch_report(task, "2017-02-02", "00:05:00"),
+            *(_batch_report(other_task, "2017-02-03") for _ in range(10)),
+        ]
+    }
+
+    url = reverse("report-batch")
+    # queries don't grow with the number of reports
+    with django_assert_num_queries(7):
+        response = internal_employee_client.post(url, data)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    json = response.json()
+    assert len(json["data"]) == 12
+    assert "total-time" not in json.get("meta", {})
+    assert json["data"][0]["relationships"]["user"]["data"]["id"] == str(user.id)
+    reports = Report.objects.order_by("date", "id")
+    assert [report.duration for report in reports[:2]] == [
+        timedelta(minutes=45),
+        timedelta(minutes=15),
+    ]
+    assert [report.billed for report in reports[:2]] == [True, True]
+    assert reports.filter(user=user, task=other_task).count() == 10
+
+
+def test_report_batch_invalid(internal_employee_client, task_factory):
+    task = task_factory.create()
+    data = {
+        "data": [
+            _batch_report(task),
+            _batch_report(task, remaining_effort="01:00:00"),
+        ]
+    }
+
+    response = internal_employee_client.post(reverse("report-batch"), data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Report.objects.exists()
+
+
+def test_report_batch_max_size(settings, internal_employee_client, task_factory):
+    settings.REPORT_BATCH_CREATE_MAX_SIZE = 1
+    task = task_factory.create()
+    data = {"data": [_batch_report(task), _batch_report(task)]}
+
+    response = internal_employee_client.post(reverse("report-batch"), data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_report_batch_no_list(internal_employee_client, task_factory):
+    task = task_factory.create()
+    data = {"data": _batch_report(task)}
+
+    response = internal_employee_client.post(reverse("report-batch"), data)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_report_batch_maintains_remaining_effort_and_rollup(
+    settings, internal_employee_client, task_factory
+):
+    settings.REPORT_ROLLUP = True
+    settings.WORKTIME_LEDGER = True
+    task = task_factory.create(project__remaining_effort_tracking=True)
+    data = {
+        "data": [
+            _batch_report(task, "2017-02-01", remaining_effort="03:00:00"),
+            _batch_report(task, "2017-02-02", remaining_effort="02:00:00"),
+        ]
+    }
+
+    response = internal_employee_client.post(reverse("report-batch"), data)
+    assert response.status_code == status.HTTP_201_CREATED
+
+    task.refresh_from_db()
+    assert task.most_recent_remaining_effort == timedelta(hours=2)
+    assert task.project.total_remaining_effort == timedelta(hours=2)
+    assert ReportRollup.objects.filter(task=task).count() == 2
+    assert WorktimeLedger.objects.filter(
+        user=internal_employee_client.user, date="2017-02-02"
+    ).exists()
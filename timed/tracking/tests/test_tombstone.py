@@ -0,0 +1,95 @@
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from timed.tracking.models import Report, Tombstone
+
+
+@pytest.mark.parametrize(
+    ("url", "factory"),
+    [
+        ("report-list", "report_factory"),
+        ("absence-list", "absence_factory"),
+        ("activity-list", "activity_factory"),
+    ],
+)
+def test_updated_since(internal_employee_client, request, url, factory):
+    user = internal_employee_client.user
+    factory = request.getfixturevalue(factory)
+    old, new = factory.create_batch(2, user=user)
+    watermark = timezone.now() - timedelta(hours=1)
+    type(old).objects.filter(pk=old.pk).update(updated=watermark - timedelta(days=1))
+
+    response = internal_employee_client.get(
+        reverse(url), {"updated_since": watermark.isoformat()}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [entry["id"] for entry in response.json()["data"]] == [str(new.id)]
+
+
+def test_updated_since_bulk_update(db, report_factory):  # noqa: ARG001
+    report = report_factory.create(billed=False)
+    watermark = timezone.now()
+    Report.objects.filter(pk=report.pk).update(updated=watermark - timedelta(days=1))
+
+    report.task.project.billed = True
+    report.task.project.save()
+
+    assert Report.objects.filter(updated__gte=watermark).get() == report
+
+
+def test_tombstone_list(
+    internal_employee_client, report_factory, absence_factory, activity_factory
+):
+    user = internal_employee_client.user
+    own_report, other_report = report_factory.create(user=user), report_factory.create()
+    own_absence, other_absence = absence_factory.create(user=user), absence_factory()
+    activity = activity_factory.create(user=user)
+    watermark = timezone.now()
+    deleted = [own_report, other_report, own_absence, other_absence, activity]
+    ids = [obj.id for obj in deleted]
+    for obj in deleted:
+        obj.delete()
+
+    url = reverse("tombstone-list")
+    response = internal_employee_client.get(url, {"updated_since": watermark})
+    assert response.status_code == status.HTTP_200_OK
+    assert [
+        (entry["attributes"]["resource-type"], entry["attributes"]["object-id"])
+        for entry in response.json()["data"]
+    ] == [
+        ("reports", ids[0]),
+        ("reports", ids[1]),
+        ("absences", ids[2]),
+        ("activities", ids[4]),
+    ]
+
+    response = internal_employee_client.get(
+        url, {"updated_since": timezone.now(), "type": "reports"}
+    )
+    assert response.json()["data"] == []
+
+
+@pytest.mark.parametrize(
+    ("client", "expected"),
+    [("external_employee_client", 1), ("superadmin_client", 2)],
+)
+def test_tombstone_list_visible(request, report_factory, client, expected):
+    client = request.getfixturevalue(client)
+    report_factory.create(user=client.user).delete()
+    report_factory.create().delete()
+
+    response = client.get(reverse("tombstone-list"))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["data"]) == expected
+
+
+def test_tombstone_user_deleted(db, activity_factory):  # noqa: ARG001
+    activity = activity_factory.create()
+    activity_id = activity.id
+    activity.user.delete()
+
+    assert Tombstone.objects.get().object_id == activity_id
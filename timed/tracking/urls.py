@@ -11,5 +11,6 @@ r.register(r"activities", views.ActivityViewSet, "activity")
 r.register(r"attendances", views.AttendanceViewSet, "attendance")
 r.register(r"reports", views.ReportViewSet, "report")
 r.register(r"absences", views.AbsenceViewSet, "absence")
+r.register(r"tombstones", views.TombstoneViewSet, "tombstone")
 
 urlpatterns = r.urls
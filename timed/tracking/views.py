@@ -3,19 +3,35 @@
 from __future__ import annotations
 
 from datetime import date
+from itertools import chain
 from typing import TYPE_CHECKING
 
-import django_excel
 from django.conf import settings
-from django.db.models import Case, CharField, F, Q, Value, When
+from django.db.models import Q
 from django.http import HttpResponseBadRequest
 from django.utils.translation import gettext_lazy as _
 from rest_framework import exceptions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.viewsets import ModelViewSet
-
-from timed.employment.models import Employment, PublicHoliday
+from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+
+from timed.employment.models import (
+    AbsenceType,
+    Employment,
+    Location,
+    PublicHoliday,
+    User,
+)
+from timed.export import (
+    ARROW_FILE_TYPES,
+    EXPORT_CHUNK_SIZE,
+    arrow_available,
+    make_arrow_response,
+    make_export_response,
+)
+from timed.mixins import ConditionalGetMixin
+from timed.pagination import KeysetPagination
+from timed.parsers import JSONListParser
 from timed.permissions import (
     IsAccountant,
     IsAuthenticated,
@@ -31,9 +47,12 @@ from timed.permissions import (
     IsSupervisor,
     IsUnverified,
 )
-from timed.projects.models import CustomerAssignee, Task
+from timed.projects.models import Customer, EffectiveRole, Project, Task
+from timed.reports import rollup
+from timed.roles import get_roles
 from timed.serializers import AggregateObject
 from timed.tracking import filters, models, serializers
+from timed.tracking.export import ARROW_COLUMNS, HEADINGS, export_rows
 
 from . import tasks
 
@@ -41,7 +60,7 @@ if TYPE_CHECKING:
     from django.db.models import QuerySet
 
 
-class ActivityViewSet(ModelViewSet):
+class ActivityViewSet(ConditionalGetMixin, ModelViewSet):
     """Activity view set."""
 
     serializer_class = serializers.ActivitySerializer
@@ -55,6 +74,11 @@ class ActivityViewSet(ModelViewSet):
             | IsAuthenticated & IsExternal & IsResource & IsNotTransferred
         ),
     )
+    conditional_models = (Task, Project, Customer, User)
+    conditional_user_models = (models.Activity,)
+
+    def get_conditional_user_ids(self) -> list[int]:
+        return [self.request.user.id]
 
     def get_queryset(self) -> QuerySet[models.Activity]:
         """Filter the queryset by the user of the request."""
@@ -63,7 +87,7 @@ class ActivityViewSet(ModelViewSet):
         ).filter(user=self.request.user)
 
 
-class AttendanceViewSet(ModelViewSet):
+class AttendanceViewSet(ConditionalGetMixin, ModelViewSet):
     """Attendance view set."""
 
     serializer_class = serializers.AttendanceSerializer
@@ -78,6 +102,11 @@ class AttendanceViewSet(ModelViewSet):
             | IsAuthenticated & IsExternal & IsResource
         ),
     )
+    conditional_models = (User,)
+    conditional_user_models = (models.Attendance,)
+
+    def get_conditional_user_ids(self) -> list[int]:
+        return [self.request.user.id]
 
     def get_queryset(self) -> QuerySet[models.Attendance]:
         """Filter the queryset by the user of the request."""
@@ -86,11 +115,12 @@ class AttendanceViewSet(ModelViewSet):
         )
 
 
-class ReportViewSet(ModelViewSet):
+class ReportViewSet(ConditionalGetMixin, ModelViewSet):
     """Report view set."""
 
     serializer_class = serializers.ReportSerializer
     filterset_class = filters.ReportFilterSet
+    pagination_class = KeysetPagination
     queryset = models.Report.objects.select_related(
         "task", "user", "task__project", "task__project__customer"
     )
@@ -124,20 +154,25 @@ class ReportViewSet(ModelViewSet):
         "review",
         "not_billable",
         "rejected",
+        "updated",
     )
+    conditional_models = (Task, Project, Customer, User, Employment, EffectiveRole)
+    conditional_user_models = (models.Report,)
+    # external employees are limited by their active employment
+    conditional_daily = True
 
     def get_queryset(self) -> QuerySet[models.Report]:
         """Get filtered reports for external employees."""
         user = self.request.user
         queryset = super().get_queryset()
-        queryset.select_related(
+        queryset = queryset.select_related(
             "task", "user", "task__project", "task__project__customer"
         )
 
         try:
             current_employment = Employment.objects.get_at(user=user, date=date.today())
         except Employment.DoesNotExist:
-            if CustomerAssignee.objects.filter(user=user, is_customer=True).exists():
+            if get_roles(user).has_customer_role("is_customer"):
                 return queryset.filter(
                     Q(
                         task__project__customer__customer_assignees__user=user,
@@ -149,17 +184,9 @@ class ReportViewSet(ModelViewSet):
         if not current_employment.is_external:
             return queryset
 
-        assigned_tasks = Task.objects.filter(
-            Q(task_assignees__user=user, task_assignees__is_reviewer=True)
-            | Q(
-                project__project_assignees__user=user,
-                project__project_assignees__is_reviewer=True,
-            )
-            | Q(
-                project__customer__customer_assignees__user=user,
-                project__customer__customer_assignees__is_reviewer=True,
-            )
-        )
+        assigned_tasks = EffectiveRole.objects.filter(
+            user=user, role=EffectiveRole.REVIEWER
+        ).values("task")
         return queryset.filter(Q(task__in=assigned_tasks) | Q(user=user))
 
     def update(self, request, *args, **kwargs):
@@ -251,7 +278,7 @@ class ReportViewSet(ModelViewSet):
 
             fields["verified_by"] = verified and user or None
 
-            if fields.get("review") or any(queryset.values_list("review", flat=True)):
+            if fields.get("review") or queryset.filter(review=True).exists():
                 raise exceptions.ParseError(
                     _("Reports can't both be set as `review` and `verified`.")
                 )
@@ -275,10 +302,23 @@ class ReportViewSet(ModelViewSet):
                 tasks.notify_user_rejected_reports(queryset, fields, user)
             else:
                 tasks.notify_user_changed_reports(queryset, fields, user)
-            queryset.update(**fields)
+            with rollup.track(queryset):
+                models.update_reports(queryset, fields)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=["post"], parser_classes=[JSONListParser])
+    def batch(self, request):
+        """Create a list of reports at once."""
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=settings.REPORT_BATCH_CREATE_MAX_SIZE,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
     @action(methods=["get"], detail=False)
     def export(self, request):
         """Export filtered reports to given file format."""
@@ -288,76 +328,39 @@ class ReportViewSet(ModelViewSet):
             "task__project__cost_center",
         )
         queryset = self.filter_queryset(queryset)
-        queryset = queryset.annotate(
-            cost_center=Case(
-                # Task cost center has precedence over project cost center
-                When(
-                    task__cost_center__isnull=False, then=F("task__cost_center__name")
-                ),
-                When(
-                    task__project__cost_center__isnull=False,
-                    then=F("task__project__cost_center__name"),
-                ),
-                default=Value(""),
-                output_field=CharField(),
-            )
-        )
-        queryset = queryset.annotate(
-            billing_type=Case(
-                When(
-                    task__project__billing_type__isnull=False,
-                    then=F("task__project__billing_type__name"),
-                ),
-                default=Value(""),
-                output_field=CharField(),
-            )
-        )
-        if (
-            settings.REPORTS_EXPORT_MAX_COUNT > 0
-            and queryset.count() > settings.REPORTS_EXPORT_MAX_COUNT
-        ):
+        file_type = request.query_params.get("file_type")
+        if file_type not in ["csv", "xlsx", "ods", *ARROW_FILE_TYPES]:
+            return HttpResponseBadRequest()
+        if file_type in ARROW_FILE_TYPES and not arrow_available():
             return Response(
-                _("Your request exceeds the maximum allowed entries ({} > {})").format(
-                    queryset.count(), settings.REPORTS_EXPORT_MAX_COUNT
-                ),
+                _("Export to {} is not available").format(file_type),
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        colnames = [
-            "Date",
-            "Duration",
-            "Customer",
-            "Project",
-            "Task",
-            "User",
-            "Comment",
-            "Billing Type",
-            "Cost Center",
-        ]
-
-        content = queryset.values_list(
-            "date",
-            "duration",
-            "task__project__customer__name",
-            "task__project__name",
-            "task__name",
-            "user__username",
-            "comment",
-            "billing_type",
-            "cost_center",
-        )
+        if settings.REPORTS_EXPORT_MAX_COUNT > 0:
+            count = queryset.count()
+            if count > settings.REPORTS_EXPORT_MAX_COUNT:
+                return Response(
+                    _(
+                        "Your request exceeds the maximum allowed entries ({} > {})"
+                    ).format(count, settings.REPORTS_EXPORT_MAX_COUNT),
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-        file_type = request.query_params.get("file_type")
-        if file_type not in ["csv", "xlsx", "ods"]:
-            return HttpResponseBadRequest()
+        # rows are fetched in chunks while the file is written
+        content = export_rows(queryset).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        if file_type in ARROW_FILE_TYPES:
+            return make_arrow_response(
+                content, ARROW_COLUMNS, file_type, file_name=f"report.{file_type}"
+            )
 
-        sheet = django_excel.pe.Sheet(content, name="Report", colnames=colnames)
-        return django_excel.make_response(
-            sheet, file_type=file_type, file_name=f"report.{file_type}"
+        rows = chain([HEADINGS], content)
+        return make_export_response(
+            rows, file_type, file_name=f"report.{file_type}", sheet_name="Report"
         )
 
 
-class AbsenceViewSet(ModelViewSet):
+class AbsenceViewSet(ConditionalGetMixin, ModelViewSet):
     """Absence view set."""
 
     serializer_class = serializers.AbsenceSerializer
@@ -372,6 +375,10 @@ class AbsenceViewSet(ModelViewSet):
             | IsAuthenticated & IsReadOnly
         ),
     )
+    conditional_models = (AbsenceType, PublicHoliday, Location, Employment, User)
+    conditional_user_models = (models.Absence, models.Report)
+    # absences are limited by the location of the active employment
+    conditional_daily = True
 
     def get_queryset(self) -> QuerySet[models.Absence]:
         """Get absences only for internal employees.
@@ -392,3 +399,29 @@ class AbsenceViewSet(ModelViewSet):
                 ).values("date")
             )
         )
+
+
+class TombstoneViewSet(ReadOnlyModelViewSet):
+    """Tombstone view set.
+
+    Lists deleted reports, absences and activities, so clients can sync
+    changes since their last sync with the `updated_since` filter.
+    """
+
+    serializer_class = serializers.TombstoneSerializer
+    filterset_class = filters.TombstoneFilterSet
+    ordering = ("deleted", "id")
+
+    def get_queryset(self) -> QuerySet[models.Tombstone]:
+        """Get tombstones of objects the user may read."""
+        user = self.request.user
+        queryset = models.Tombstone.objects.all()
+        if user.is_superuser:
+            return queryset
+
+        visible = Q(user=user) | Q(user__in=user.supervisees.values("id"))
+        employment = user.get_active_employment()
+        if employment and not employment.is_external:
+            # internal employees may read all reports
+            visible |= Q(resource_type="reports")
+        return queryset.filter(visible)